@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+System Monitor Collector
+
+A lightweight HTTP service that exposes this host's compact metrics snapshot
+(the same CPU, memory and disk metrics the monitor tools produce). Run one
+collector per host and list them in SYSTEM_MONITOR_FLEET_HOSTS so the fleet
+info agent can fan in across the fleet.
+
+Endpoints:
+    GET /snapshot   Compact metrics snapshot as JSON
+    GET /health     "ok"
+
+Usage:
+    python collector.py [--host 0.0.0.0] [--port 9101] [--name NAME]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from system_monitor_agent.config import COLLECTOR_CACHE_SECONDS, COLLECTOR_PORT
+from system_monitor_agent.snapshot import build_snapshot, collect_samples
+
+
+class SnapshotCache:
+    """Shares one snapshot between requests that arrive within max_age seconds."""
+
+    def __init__(self, max_age, name=None):
+        self.max_age = max_age
+        self.name = name
+        self._lock = threading.Lock()
+        self._body = None
+        self._taken_at = 0.0
+
+    def get(self):
+        """Return the cached snapshot body, sampling again once it is stale."""
+        # One sampler at a time: concurrent requests wait for the fresh snapshot
+        with self._lock:
+            if self._body is None or time.monotonic() - self._taken_at > self.max_age:
+                snapshot = build_snapshot(collect_samples())
+                if self.name:
+                    snapshot["host"] = self.name
+                self._body = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+                self._taken_at = time.monotonic()
+            return self._body
+
+
+def make_handler(cache):
+    """Create a request handler class bound to a snapshot cache."""
+
+    class CollectorHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/snapshot":
+                self._send(200, "application/json", cache.get())
+            elif self.path == "/health":
+                self._send(200, "text/plain", b"ok")
+            else:
+                self._send(404, "text/plain", b"not found")
+
+        def _send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep the collector quiet; the fan-in tool reports failures
+            pass
+
+    return CollectorHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="System monitor metrics collector")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=COLLECTOR_PORT, help="Port to listen on")
+    parser.add_argument(
+        "--name", help="Host name to report (defaults to this machine's hostname)"
+    )
+    parser.add_argument(
+        "--cache-seconds",
+        type=float,
+        default=COLLECTOR_CACHE_SECONDS,
+        help="Reuse a snapshot for requests within this many seconds",
+    )
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port), make_handler(SnapshotCache(args.cache_seconds, args.name))
+    )
+    print(f"Collector listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nCollector stopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
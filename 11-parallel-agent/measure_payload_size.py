@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Measure the prompt size of the verbose and compact tool payloads.
+
+Runs every monitor tool on this machine in both payload modes, then repeats the
+comparison on a synthetic large host (128 cores, 40 partitions) where the
+verbose per-core and per-partition lists dominate the prompt.
+
+Usage:
+    python measure_payload_size.py
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+from system_monitor_agent.subagents.compact import payload_size
+from system_monitor_agent.subagents.cpu_info_agent.tools import (
+    build_cpu_info,
+    build_cpu_metrics,
+    collect_cpu_sample,
+)
+from system_monitor_agent.subagents.disk_info_agent.tools import (
+    build_disk_info,
+    build_disk_metrics,
+    collect_disk_sample,
+)
+from system_monitor_agent.subagents.memory_info_agent.tools import (
+    build_memory_info,
+    build_memory_metrics,
+    collect_memory_sample,
+)
+from system_monitor_agent.subagents.pressure_info_agent.tools import (
+    build_pressure_info,
+    build_pressure_metrics,
+    collect_pressure_sample,
+)
+from system_monitor_agent.subagents.process_info_agent.tools import (
+    build_process_info,
+    build_process_metrics,
+    collect_process_sample,
+)
+
+GB = 1024**3
+
+
+def synthetic_samples():
+    """Build samples for a large host: 128 cores and 40 partitions."""
+    rng = random.Random(42)
+    now = time.time()
+    per_core = [rng.uniform(0, 100) for _ in range(128)]
+    partitions = []
+    for i in range(40):
+        total = rng.randint(50, 2000) * GB
+        used = int(total * rng.uniform(0.1, 0.95))
+        partitions.append(
+            {
+                "device": f"/dev/nvme{i // 8}n1p{i % 8}",
+                "mountpoint": f"/data/volume{i:02d}",
+                "fstype": "xfs",
+                "status": "ok",
+                "usage": SimpleNamespace(
+                    total=total,
+                    used=used,
+                    free=total - used,
+                    percent=round(used / total * 100, 1),
+                ),
+            }
+        )
+    return {
+        "cpu": {
+            "physical_cores": 64,
+            "logical_cores": 128,
+            "per_core_usage": per_core,
+            "avg_usage": sum(per_core) / len(per_core),
+            "timestamp": now,
+        },
+        "memory": {
+            "memory": SimpleNamespace(
+                total=512 * GB, available=200 * GB, used=312 * GB, percent=60.9
+            ),
+            "swap": SimpleNamespace(total=16 * GB, used=1 * GB, percent=6.3),
+            "timestamp": now,
+        },
+        "disk": {
+            "partitions": partitions,
+            "io_rates": {
+                "read_bytes_per_sec": 350e6,
+                "write_bytes_per_sec": 120e6,
+                "read_iops": 5400.0,
+                "write_iops": 2100.0,
+                "sample_window_seconds": 0.5,
+            },
+            "timestamp": now,
+        },
+    }
+
+
+def print_comparison(title, rows):
+    """Print a verbose vs compact size table."""
+    print(f"\n{title}")
+    print(f"{'tool':<10}{'verbose B':>11}{'~tokens':>9}{'compact B':>11}{'~tokens':>9}{'saved':>8}")
+    total_verbose = total_compact = 0
+    for name, verbose, compact in rows:
+        verbose_bytes, verbose_tokens = payload_size(verbose)
+        compact_bytes, compact_tokens = payload_size(compact)
+        total_verbose += verbose_bytes
+        total_compact += compact_bytes
+        saved = 100 * (1 - compact_bytes / verbose_bytes)
+        print(
+            f"{name:<10}{verbose_bytes:>11}{verbose_tokens:>9}"
+            f"{compact_bytes:>11}{compact_tokens:>9}{saved:>7.0f}%"
+        )
+    saved = 100 * (1 - total_compact / total_verbose)
+    print(f"{'total':<10}{total_verbose:>11}{'':>9}{total_compact:>11}{'':>9}{saved:>7.0f}%")
+
+
+def main():
+    cpu = collect_cpu_sample()
+    memory = collect_memory_sample()
+    disk = collect_disk_sample()
+    processes = collect_process_sample()
+    pressure = collect_pressure_sample()
+    print_comparison(
+        "This host",
+        [
+            ("cpu", build_cpu_info(cpu), build_cpu_metrics(cpu)),
+            ("memory", build_memory_info(memory), build_memory_metrics(memory)),
+            ("disk", build_disk_info(disk), build_disk_metrics(disk)),
+            ("process", build_process_info(processes), build_process_metrics(processes)),
+            ("pressure", build_pressure_info(pressure), build_pressure_metrics(pressure)),
+        ],
+    )
+
+    synthetic = synthetic_samples()
+    print_comparison(
+        "Synthetic host (128 cores, 40 partitions)",
+        [
+            ("cpu", build_cpu_info(synthetic["cpu"]), build_cpu_metrics(synthetic["cpu"])),
+            (
+                "memory",
+                build_memory_info(synthetic["memory"]),
+                build_memory_metrics(synthetic["memory"]),
+            ),
+            ("disk", build_disk_info(synthetic["disk"]), build_disk_metrics(synthetic["disk"])),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Continuous System Monitoring Daemon
+
+Samples the monitor tools every few seconds and evaluates the alert rules
+in-process. The LLM is only called when an alert starts firing or is resolved,
+with the metric window that triggered the change attached to the request. In
+"template" report mode no LLM is called at all.
+
+Usage:
+    python monitor_daemon.py [--interval SECONDS] [--once]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from dotenv import load_dotenv
+
+# Load settings before the package reads them from the environment
+load_dotenv(dotenv_path="system_monitor_agent/.env")
+
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions import InMemorySessionService  # noqa: E402
+from google.genai import types  # noqa: E402
+from system_monitor_agent.alerting import AlertEngine, default_rules  # noqa: E402
+from system_monitor_agent.config import (  # noqa: E402
+    MONITOR_INTERVAL_SECONDS,
+    REPORT_MODE,
+)
+from system_monitor_agent.snapshot import build_snapshot, collect_samples  # noqa: E402
+from system_monitor_agent.subagents.cpu_info_agent.formatter import (  # noqa: E402
+    format_cpu_info,
+)
+from system_monitor_agent.subagents.cpu_info_agent.tools import (  # noqa: E402
+    build_cpu_info,
+)
+from system_monitor_agent.subagents.disk_info_agent.formatter import (  # noqa: E402
+    format_disk_info,
+)
+from system_monitor_agent.subagents.disk_info_agent.tools import (  # noqa: E402
+    build_disk_info,
+)
+from system_monitor_agent.subagents.memory_info_agent.formatter import (  # noqa: E402
+    format_memory_info,
+)
+from system_monitor_agent.subagents.memory_info_agent.tools import (  # noqa: E402
+    build_memory_info,
+)
+from system_monitor_agent.subagents.pressure_info_agent.formatter import (  # noqa: E402
+    format_pressure_info,
+)
+from system_monitor_agent.subagents.pressure_info_agent.tools import (  # noqa: E402
+    get_pressure_info,
+)
+from system_monitor_agent.subagents.process_info_agent.formatter import (  # noqa: E402
+    format_process_info,
+)
+from system_monitor_agent.subagents.process_info_agent.tools import (  # noqa: E402
+    get_top_processes,
+)
+from system_monitor_agent.subagents.synthesizer_agent import (  # noqa: E402
+    alert_report_synthesizer,
+)
+from system_monitor_agent.subagents.synthesizer_agent.template import (  # noqa: E402
+    render_system_report,
+)
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "System Monitor Daemon"
+USER_ID = "monitor_daemon"
+
+
+async def build_report_state(samples):
+    """Format the report sections (and raw data) for the synthesizer."""
+    cpu_data = build_cpu_info(samples["cpu"])
+    memory_data = build_memory_info(samples["memory"])
+    disk_data = build_disk_info(samples["disk"])
+    process_data = await asyncio.to_thread(get_top_processes)
+    pressure_data = await asyncio.to_thread(get_pressure_info)
+    return {
+        "cpu_info": format_cpu_info(cpu_data),
+        "memory_info": format_memory_info(memory_data),
+        "disk_info": format_disk_info(disk_data),
+        "process_info": format_process_info(process_data),
+        "pressure_info": format_pressure_info(pressure_data),
+        "cpu_info_data": cpu_data,
+        "memory_info_data": memory_data,
+        "disk_info_data": disk_data,
+        "pressure_info_data": pressure_data,
+    }
+
+
+async def report_transitions(runner, session_service, transitions, window, samples):
+    """Produce an alert report for a set of alert state changes."""
+    state = await build_report_state(samples)
+    alert_payload = json.dumps(
+        {"alert_changes": transitions, "metric_window": window}, indent=2
+    )
+
+    if REPORT_MODE == "template":
+        headline = "\n".join(
+            f"- **{t['alert']}** {t['state']}: {t['value']:.1f}"
+            f" (threshold {t['threshold']:g})"
+            for t in transitions
+        )
+        print(f"# Alert\n\n{headline}\n\n{render_system_report(**state)}")
+        return
+
+    # A fresh session per alert keeps the prompt free of earlier reports
+    session = await session_service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, state=state
+    )
+    message = types.Content(role="user", parts=[types.Part(text=alert_payload)])
+    async for event in runner.run_async(
+        user_id=USER_ID, session_id=session.id, new_message=message
+    ):
+        if event.is_final_response() and event.content and event.content.parts:
+            print(event.content.parts[0].text)
+    await session_service.delete_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+    )
+
+
+async def run_daemon(interval, once=False):
+    """Evaluate the alert rules every `interval` seconds until interrupted."""
+    engine = AlertEngine(default_rules())
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=alert_report_synthesizer,
+        app_name=APP_NAME,
+        session_service=session_service,
+    )
+    print(
+        f"Monitoring every {interval:g}s (report mode: {REPORT_MODE}). "
+        "Press Ctrl+C to stop."
+    )
+
+    while True:
+        started = time.monotonic()
+        try:
+            samples = await asyncio.to_thread(collect_samples)
+            transitions = engine.evaluate(build_snapshot(samples))
+
+            if transitions:
+                for transition in transitions:
+                    print(
+                        f"[{time.strftime('%H:%M:%S')}] {transition['alert']} "
+                        f"{transition['state']} ({transition['value']:.1f})"
+                    )
+                await report_transitions(
+                    runner,
+                    session_service,
+                    transitions,
+                    engine.metric_window(),
+                    samples,
+                )
+        except Exception:
+            # A failed sample or report must not stop the daemon; the engine
+            # keeps its alert states, so hysteresis and cooldowns carry over
+            logger.exception("Monitoring pass failed; retrying next interval")
+
+        if once:
+            break
+        await asyncio.sleep(max(interval - (time.monotonic() - started), 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Continuous system monitoring daemon")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=MONITOR_INTERVAL_SECONDS,
+        help="Seconds between rule evaluations",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Evaluate the rules once and exit"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    try:
+        asyncio.run(run_daemon(args.interval, args.once))
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped.")
+
+
+if __name__ == "__main__":
+    main()
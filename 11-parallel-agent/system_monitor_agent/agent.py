@@ -2,25 +2,91 @@
 System Monitor Root Agent
 
 This module defines the root agent for the system monitoring application.
-It uses a parallel agent for system information gathering and a sequential
-pipeline for the overall flow.
+It uses a parallel agent with per-branch deadlines for system information
+gathering and a sequential pipeline for the overall flow.
+
+The pipeline shape depends on REPORT_MODE (see config.py):
+- llm: LLM info agents + LLM synthesizer (one model call per agent, for interactive use)
+- deterministic: formatter agents + LLM synthesizer (1 model call)
+- template: formatter agents + template synthesizer (no model calls)
 """
 
-from google.adk.agents import ParallelAgent, SequentialAgent
+from google.adk.agents import SequentialAgent
+
+from .config import (
+    BRANCH_DEADLINES,
+    FLEET_HOSTS,
+    PAYLOAD_MODE,
+    PAYLOAD_MODES,
+    REPORT_MODE,
+    REPORT_MODES,
+)
+from .parallel import DeadlineParallelAgent
+from .subagents.cpu_info_agent import cpu_info_agent, cpu_info_reporter
+from .subagents.disk_info_agent import disk_info_agent, disk_info_reporter
+from .subagents.fleet_info_agent import fleet_info_agent, fleet_info_reporter
+from .subagents.memory_info_agent import memory_info_agent, memory_info_reporter
+from .subagents.pressure_info_agent import (
+    pressure_info_agent,
+    pressure_info_reporter,
+)
+from .subagents.process_info_agent import process_info_agent, process_info_reporter
+from .subagents.synthesizer_agent import (
+    system_report_synthesizer,
+    template_report_synthesizer,
+)
+
+if REPORT_MODE not in REPORT_MODES:
+    raise ValueError(
+        f"Unknown SYSTEM_MONITOR_REPORT_MODE '{REPORT_MODE}', "
+        f"expected one of: {', '.join(REPORT_MODES)}"
+    )
+if PAYLOAD_MODE not in PAYLOAD_MODES:
+    raise ValueError(
+        f"Unknown SYSTEM_MONITOR_PAYLOAD_MODE '{PAYLOAD_MODE}', "
+        f"expected one of: {', '.join(PAYLOAD_MODES)}"
+    )
+
+# An agent can only have one parent, so only the selected branch agents are wired in
+if REPORT_MODE == "llm":
+    info_agents = [
+        cpu_info_agent,
+        memory_info_agent,
+        disk_info_agent,
+        process_info_agent,
+        pressure_info_agent,
+    ]
+else:
+    info_agents = [
+        cpu_info_reporter,
+        memory_info_reporter,
+        disk_info_reporter,
+        process_info_reporter,
+        pressure_info_reporter,
+    ]
+
+# The fleet branch only runs when collectors are configured (SYSTEM_MONITOR_FLEET_HOSTS)
+if FLEET_HOSTS:
+    info_agents.append(
+        fleet_info_agent if REPORT_MODE == "llm" else fleet_info_reporter
+    )
 
-from .subagents.cpu_info_agent import cpu_info_agent
-from .subagents.disk_info_agent import disk_info_agent
-from .subagents.memory_info_agent import memory_info_agent
-from .subagents.synthesizer_agent import system_report_synthesizer
+if REPORT_MODE == "template":
+    synthesizer = template_report_synthesizer
+else:
+    synthesizer = system_report_synthesizer
 
 # --- 1. Create Parallel Agent to gather information concurrently ---
-system_info_gatherer = ParallelAgent(
+# A branch that misses its deadline is reported as timed out instead of
+# holding back the report
+system_info_gatherer = DeadlineParallelAgent(
     name="system_info_gatherer",
-    sub_agents=[cpu_info_agent, memory_info_agent, disk_info_agent],
+    sub_agents=info_agents,
+    deadlines=BRANCH_DEADLINES,
 )
 
 # --- 2. Create Sequential Pipeline to gather info in parallel, then synthesize ---
 root_agent = SequentialAgent(
     name="system_monitor_agent",
-    sub_agents=[system_info_gatherer, system_report_synthesizer],
+    sub_agents=[system_info_gatherer, synthesizer],
 )
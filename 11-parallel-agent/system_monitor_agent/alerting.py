@@ -0,0 +1,155 @@
+"""
+System Monitor Alerting
+
+This module provides the in-process rule engine used by the monitoring daemon.
+Rules read a value from a compact metrics snapshot and keep an alert state with
+hysteresis (an alert clears only below `threshold - hysteresis`) and a cooldown
+(the minimum time between two state changes of the same alert). The engine
+keeps a sliding window of recent snapshots so a state change can be reported
+together with the metrics that caused it.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .config import (
+    ALERT_COOLDOWN_SECONDS,
+    ALERT_HYSTERESIS_PERCENT,
+    CPU_ALERT_PERCENT,
+    DISK_ALERT_PERCENT,
+    MEMORY_ALERT_PERCENT,
+    METRIC_WINDOW_SIZE,
+    SWAP_ALERT_PERCENT,
+)
+
+Snapshot = Dict[str, Any]
+
+
+class AlertRule:
+    """A threshold rule over one metric of a snapshot."""
+
+    def __init__(
+        self,
+        name: str,
+        metric: Callable[[Snapshot], Optional[float]],
+        threshold: float,
+        hysteresis: float = ALERT_HYSTERESIS_PERCENT,
+        cooldown_seconds: float = ALERT_COOLDOWN_SECONDS,
+        description: str = "",
+    ):
+        self.name = name
+        self.metric = metric
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.cooldown_seconds = cooldown_seconds
+        self.description = description or name
+
+
+class AlertEngine:
+    """Evaluates alert rules against a stream of snapshots."""
+
+    def __init__(self, rules: List[AlertRule], window_size: int = METRIC_WINDOW_SIZE):
+        self.rules = rules
+        self.window: Deque[Tuple[float, Snapshot]] = deque(maxlen=window_size)
+        self.active: Dict[str, bool] = {rule.name: False for rule in rules}
+        self._last_change: Dict[str, float] = {}
+
+    def evaluate(
+        self, snapshot: Snapshot, now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Add a snapshot to the window and update every alert state.
+
+        Args:
+            snapshot (Snapshot): Compact metrics keyed by component
+            now (Optional[float]): Evaluation time (defaults to time.time())
+
+        Returns:
+            List[Dict[str, Any]]: One entry per alert whose state changed
+        """
+        now = time.time() if now is None else now
+        self.window.append((now, snapshot))
+
+        transitions = []
+        for rule in self.rules:
+            value = rule.metric(snapshot)
+            if value is None:
+                continue
+
+            was_active = self.active[rule.name]
+            if was_active:
+                is_active = value >= rule.threshold - rule.hysteresis
+            else:
+                is_active = value > rule.threshold
+            if is_active == was_active:
+                continue
+
+            last_change = self._last_change.get(rule.name)
+            if last_change is not None and now - last_change < rule.cooldown_seconds:
+                # Hold the current state until the cooldown has passed
+                continue
+
+            self.active[rule.name] = is_active
+            self._last_change[rule.name] = now
+            transitions.append(
+                {
+                    "alert": rule.name,
+                    "description": rule.description,
+                    "state": "firing" if is_active else "resolved",
+                    "value": value,
+                    "threshold": rule.threshold,
+                    "timestamp": now,
+                }
+            )
+        return transitions
+
+    def metric_window(self) -> List[Dict[str, Any]]:
+        """Return the recent rule values, oldest first, for reporting."""
+        return [
+            {
+                "timestamp": timestamp,
+                **{rule.name: rule.metric(snapshot) for rule in self.rules},
+            }
+            for timestamp, snapshot in self.window
+        ]
+
+
+def _max_disk_percent(snapshot: Snapshot) -> Optional[float]:
+    """Highest usage across the partitions of a compact disk snapshot."""
+    percentages = [
+        partition["pct"]
+        for partition in snapshot.get("disk", {}).get("partitions", [])
+        if "pct" in partition
+    ]
+    return max(percentages) if percentages else None
+
+
+def default_rules() -> List[AlertRule]:
+    """The daemon rules, using the same thresholds the monitor tools flag."""
+    return [
+        AlertRule(
+            "high_cpu",
+            lambda snapshot: snapshot.get("cpu", {}).get("usage_pct"),
+            CPU_ALERT_PERCENT,
+            description=f"Average CPU usage above {CPU_ALERT_PERCENT:g}%",
+        ),
+        AlertRule(
+            "high_memory",
+            lambda snapshot: snapshot.get("memory", {}).get("mem_pct"),
+            MEMORY_ALERT_PERCENT,
+            description=f"Memory usage above {MEMORY_ALERT_PERCENT:g}%",
+        ),
+        AlertRule(
+            "high_swap",
+            lambda snapshot: snapshot.get("memory", {}).get("swap_pct"),
+            SWAP_ALERT_PERCENT,
+            description=f"Swap usage above {SWAP_ALERT_PERCENT:g}%",
+        ),
+        AlertRule(
+            "high_disk",
+            _max_disk_percent,
+            DISK_ALERT_PERCENT,
+            description=f"A partition is more than {DISK_ALERT_PERCENT:g}% full",
+        ),
+    ]
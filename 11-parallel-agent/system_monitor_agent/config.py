@@ -0,0 +1,88 @@
+"""
+System Monitor Configuration
+
+This module holds the settings shared by the system monitor agents and tools.
+Values can be overridden through environment variables (for example in `.env`).
+"""
+
+import os
+
+# Report mode
+#   "llm"           - every info agent and the synthesizer call the model (interactive use)
+#   "deterministic" - info agents format tool output locally, only the synthesizer calls the model
+#   "template"      - no model calls at all, the report is rendered from a fixed template
+REPORT_MODES = ("llm", "deterministic", "template")
+REPORT_MODE = os.getenv("SYSTEM_MONITOR_REPORT_MODE", "llm").strip().lower()
+
+# Tool payload mode (what the LLM info agents receive from their tools)
+#   "verbose" - formatted strings in result/stats/additional_info sections
+#   "compact" - raw numbers only, per-core usage summarized as a histogram
+PAYLOAD_MODES = ("verbose", "compact")
+PAYLOAD_MODE = os.getenv("SYSTEM_MONITOR_PAYLOAD_MODE", "verbose").strip().lower()
+
+# Maximum serialized size of a compact tool result; longer lists are truncated
+TOOL_RESULT_MAX_BYTES = int(os.getenv("SYSTEM_MONITOR_TOOL_RESULT_MAX_BYTES", "1024"))
+
+# Alert thresholds used by the monitoring daemon (same limits the tools flag)
+CPU_ALERT_PERCENT = float(os.getenv("SYSTEM_MONITOR_CPU_ALERT_PERCENT", "80"))
+MEMORY_ALERT_PERCENT = float(os.getenv("SYSTEM_MONITOR_MEMORY_ALERT_PERCENT", "80"))
+SWAP_ALERT_PERCENT = float(os.getenv("SYSTEM_MONITOR_SWAP_ALERT_PERCENT", "80"))
+DISK_ALERT_PERCENT = float(os.getenv("SYSTEM_MONITOR_DISK_ALERT_PERCENT", "85"))
+# Share of time tasks were stalled (PSI "some" avg10) and of CFS periods throttled
+PRESSURE_ALERT_PERCENT = float(os.getenv("SYSTEM_MONITOR_PRESSURE_ALERT_PERCENT", "10"))
+THROTTLING_ALERT_PERCENT = float(
+    os.getenv("SYSTEM_MONITOR_THROTTLING_ALERT_PERCENT", "25")
+)
+
+# "What is filling this disk" scans: time budget per scan and entries per ranking
+SCAN_TIME_BUDGET_SECONDS = float(os.getenv("SYSTEM_MONITOR_SCAN_BUDGET", "5"))
+SCAN_TOP_N = int(os.getenv("SYSTEM_MONITOR_SCAN_TOP_N", "10"))
+
+# Log search: files to search (comma-separated), read and time budget per search
+# and the size budget of the result
+LOG_PATHS = [
+    path.strip()
+    for path in os.getenv(
+        "SYSTEM_MONITOR_LOG_PATHS", "/var/log/syslog,/var/log/messages,/var/log/kern.log"
+    ).split(",")
+    if path.strip()
+]
+LOG_READ_MAX_BYTES = int(os.getenv("SYSTEM_MONITOR_LOG_READ_MAX_BYTES", str(16 * 1024 * 1024)))
+LOG_SEARCH_BUDGET_SECONDS = float(os.getenv("SYSTEM_MONITOR_LOG_BUDGET", "1"))
+LOG_RESULT_MAX_BYTES = int(os.getenv("SYSTEM_MONITOR_LOG_RESULT_MAX_BYTES", "4096"))
+
+# An active alert clears only once the metric drops this far below its threshold
+ALERT_HYSTERESIS_PERCENT = float(os.getenv("SYSTEM_MONITOR_ALERT_HYSTERESIS", "5"))
+# Minimum time between two state changes of the same alert (damps flapping)
+ALERT_COOLDOWN_SECONDS = float(os.getenv("SYSTEM_MONITOR_ALERT_COOLDOWN", "300"))
+# How often the daemon evaluates the rules, and how many samples it keeps
+MONITOR_INTERVAL_SECONDS = float(os.getenv("SYSTEM_MONITOR_INTERVAL", "5"))
+METRIC_WINDOW_SIZE = int(os.getenv("SYSTEM_MONITOR_WINDOW_SIZE", "12"))
+
+# Deadline for each information branch of the report, in seconds. Branches
+# that miss it are reported as timed out. Per-branch overrides are given by
+# output_key, e.g. SYSTEM_MONITOR_BRANCH_DEADLINES=disk_info=10,fleet_info=5
+BRANCH_DEADLINE_SECONDS = float(os.getenv("SYSTEM_MONITOR_BRANCH_DEADLINE", "30"))
+BRANCH_DEADLINES = {
+    key.strip(): float(value)
+    for key, _, value in (
+        entry.partition("=")
+        for entry in os.getenv("SYSTEM_MONITOR_BRANCH_DEADLINES", "").split(",")
+    )
+    if key.strip() and value.strip()
+}
+
+# Fleet fan-in: collectors to query as comma-separated host:port entries
+# (empty = no fleet branch), the per-host timeout and the size budget
+FLEET_HOSTS = [
+    host.strip()
+    for host in os.getenv("SYSTEM_MONITOR_FLEET_HOSTS", "").split(",")
+    if host.strip()
+]
+FLEET_TIMEOUT_SECONDS = float(os.getenv("SYSTEM_MONITOR_FLEET_TIMEOUT", "3"))
+FLEET_MAX_WORKERS = int(os.getenv("SYSTEM_MONITOR_FLEET_WORKERS", "16"))
+FLEET_RESULT_MAX_BYTES = int(os.getenv("SYSTEM_MONITOR_FLEET_MAX_BYTES", "4096"))
+
+# Collector service: default port and how long a snapshot is reused
+COLLECTOR_PORT = int(os.getenv("SYSTEM_MONITOR_COLLECTOR_PORT", "9101"))
+COLLECTOR_CACHE_SECONDS = float(os.getenv("SYSTEM_MONITOR_COLLECTOR_CACHE", "2"))
@@ -0,0 +1,187 @@
+"""
+Deadline Parallel Agent
+
+This module provides a parallel workflow agent with a deadline per branch.
+
+ADK's ParallelAgent only finishes when its slowest branch does, so one slow
+disk probe or model response delays the whole report. DeadlineParallelAgent
+runs its sub-agents concurrently on isolated branches in the same way, but
+cancels a branch that misses its deadline and writes a "timed out" placeholder
+to the branch's `output_key`, so the next agent in the pipeline proceeds with
+whatever arrived. A branch that fails gets a "failed" placeholder instead of
+failing the whole report.
+
+The status and duration of every branch are stored in session state under
+`timings_key` ("branch_timings" by default).
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import Field
+
+from .config import BRANCH_DEADLINE_SECONDS
+
+
+class DeadlineParallelAgent(BaseAgent):
+    """
+    Runs sub-agents in parallel and gives each one a deadline.
+
+    Deadlines are looked up in `deadlines` by the sub-agent's output_key, then
+    by its name, and default to `default_deadline_seconds`. All deadlines are
+    measured from the start of this agent.
+    """
+
+    default_deadline_seconds: float = BRANCH_DEADLINE_SECONDS
+    deadlines: Dict[str, float] = Field(default_factory=dict)
+    timings_key: str = "branch_timings"
+
+    def deadline_for(self, sub_agent: BaseAgent) -> float:
+        """Return the deadline in seconds for one sub-agent."""
+        for key in (getattr(sub_agent, "output_key", None), sub_agent.name):
+            if key in self.deadlines:
+                return self.deadlines[key]
+        return self.default_deadline_seconds
+
+    def _branch_context(
+        self, sub_agent: BaseAgent, ctx: InvocationContext
+    ) -> InvocationContext:
+        """Create an isolated branch for a sub-agent, like ParallelAgent does."""
+        branch_ctx = ctx.model_copy()
+        suffix = f"{self.name}.{sub_agent.name}"
+        branch_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+        return branch_ctx
+
+    def _placeholder_event(
+        self,
+        sub_agent: BaseAgent,
+        branch_ctx: InvocationContext,
+        text: str,
+    ) -> Optional[Event]:
+        """Build the event that stands in for a branch's missing output."""
+        output_key = getattr(sub_agent, "output_key", None)
+        if not output_key:
+            return None
+        return Event(
+            invocation_id=branch_ctx.invocation_id,
+            author=self.name,
+            branch=branch_ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={output_key: text}),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        if not self.sub_agents:
+            return
+
+        started = time.monotonic()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run_branch(sub_agent: BaseAgent, branch_ctx: InvocationContext):
+            async for event in sub_agent.run_async(branch_ctx):
+                # Wait until the event is yielded (and its state delta applied)
+                # before the branch produces the next one
+                resume = asyncio.Event()
+                await queue.put((sub_agent.name, event, resume))
+                await resume.wait()
+
+        branches: Dict[str, Dict[str, Any]] = {}
+        for sub_agent in self.sub_agents:
+            branch_ctx = self._branch_context(sub_agent, ctx)
+            task = asyncio.create_task(run_branch(sub_agent, branch_ctx))
+            task.add_done_callback(
+                lambda _, name=sub_agent.name: queue.put_nowait((name, None, None))
+            )
+            branches[sub_agent.name] = {
+                "agent": sub_agent,
+                "ctx": branch_ctx,
+                "task": task,
+                "deadline": started + self.deadline_for(sub_agent),
+            }
+
+        timings: Dict[str, Dict[str, Any]] = {}
+        pending = set(branches)
+        # One long-lived getter, so a timeout never drops a queued event
+        getter: Optional[asyncio.Future] = None
+        try:
+            while pending:
+                if getter is None:
+                    getter = asyncio.ensure_future(queue.get())
+                next_deadline = min(branches[name]["deadline"] for name in pending)
+                await asyncio.wait(
+                    {getter}, timeout=max(next_deadline - time.monotonic(), 0)
+                )
+
+                if not getter.done():
+                    # Cancel every branch whose deadline has passed
+                    now = time.monotonic()
+                    expired = [n for n in pending if branches[n]["deadline"] <= now]
+                    for name in expired:
+                        branch = branches[name]
+                        branch["task"].cancel()
+                        pending.discard(name)
+                        deadline = self.deadline_for(branch["agent"])
+                        timings[name] = {
+                            "status": "timed_out",
+                            "seconds": round(now - started, 3),
+                            "deadline_seconds": deadline,
+                        }
+                        placeholder = self._placeholder_event(
+                            branch["agent"],
+                            branch["ctx"],
+                            f"{name} timed out after {deadline:g}s;"
+                            " no data was collected.",
+                        )
+                        if placeholder:
+                            yield placeholder
+                    continue
+
+                name, event, resume = getter.result()
+                getter = None
+                branch = branches[name]
+
+                if event is None:
+                    # The branch task finished (or was cancelled at its deadline)
+                    if name not in pending:
+                        continue
+                    pending.discard(name)
+                    task = branch["task"]
+                    error = None if task.cancelled() else task.exception()
+                    timings[name] = {
+                        "status": "error" if error else "ok",
+                        "seconds": round(time.monotonic() - started, 3),
+                        "deadline_seconds": self.deadline_for(branch["agent"]),
+                    }
+                    if error:
+                        timings[name]["error"] = f"{type(error).__name__}: {error}"
+                        placeholder = self._placeholder_event(
+                            branch["agent"],
+                            branch["ctx"],
+                            f"{name} failed: {type(error).__name__}: {error}",
+                        )
+                        if placeholder:
+                            yield placeholder
+                    continue
+
+                if name in pending:
+                    yield event
+                    resume.set()
+        finally:
+            if getter is not None:
+                getter.cancel()
+            for branch in branches.values():
+                branch["task"].cancel()
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.timings_key: timings}),
+        )
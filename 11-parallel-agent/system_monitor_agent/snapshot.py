@@ -0,0 +1,53 @@
+"""
+System Monitor Snapshots
+
+This module collects the raw CPU, memory and disk samples concurrently and
+turns them into a compact metrics snapshot. The monitoring daemon evaluates its
+alert rules on snapshots and the collector service serves them to other hosts.
+"""
+
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from .subagents.cpu_info_agent.tools import build_cpu_metrics, collect_cpu_sample
+from .subagents.disk_info_agent.tools import build_disk_metrics, collect_disk_sample
+from .subagents.memory_info_agent.tools import (
+    build_memory_metrics,
+    collect_memory_sample,
+)
+
+_sample_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="snapshot")
+
+
+def collect_samples() -> Dict[str, Any]:
+    """
+    Collect the raw CPU, memory and disk samples concurrently.
+
+    Returns:
+        Dict[str, Any]: Raw samples keyed by component
+    """
+    cpu = _sample_executor.submit(collect_cpu_sample)
+    memory = _sample_executor.submit(collect_memory_sample)
+    disk = _sample_executor.submit(collect_disk_sample)
+    return {"cpu": cpu.result(), "memory": memory.result(), "disk": disk.result()}
+
+
+def build_snapshot(samples: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a compact metrics snapshot from raw samples.
+
+    Args:
+        samples (Dict[str, Any]): Result of collect_samples
+
+    Returns:
+        Dict[str, Any]: Compact CPU, memory and disk metrics
+    """
+    return {
+        "host": socket.gethostname(),
+        "cpu": build_cpu_metrics(samples["cpu"]),
+        "memory": build_memory_metrics(samples["memory"]),
+        "disk": build_disk_metrics(samples["disk"]),
+        "ts": round(time.time()),
+    }
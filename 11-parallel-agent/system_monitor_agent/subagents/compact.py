@@ -0,0 +1,132 @@
+"""
+Compact Tool Payloads
+
+This module provides helpers for the compact tool payload mode: summarizing
+per-core usage as a histogram, estimating the prompt cost of a tool result and
+trimming a result to a byte budget.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import TOOL_RESULT_MAX_BYTES
+
+# --- Constants ---
+HISTOGRAM_BUCKET_PERCENT = 10  # Width of each per-core usage bucket
+CHARS_PER_TOKEN = 4  # Rough average for JSON-ish text
+
+
+def dumps(payload: Any) -> str:
+    """Serialize a payload the way it is measured: JSON without whitespace."""
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def payload_size(payload: Any) -> Tuple[int, int]:
+    """
+    Measure a tool payload.
+
+    Returns:
+        Tuple[int, int]: Serialized size in bytes and estimated token count
+    """
+    size = len(dumps(payload).encode("utf-8"))
+    return size, -(-size // CHARS_PER_TOKEN)
+
+
+def summarize_percentages(values: Sequence[float]) -> Dict[str, Any]:
+    """
+    Summarize per-core (or per-item) percentages without listing every value.
+
+    Args:
+        values (Sequence[float]): Percentages between 0 and 100
+
+    Returns:
+        Dict[str, Any]: Count, min/mean/max and a histogram with one count per
+            HISTOGRAM_BUCKET_PERCENT wide bucket (the last bucket includes 100)
+    """
+    if not values:
+        return {"n": 0}
+
+    bucket_count = 100 // HISTOGRAM_BUCKET_PERCENT
+    histogram = [0] * bucket_count
+    for value in values:
+        histogram[min(int(value // HISTOGRAM_BUCKET_PERCENT), bucket_count - 1)] += 1
+
+    return {
+        "n": len(values),
+        "min": round(min(values), 1),
+        "mean": round(sum(values) / len(values), 1),
+        "max": round(max(values), 1),
+        "hist": histogram,
+    }
+
+
+def _is_row_list(items: List[Any]) -> bool:
+    """Check whether a list holds rows or records (not scalars of one row)."""
+    return bool(items) and all(isinstance(item, (list, dict)) for item in items)
+
+
+def _find_longest_list(
+    payload: Any, path: Tuple[Any, ...] = ()
+) -> Optional[Tuple[Tuple[Any, ...], List[Any]]]:
+    """
+    Find the longest list of rows or records in a nested payload.
+
+    Lists of scalars (positional rows such as [pid, name, value], triples and
+    histograms) are never returned, and rows are not searched, so trimming
+    only ever drops whole rows.
+    """
+    best = None
+    if isinstance(payload, dict):
+        items = ((key, value) for key, value in payload.items() if key != "hist")
+    elif isinstance(payload, list):
+        if not _is_row_list(payload):
+            return None
+        if len(payload) > 1:
+            best = (path, payload)
+        # Records can hold lists of their own; positional rows cannot be cut
+        items = (
+            (index, item)
+            for index, item in enumerate(payload)
+            if isinstance(item, dict)
+        )
+    else:
+        return None
+
+    for key, value in items:
+        found = _find_longest_list(value, path + (key,))
+        if found and (best is None or len(found[1]) > len(best[1])):
+            best = found
+    return best
+
+
+def fit_to_budget(
+    payload: Dict[str, Any], max_bytes: int = TOOL_RESULT_MAX_BYTES
+) -> Dict[str, Any]:
+    """
+    Trim a payload until it serializes to at most max_bytes.
+
+    Lists of rows or records are assumed to be ordered most important first,
+    so the longest one is repeatedly shortened by a quarter, dropping whole
+    rows from the end. Lists of scalars (the fields of one row) are kept. The
+    number of dropped items per list is recorded under "omitted" so the model
+    knows the data is incomplete.
+
+    Args:
+        payload (Dict[str, Any]): Tool payload (modified in place)
+        max_bytes (int): Byte budget for the serialized payload
+
+    Returns:
+        Dict[str, Any]: The trimmed payload
+    """
+    omitted: Dict[str, int] = {}
+    while len(dumps(payload).encode("utf-8")) > max_bytes:
+        found = _find_longest_list(payload)
+        if found is None:
+            break
+        path, items = found
+        keep = len(items) * 3 // 4
+        label = ".".join(str(part) for part in path)
+        omitted[label] = omitted.get(label, 0) + len(items) - keep
+        del items[keep:]
+        payload["omitted"] = omitted
+    return payload
@@ -6,35 +6,61 @@ This agent is responsible for gathering and analyzing CPU information.
 
 from google.adk.agents import LlmAgent
 
-from .tools import get_cpu_info
+from ...config import PAYLOAD_MODE
+from ..deterministic import ToolReportAgent
+from .formatter import format_cpu_info
+from .tools import get_cpu_info, get_cpu_metrics
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# The LLM agent gets the compact payload in "compact" payload mode
+if PAYLOAD_MODE == "compact":
+    cpu_tool = get_cpu_metrics
+    tool_result_description = """The tool will return a compact dictionary of raw numbers:
+    - cores_physical, cores_logical: Core counts
+    - usage_pct: Average CPU usage
+    - per_core_pct: Per-core usage summary (n, min, mean, max and hist, the
+      number of cores in each 10% bucket from 0-10% to 90-100%)
+    - alerts: Raised alerts (high_cpu)"""
+else:
+    cpu_tool = get_cpu_info
+    tool_result_description = """The tool will return a dictionary with:
+    - result: Core CPU information
+    - stats: Key statistical data about CPU usage
+    - additional_info: Context about the data collection"""
+tool_name = cpu_tool.__name__
+
 # CPU Information Agent
 cpu_info_agent = LlmAgent(
     name="CpuInfoAgent",
     model=GEMINI_MODEL,
-    instruction="""You are a CPU Information Agent.
+    instruction=f"""You are a CPU Information Agent.
     
     When asked for system information, you should:
-    1. Use the 'get_cpu_info' tool to gather CPU data
+    1. Use the '{tool_name}' tool to gather CPU data
     2. Analyze the returned dictionary data
     3. Format this information into a concise, clear section of a system report
     
-    The tool will return a dictionary with:
-    - result: Core CPU information
-    - stats: Key statistical data about CPU usage
-    - additional_info: Context about the data collection
+    {tool_result_description}
     
     Format your response as a well-structured report section with:
     - CPU core information (physical vs logical)
     - CPU usage statistics
     - Any performance concerns (high usage > 80%)
     
-    IMPORTANT: You MUST call the get_cpu_info tool. Do not make up information.
+    IMPORTANT: You MUST call the {tool_name} tool. Do not make up information.
     """,
     description="Gathers and analyzes CPU information",
-    tools=[get_cpu_info],
+    tools=[cpu_tool],
+    output_key="cpu_info",
+)
+
+# Deterministic CPU Information Agent (no LLM call, used by the template report modes)
+cpu_info_reporter = ToolReportAgent(
+    name="CpuInfoReporter",
+    description="Gathers CPU information and formats it without an LLM",
+    tool=get_cpu_info,
+    formatter=format_cpu_info,
     output_key="cpu_info",
 )
@@ -0,0 +1,38 @@
+"""
+CPU Information Formatter
+
+This module renders the output of `get_cpu_info` as a report section without
+calling an LLM.
+"""
+
+from typing import Any, Dict
+
+
+def format_cpu_info(data: Dict[str, Any]) -> str:
+    """
+    Format the CPU tool result as a markdown report section.
+
+    Args:
+        data (Dict[str, Any]): Dictionary returned by get_cpu_info
+
+    Returns:
+        str: Markdown section describing CPU cores, usage and concerns
+    """
+    result = data.get("result", {})
+    if "error" in result:
+        return f"## CPU\n\n**Unavailable:** {result['error']}"
+
+    stats = data.get("stats", {})
+    concern = data.get("additional_info", {}).get("performance_concern")
+
+    lines = [
+        "## CPU",
+        "",
+        f"- Physical cores: {stats.get('physical_cores')}",
+        f"- Logical cores: {stats.get('logical_cores')}",
+        f"- Average usage: {stats.get('avg_usage_percentage', 0):.1f}%",
+        f"- Per-core usage: {', '.join(result.get('cpu_usage_per_core', []))}",
+        "",
+        f"**Concern:** {concern}" if concern else "No CPU concerns (usage <= 80%).",
+    ]
+    return "\n".join(lines)
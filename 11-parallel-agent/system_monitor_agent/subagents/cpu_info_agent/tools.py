@@ -1,7 +1,11 @@
 """
 CPU Information Tool
 
-This module provides a tool for gathering CPU information.
+This module provides tools for gathering CPU information.
+
+`get_cpu_info` returns the verbose, pre-formatted payload and `get_cpu_metrics`
+the compact one (raw numbers, per-core usage summarized as a histogram). Both
+are built from the same `collect_cpu_sample` measurement.
 """
 
 import time
@@ -9,52 +13,122 @@ from typing import Any, Dict
 
 import psutil
 
+from ..compact import fit_to_budget, summarize_percentages
 
-def get_cpu_info() -> Dict[str, Any]:
+
+def collect_cpu_sample() -> Dict[str, Any]:
     """
-    Gather CPU information including core count and usage.
+    Measure CPU core counts and usage.
+
+    Returns:
+        Dict[str, Any]: Raw measurements (core counts and usage percentages)
+    """
+    per_core = psutil.cpu_percent(interval=1, percpu=True)
+    return {
+        "physical_cores": psutil.cpu_count(logical=False),
+        "logical_cores": psutil.cpu_count(logical=True),
+        "per_core_usage": per_core,
+        # The overall usage is the mean of the per-core usage over the same
+        # interval, so it does not need a second one-second sample
+        "avg_usage": sum(per_core) / len(per_core) if per_core else 0.0,
+        "timestamp": time.time(),
+    }
+
+
+def build_cpu_info(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the verbose CPU payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_cpu_sample
 
     Returns:
         Dict[str, Any]: Dictionary with CPU information structured for ADK
     """
-    try:
-        # Get CPU information
-        cpu_info = {
-            "physical_cores": psutil.cpu_count(logical=False),
-            "logical_cores": psutil.cpu_count(logical=True),
-            "cpu_usage_per_core": [
-                f"Core {i}: {percentage:.1f}%"
-                for i, percentage in enumerate(
-                    psutil.cpu_percent(interval=1, percpu=True)
-                )
-            ],
-            "avg_cpu_usage": f"{psutil.cpu_percent(interval=1):.1f}%",
-        }
+    cpu_info = {
+        "physical_cores": sample["physical_cores"],
+        "logical_cores": sample["logical_cores"],
+        "cpu_usage_per_core": [
+            f"Core {i}: {percentage:.1f}%"
+            for i, percentage in enumerate(sample["per_core_usage"])
+        ],
+        "avg_cpu_usage": f"{sample['avg_usage']:.1f}%",
+    }
 
-        # Calculate some stats for the result summary
-        avg_usage = float(cpu_info["avg_cpu_usage"].strip("%"))
-        high_usage = avg_usage > 80
+    # Calculate some stats for the result summary
+    avg_usage = float(cpu_info["avg_cpu_usage"].strip("%"))
+    high_usage = avg_usage > 80
 
-        # Format for ADK tool return structure
-        return {
-            "result": cpu_info,
-            "stats": {
-                "physical_cores": cpu_info["physical_cores"],
-                "logical_cores": cpu_info["logical_cores"],
-                "avg_usage_percentage": avg_usage,
-                "high_usage_alert": high_usage,
-            },
-            "additional_info": {
-                "data_format": "dictionary",
-                "collection_timestamp": time.time(),
-                "performance_concern": (
-                    "High CPU usage detected" if high_usage else None
-                ),
-            },
+    # Format for ADK tool return structure
+    return {
+        "result": cpu_info,
+        "stats": {
+            "physical_cores": cpu_info["physical_cores"],
+            "logical_cores": cpu_info["logical_cores"],
+            "avg_usage_percentage": avg_usage,
+            "high_usage_alert": high_usage,
+        },
+        "additional_info": {
+            "data_format": "dictionary",
+            "collection_timestamp": sample["timestamp"],
+            "performance_concern": (
+                "High CPU usage detected" if high_usage else None
+            ),
+        },
+    }
+
+
+def build_cpu_metrics(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the compact CPU payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_cpu_sample
+
+    Returns:
+        Dict[str, Any]: Raw numbers with a per-core usage histogram
+    """
+    avg_usage = round(sample["avg_usage"], 1)
+    return fit_to_budget(
+        {
+            "cores_physical": sample["physical_cores"],
+            "cores_logical": sample["logical_cores"],
+            "usage_pct": avg_usage,
+            "per_core_pct": summarize_percentages(sample["per_core_usage"]),
+            "alerts": ["high_cpu"] if avg_usage > 80 else [],
+            "ts": round(sample["timestamp"]),
         }
+    )
+
+
+def get_cpu_info() -> Dict[str, Any]:
+    """
+    Gather CPU information including core count and usage.
+
+    Returns:
+        Dict[str, Any]: Dictionary with CPU information structured for ADK
+    """
+    try:
+        return build_cpu_info(collect_cpu_sample())
     except Exception as e:
         return {
             "result": {"error": f"Failed to gather CPU information: {str(e)}"},
             "stats": {"success": False},
             "additional_info": {"error_type": str(type(e).__name__)},
         }
+
+
+def get_cpu_metrics() -> Dict[str, Any]:
+    """
+    Gather CPU core counts and usage as compact raw numbers.
+
+    Per-core usage is summarized as min/mean/max and a histogram with one
+    count per 10% bucket (hist[0] = cores at 0-10%, hist[9] = cores at 90-100%).
+
+    Returns:
+        Dict[str, Any]: Compact dictionary with CPU metrics
+    """
+    try:
+        return build_cpu_metrics(collect_cpu_sample())
+    except Exception as e:
+        return {"error": f"Failed to gather CPU information: {str(e)}"}
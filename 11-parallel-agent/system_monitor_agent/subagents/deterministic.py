@@ -0,0 +1,82 @@
+"""
+Deterministic Report Agents
+
+This module provides custom (non-LLM) agents for the system monitor pipeline.
+They call the same tools as the LLM agents and render their output with plain
+Python formatters, so periodic health checks do not pay for a model call just
+to reformat a dictionary.
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Callable, Dict, List
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+
+def _text_event(
+    agent: BaseAgent,
+    ctx: InvocationContext,
+    text: str,
+    state_delta: Dict[str, Any],
+) -> Event:
+    """Build a model-authored event carrying text and a state update."""
+    return Event(
+        invocation_id=ctx.invocation_id,
+        author=agent.name,
+        branch=ctx.branch,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+class ToolReportAgent(BaseAgent):
+    """
+    Runs a single monitoring tool and formats its result without an LLM.
+
+    The formatted section is written to `output_key`, exactly like an LlmAgent
+    with the same output_key, and the raw tool dictionary is kept under
+    `<output_key>_data` so a template synthesizer can derive the overall status.
+    """
+
+    tool: Callable[[], Dict[str, Any]]
+    formatter: Callable[[Dict[str, Any]], str]
+    output_key: str
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        # psutil calls block (cpu_percent samples for a full second), so run
+        # them in a worker thread to keep the parallel branches concurrent
+        data = await asyncio.to_thread(self.tool)
+        section = self.formatter(data)
+
+        yield _text_event(
+            self,
+            ctx,
+            section,
+            {self.output_key: section, f"{self.output_key}_data": data},
+        )
+
+
+class TemplateReportAgent(BaseAgent):
+    """
+    Renders the final system report from session state without an LLM.
+
+    `renderer` receives the values of `input_keys` (missing keys become None)
+    and returns the markdown report, which is also stored under `output_key`.
+    """
+
+    renderer: Callable[..., str]
+    input_keys: List[str]
+    output_key: str
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        report = self.renderer(**{key: state.get(key) for key in self.input_keys})
+
+        yield _text_event(self, ctx, report, {self.output_key: report})
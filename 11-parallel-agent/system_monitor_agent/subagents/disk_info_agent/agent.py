@@ -6,35 +6,69 @@ This agent is responsible for gathering and analyzing disk information.
 
 from google.adk.agents import LlmAgent
 
-from .tools import get_disk_info
+from ...config import PAYLOAD_MODE
+from ..deterministic import ToolReportAgent
+from .formatter import format_disk_info
+from .scanner import find_largest_paths
+from .tools import get_disk_info, get_disk_metrics
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# The LLM agent gets the compact payload in "compact" payload mode
+if PAYLOAD_MODE == "compact":
+    disk_tool = get_disk_metrics
+    tool_result_description = """The tool will return a compact dictionary of raw numbers:
+    - partitions: Mountpoint, usage percent and used/total bytes (or a status
+      for unresponsive mounts), sorted by usage
+    - io: Read/write bytes per second and IOPS
+    - alerts: Raised alerts (high_disk:<mount>, unresponsive:<mount>)"""
+else:
+    disk_tool = get_disk_info
+    tool_result_description = """The tool will return a dictionary with:
+    - result: Core disk information including partitions
+    - stats: Key statistical data about storage usage
+    - additional_info: Context about the data collection"""
+tool_name = disk_tool.__name__
+
 # Disk Information Agent
 disk_info_agent = LlmAgent(
     name="DiskInfoAgent",
     model=GEMINI_MODEL,
-    instruction="""You are a Disk Information Agent.
+    instruction=f"""You are a Disk Information Agent.
     
     When asked for system information, you should:
-    1. Use the 'get_disk_info' tool to gather disk data
+    1. Use the '{tool_name}' tool to gather disk data
     2. Analyze the returned dictionary data
-    3. Format this information into a concise, clear section of a system report
+    3. If a partition is above 85% usage, call the 'find_largest_paths' tool with its
+       mountpoint to find the directories and files that are filling it
+    4. Format this information into a concise, clear section of a system report
     
-    The tool will return a dictionary with:
-    - result: Core disk information including partitions
-    - stats: Key statistical data about storage usage
-    - additional_info: Context about the data collection
+    {tool_result_description}
+    
+    The find_largest_paths tool returns the largest directories (with the size of the
+    files directly inside them) and the largest files on that filesystem. If
+    stats.complete is false the scan hit its time budget and the sizes are lower bounds.
     
     Format your response as a well-structured report section with:
     - Partition information
     - Storage capacity and usage
-    - Any storage concerns (high usage > 85%)
+    - Disk I/O throughput and IOPS
+    - Any storage concerns (high usage > 85%, unresponsive or timed out mounts)
+    - For nearly full partitions, the largest directories and files and what to clean up
     
-    IMPORTANT: You MUST call the get_disk_info tool. Do not make up information.
+    IMPORTANT: You MUST call the {tool_name} tool. Do not make up information.
     """,
     description="Gathers and analyzes disk information",
-    tools=[get_disk_info],
+    tools=[disk_tool, find_largest_paths],
+    output_key="disk_info",
+)
+
+# Deterministic Disk Information Agent (no LLM call, used by the template report modes)
+disk_info_reporter = ToolReportAgent(
+    name="DiskInfoReporter",
+    description="Gathers disk information and formats it without an LLM",
+    tool=get_disk_info,
+    formatter=format_disk_info,
     output_key="disk_info",
 )
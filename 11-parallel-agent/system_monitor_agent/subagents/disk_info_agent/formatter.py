@@ -0,0 +1,66 @@
+"""
+Disk Information Formatter
+
+This module renders the output of `get_disk_info` as a report section without
+calling an LLM.
+"""
+
+from typing import Any, Dict
+
+
+def format_disk_info(data: Dict[str, Any]) -> str:
+    """
+    Format the disk tool result as a markdown report section.
+
+    Args:
+        data (Dict[str, Any]): Dictionary returned by get_disk_info
+
+    Returns:
+        str: Markdown section describing partitions, capacity and concerns
+    """
+    result = data.get("result", {})
+    if "error" in result:
+        return f"## Disk\n\n**Unavailable:** {result['error']}"
+
+    stats = data.get("stats", {})
+    additional_info = data.get("additional_info", {})
+    high_usage = additional_info.get("high_usage_partitions")
+    unresponsive = additional_info.get("unresponsive_partitions")
+
+    lines = [
+        "## Disk",
+        "",
+        f"- Partitions: {stats.get('partition_count', 0)}",
+        f"- Overall usage: {stats.get('used_space_gb', 0):.2f} GB of"
+        f" {stats.get('total_space_gb', 0):.2f} GB"
+        f" ({stats.get('overall_usage_percent', 0):.1f}%)",
+        "",
+        "| Mountpoint | Device | Type | Used | Total | Usage |",
+        "|---|---|---|---|---|---|",
+    ]
+    for partition in result.get("partitions", []):
+        lines.append(
+            f"| {partition['mountpoint']} | {partition['device']}"
+            f" | {partition['filesystem_type']} | {partition.get('used', '-')}"
+            f" | {partition.get('total_size', '-')}"
+            f" | {partition.get('percentage', partition.get('status', '-'))} |"
+        )
+
+    io = result.get("io")
+    if io:
+        lines.extend(
+            [
+                "",
+                f"- Read: {io['read_throughput']} ({io['read_iops']} IOPS)",
+                f"- Write: {io['write_throughput']} ({io['write_iops']} IOPS)",
+            ]
+        )
+
+    lines.append("")
+    if high_usage:
+        lines.append(f"**Concern:** High usage (> 85%) on {', '.join(high_usage)}")
+    if unresponsive:
+        lines.append(f"**Concern:** Unresponsive mounts: {', '.join(unresponsive)}")
+    if not high_usage and not unresponsive:
+        lines.append("No storage concerns (all partitions <= 85%).")
+    return "\n".join(lines)
@@ -0,0 +1,269 @@
+"""
+Disk Usage Scanner
+
+This module provides the `find_largest_paths` tool, which answers "what is
+filling this disk" for a mountpoint.
+
+Directories are scanned breadth-first with `os.scandir` in a thread pool (one
+task per directory), without crossing into other filesystems. The scan stops
+submitting work once its time budget is spent and reports a partial result.
+
+Each scanned directory is cached with its mtime. A directory's mtime changes
+when entries are added, removed or renamed, so on a repeat scan an unchanged
+directory costs one `stat` instead of a `scandir` plus one `stat` per file.
+Files that grow in place do not change their directory's mtime, so cache
+entries also expire after SCAN_CACHE_MAX_AGE_SECONDS.
+"""
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ...config import SCAN_TIME_BUDGET_SECONDS, SCAN_TOP_N
+
+# --- Constants ---
+SCAN_MAX_WORKERS = 8  # Directories scanned concurrently
+SCAN_CACHE_MAX_AGE_SECONDS = 300.0  # Rescan unchanged directories after this long
+SCAN_CACHE_MAX_DIRS = 200_000  # The cache is cleared when it grows past this
+
+
+class _DirectoryScan(NamedTuple):
+    """What one scandir of a directory found (cached by path)."""
+
+    device: int
+    inode: int
+    mtime_ns: int
+    scanned_at: float
+    file_bytes: int  # Allocated size of the files directly in the directory
+    file_count: int
+    subdirectories: Tuple[str, ...]  # Same-device child directories
+    largest_files: Tuple[Tuple[int, str], ...]  # (bytes, path), largest first
+    errors: int
+
+
+_scan_cache: Dict[str, _DirectoryScan] = {}
+_cache_lock = threading.Lock()
+
+
+def _allocated_bytes(stat_result: os.stat_result) -> int:
+    """Disk space used by a file (sparse files count what is allocated)."""
+    blocks = getattr(stat_result, "st_blocks", None)
+    return blocks * 512 if blocks is not None else stat_result.st_size
+
+
+def _format_size(size: float) -> str:
+    """Format a byte count using the largest fitting unit."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+
+def _scan_directory(path: str, device: int, top_n: int) -> Tuple[_DirectoryScan, bool]:
+    """
+    Scan one directory, or reuse its cached scan if the directory is unchanged.
+
+    Returns:
+        Tuple[_DirectoryScan, bool]: The scan and whether it came from the cache
+    """
+    directory_stat = os.stat(path, follow_symlinks=False)
+    cached = _scan_cache.get(path)
+    if (
+        cached is not None
+        and cached.inode == directory_stat.st_ino
+        and cached.mtime_ns == directory_stat.st_mtime_ns
+        and time.monotonic() - cached.scanned_at <= SCAN_CACHE_MAX_AGE_SECONDS
+        and len(cached.largest_files) >= min(top_n, cached.file_count)
+    ):
+        return cached, True
+
+    file_bytes = 0
+    file_count = 0
+    errors = 0
+    subdirectories = []
+    files: List[Tuple[int, str]] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    # Stay on the scanned filesystem (skip nested mounts)
+                    if entry.stat(follow_symlinks=False).st_dev == device:
+                        subdirectories.append(entry.path)
+                    continue
+                size = _allocated_bytes(entry.stat(follow_symlinks=False))
+            except OSError:
+                errors += 1
+                continue
+            file_bytes += size
+            file_count += 1
+            files.append((size, entry.path))
+
+    scan = _DirectoryScan(
+        device=device,
+        inode=directory_stat.st_ino,
+        mtime_ns=directory_stat.st_mtime_ns,
+        scanned_at=time.monotonic(),
+        file_bytes=file_bytes,
+        file_count=file_count,
+        subdirectories=tuple(subdirectories),
+        largest_files=tuple(heapq.nlargest(top_n, files)),
+        errors=errors,
+    )
+    with _cache_lock:
+        if len(_scan_cache) >= SCAN_CACHE_MAX_DIRS:
+            _scan_cache.clear()
+        _scan_cache[path] = scan
+    return scan, False
+
+
+def scan_tree(root: str, top_n: int, time_budget_seconds: float) -> Dict[str, Any]:
+    """
+    Scan a directory tree on one device with a thread pool and a time budget.
+
+    Args:
+        root (str): Directory to scan (usually a mountpoint)
+        top_n (int): Number of directories and files to keep per ranking
+        time_budget_seconds (float): Stop submitting new directories after this
+
+    Returns:
+        Dict[str, Any]: Per-directory scans, parent links and scan counters
+    """
+    started = time.monotonic()
+    deadline = started + time_budget_seconds
+    device = os.stat(root).st_dev
+
+    scans: Dict[str, _DirectoryScan] = {}
+    parents: Dict[str, Optional[str]] = {root: None}
+    cache_hits = 0
+    errors = 0
+
+    executor = ThreadPoolExecutor(
+        max_workers=SCAN_MAX_WORKERS, thread_name_prefix="disk-scan"
+    )
+    pending = {executor.submit(_scan_directory, root, device, top_n): root}
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    scan, from_cache = future.result()
+                except OSError:
+                    # Permission denied, or the directory vanished during the scan
+                    errors += 1
+                    continue
+                scans[path] = scan
+                cache_hits += from_cache
+                errors += scan.errors
+                for child in scan.subdirectories:
+                    parents[child] = path
+                    pending[executor.submit(_scan_directory, child, device, top_n)] = (
+                        child
+                    )
+    finally:
+        # Directories still queued when the budget ran out are not scanned
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {
+        "scans": scans,
+        "parents": parents,
+        "unscanned": len(pending),
+        "cache_hits": cache_hits,
+        "errors": errors,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def find_largest_paths(mountpoint: str, top_n: int = SCAN_TOP_N) -> Dict[str, Any]:
+    """
+    Find the directories and files using the most space on a filesystem.
+
+    Use this when a partition is nearly full to explain what is filling it.
+    The scan stays on the mountpoint's filesystem and stops after a time budget,
+    in which case the sizes are lower bounds.
+
+    Args:
+        mountpoint (str): Mountpoint (or any directory) to scan, e.g. "/var"
+        top_n (int): Number of directories and files to return
+
+    Returns:
+        Dict[str, Any]: Dictionary with the largest directories and files
+    """
+    try:
+        if not os.path.isdir(mountpoint):
+            return {
+                "result": {"error": f"Not a directory: {mountpoint}"},
+                "stats": {"success": False},
+                "additional_info": {"error_type": "NotADirectoryError"},
+            }
+        top_n = max(1, min(int(top_n), 100))
+        root = os.path.abspath(mountpoint)
+        tree = scan_tree(root, top_n, SCAN_TIME_BUDGET_SECONDS)
+        scans = tree["scans"]
+
+        # Add each directory's total to its parent, deepest directories first
+        totals = {path: scan.file_bytes for path, scan in scans.items()}
+        for path in sorted(scans, key=lambda p: p.count(os.sep), reverse=True):
+            parent = tree["parents"][path]
+            if parent is not None and parent in totals:
+                totals[parent] += totals[path]
+
+        largest_directories = heapq.nlargest(
+            top_n,
+            ((size, path) for path, size in totals.items() if path != root),
+        )
+        largest_files = heapq.nlargest(
+            top_n,
+            (file for scan in scans.values() for file in scan.largest_files),
+        )
+        complete = tree["unscanned"] == 0
+
+        return {
+            "result": {
+                "mountpoint": root,
+                "largest_directories": [
+                    {
+                        "path": path,
+                        "size": _format_size(size),
+                        "bytes": size,
+                        "own_files": _format_size(scans[path].file_bytes),
+                    }
+                    for size, path in largest_directories
+                ],
+                "largest_files": [
+                    {"path": path, "size": _format_size(size), "bytes": size}
+                    for size, path in largest_files
+                ],
+            },
+            "stats": {
+                "total_scanned": _format_size(totals.get(root, 0)),
+                "directories_scanned": len(scans),
+                "files_seen": sum(scan.file_count for scan in scans.values()),
+                "cache_hits": tree["cache_hits"],
+                "scan_seconds": round(tree["elapsed"], 3),
+                "complete": complete,
+            },
+            "additional_info": {
+                "data_format": "dictionary",
+                "collection_timestamp": time.time(),
+                "time_budget_seconds": SCAN_TIME_BUDGET_SECONDS,
+                "unscanned_directories": tree["unscanned"],
+                "unreadable_entries": tree["errors"],
+                "note": (
+                    None if complete else "Time budget reached: sizes are lower bounds"
+                ),
+            },
+        }
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to scan {mountpoint}: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
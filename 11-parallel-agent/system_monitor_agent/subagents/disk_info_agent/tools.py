@@ -1,84 +1,384 @@
 """
 Disk Information Tool
 
-This module provides a tool for gathering disk information.
+This module provides tools for gathering disk information.
+
+`get_disk_info` returns the verbose, pre-formatted payload and
+`get_disk_metrics` the compact one (raw byte counts and percentages). Both are
+built from the same `collect_disk_sample` measurement.
+
+Partition usage is collected concurrently in a bounded thread pool so a hung
+network or FUSE mount (a `statvfs` that never returns) is reported as
+unresponsive instead of stalling the whole report. Mounts that timed out
+before, and all mounts while hung probes hold every pool worker, are probed on
+a thread of their own, so hung mounts cannot starve the others. Disk I/O
+throughput and IOPS are computed from consecutive `disk_io_counters` samples.
 """
 
+import math
+import threading
 import time
-from typing import Any, Dict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Set, Tuple
 
 import psutil
 
+from ..compact import fit_to_budget
 
-def get_disk_info() -> Dict[str, Any]:
+# --- Constants ---
+MAX_MOUNT_WORKERS = 8  # Maximum number of concurrent disk_usage calls
+MOUNT_TIMEOUT_SECONDS = 2.0  # Time budget for each mount's disk_usage call
+IO_SAMPLE_INTERVAL_SECONDS = 0.5  # Minimum window for I/O rate measurements
+IO_SAMPLE_MAX_AGE_SECONDS = 60.0  # Older samples are replaced by a fresh window
+
+# The pool is shared between calls and never waited on: a thread stuck in a hung
+# statvfs cannot be interrupted, so it must not block the tool from returning.
+_mount_executor = ThreadPoolExecutor(
+    max_workers=MAX_MOUNT_WORKERS, thread_name_prefix="disk-usage"
+)
+# Probes that did not finish in time, keyed by mountpoint. A mount with a
+# pending probe is not probed again, so each mount holds at most one thread.
+_pending_probes: Dict[str, Future] = {}
+# Pool probes among them: each one holds a pool worker until it returns
+_stuck_pool_probes: Set[Future] = set()
+# Mounts that timed out before; they are probed on a dedicated thread until a
+# probe succeeds, so a mount that keeps hanging does not take a pool worker
+_slow_mounts: Set[str] = set()
+_pending_lock = threading.Lock()
+
+# Previous (timestamp, counters) sample used to compute I/O rates
+_last_io_sample: Optional[Tuple[float, Any]] = None
+
+
+def _format_rate(bytes_per_second: float) -> str:
+    """Format a byte rate using the largest fitting unit."""
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if bytes_per_second < 1024:
+            return f"{bytes_per_second:.2f} {unit}"
+        bytes_per_second /= 1024
+    return f"{bytes_per_second:.2f} GB/s"
+
+
+def _sample_io_counters() -> Tuple[float, Any]:
+    """Take a timestamped system-wide disk I/O counters sample."""
+    return time.monotonic(), psutil.disk_io_counters(perdisk=False)
+
+
+def _compute_io_rates(
+    previous: Tuple[float, Any], current: Tuple[float, Any]
+) -> Optional[Dict[str, float]]:
+    """Compute throughput and IOPS between two I/O counter samples."""
+    (start, before), (end, after) = previous, current
+    elapsed = end - start
+    if before is None or after is None or elapsed <= 0:
+        return None
+
+    return {
+        "read_bytes_per_sec": max(after.read_bytes - before.read_bytes, 0) / elapsed,
+        "write_bytes_per_sec": max(after.write_bytes - before.write_bytes, 0)
+        / elapsed,
+        "read_iops": max(after.read_count - before.read_count, 0) / elapsed,
+        "write_iops": max(after.write_count - before.write_count, 0) / elapsed,
+        "sample_window_seconds": elapsed,
+    }
+
+
+def _get_io_rates(window_start: Tuple[float, Any]) -> Optional[Dict[str, float]]:
     """
-    Gather disk information including partitions and usage.
+    Finish an I/O measurement window and remember the sample for the next call.
+
+    Args:
+        window_start: The sample taken at the start of the measurement window
 
     Returns:
-        Dict[str, Any]: Dictionary with disk information structured for ADK
+        Optional[Dict[str, float]]: Rates, or None if counters are unavailable
     """
-    try:
-        # Get disk information
-        disk_info = {"partitions": []}
-        partitions_over_threshold = []
-        total_space = 0
-        used_space = 0
+    global _last_io_sample
+
+    elapsed = time.monotonic() - window_start[0]
+    if elapsed < IO_SAMPLE_INTERVAL_SECONDS:
+        time.sleep(IO_SAMPLE_INTERVAL_SECONDS - elapsed)
+
+    current = _sample_io_counters()
+    _last_io_sample = current
+    return _compute_io_rates(window_start, current)
+
+
+def _probe_on_own_thread(mountpoint: str) -> Future:
+    """Run disk_usage for one mount on a new daemon thread."""
+    future: Future = Future()
 
+    def probe():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(psutil.disk_usage(mountpoint))
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=probe, name="disk-usage-slow", daemon=True).start()
+    return future
+
+
+def collect_disk_sample() -> Dict[str, Any]:
+    """
+    Measure partition usage and disk I/O rates.
+
+    Returns:
+        Dict[str, Any]: Raw measurements. Each partition has a status of "ok"
+            (with the psutil usage result), "timeout" or "unresponsive".
+    """
+    # Reuse the previous call's sample as the start of the I/O window if it
+    # is recent, otherwise measure over a fresh window during this call
+    if (
+        _last_io_sample is not None
+        and time.monotonic() - _last_io_sample[0] <= IO_SAMPLE_MAX_AGE_SECONDS
+    ):
+        io_window_start = _last_io_sample
+    else:
+        io_window_start = _sample_io_counters()
+
+    # Start a disk_usage probe for every partition
+    probes = {}
+    pooled = set()
+    with _pending_lock:
+        _stuck_pool_probes.difference_update(
+            [future for future in _stuck_pool_probes if future.done()]
+        )
+        free_workers = MAX_MOUNT_WORKERS - len(_stuck_pool_probes)
         for partition in psutil.disk_partitions():
-            try:
-                partition_usage = psutil.disk_usage(partition.mountpoint)
-
-                # Track high usage partitions
-                if partition_usage.percent > 85:
-                    partitions_over_threshold.append(
-                        f"{partition.mountpoint} ({partition_usage.percent:.1f}%)"
-                    )
-
-                # Add to totals
-                total_space += partition_usage.total
-                used_space += partition_usage.used
-
-                disk_info["partitions"].append(
-                    {
-                        "device": partition.device,
-                        "mountpoint": partition.mountpoint,
-                        "filesystem_type": partition.fstype,
-                        "total_size": f"{partition_usage.total / (1024 ** 3):.2f} GB",
-                        "used": f"{partition_usage.used / (1024 ** 3):.2f} GB",
-                        "free": f"{partition_usage.free / (1024 ** 3):.2f} GB",
-                        "percentage": f"{partition_usage.percent:.1f}%",
-                    }
+            mountpoint = partition.mountpoint
+            pending = _pending_probes.get(mountpoint)
+            if pending is not None and not pending.done():
+                probes[partition] = None
+                continue
+            _pending_probes.pop(mountpoint, None)
+            if mountpoint in _slow_mounts or free_workers <= 0:
+                probes[partition] = _probe_on_own_thread(mountpoint)
+            else:
+                probes[partition] = _mount_executor.submit(
+                    psutil.disk_usage, mountpoint
                 )
-            except (PermissionError, FileNotFoundError):
-                # Some partitions may not be accessible
-                pass
+                pooled.add(probes[partition])
+
+    # Every mount gets MOUNT_TIMEOUT_SECONDS once a worker picks it up
+    started = [future for future in probes.values() if future is not None]
+    rounds = math.ceil(len(pooled) / free_workers) if pooled else 1
+    if started:
+        wait(started, timeout=MOUNT_TIMEOUT_SECONDS * rounds)
 
-        # Calculate overall disk stats
-        overall_usage_percent = (
-            (used_space / total_space * 100) if total_space > 0 else 0
+    partitions = []
+    for partition, future in probes.items():
+        entry = {
+            "device": partition.device,
+            "mountpoint": partition.mountpoint,
+            "fstype": partition.fstype,
+            "usage": None,
+        }
+
+        if future is None or not future.done():
+            # Hung or very slow mount: report it instead of waiting on it
+            entry["status"] = "timeout" if future is not None else "unresponsive"
+            if future is not None and not future.cancel():
+                with _pending_lock:
+                    _pending_probes[partition.mountpoint] = future
+                    _slow_mounts.add(partition.mountpoint)
+                    if future in pooled:
+                        _stuck_pool_probes.add(future)
+            partitions.append(entry)
+            continue
+
+        # The probe returned in time (even if it failed), so the mount can go
+        # back to the pool
+        with _pending_lock:
+            _slow_mounts.discard(partition.mountpoint)
+        try:
+            entry["usage"] = future.result()
+        except OSError:
+            # Some partitions may not be accessible
+            continue
+        entry["status"] = "ok"
+        partitions.append(entry)
+
+    return {
+        "partitions": partitions,
+        # Measure I/O rates over the window that covered the mount probes
+        "io_rates": _get_io_rates(io_window_start),
+        "timestamp": time.time(),
+    }
+
+
+def build_disk_info(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the verbose disk payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_disk_sample
+
+    Returns:
+        Dict[str, Any]: Dictionary with disk information structured for ADK
+    """
+    disk_info = {"partitions": []}
+    partitions_over_threshold = []
+    unresponsive_partitions = []
+    total_space = 0
+    used_space = 0
+
+    for partition in sample["partitions"]:
+        partition_entry = {
+            "device": partition["device"],
+            "mountpoint": partition["mountpoint"],
+            "filesystem_type": partition["fstype"],
+            "status": partition["status"],
+        }
+        partition_usage = partition["usage"]
+
+        if partition_usage is None:
+            unresponsive_partitions.append(
+                f"{partition['mountpoint']} ({partition['status']})"
+            )
+            disk_info["partitions"].append(partition_entry)
+            continue
+
+        # Track high usage partitions
+        if partition_usage.percent > 85:
+            partitions_over_threshold.append(
+                f"{partition['mountpoint']} ({partition_usage.percent:.1f}%)"
+            )
+
+        # Add to totals
+        total_space += partition_usage.total
+        used_space += partition_usage.used
+
+        partition_entry.update(
+            {
+                "total_size": f"{partition_usage.total / (1024 ** 3):.2f} GB",
+                "used": f"{partition_usage.used / (1024 ** 3):.2f} GB",
+                "free": f"{partition_usage.free / (1024 ** 3):.2f} GB",
+                "percentage": f"{partition_usage.percent:.1f}%",
+            }
         )
+        disk_info["partitions"].append(partition_entry)
 
-        # Format for ADK tool return structure
-        return {
-            "result": disk_info,
-            "stats": {
-                "partition_count": len(disk_info["partitions"]),
-                "total_space_gb": total_space / (1024**3),
-                "used_space_gb": used_space / (1024**3),
-                "overall_usage_percent": overall_usage_percent,
-                "partitions_with_high_usage": len(partitions_over_threshold),
-            },
-            "additional_info": {
-                "data_format": "dictionary",
-                "collection_timestamp": time.time(),
-                "high_usage_partitions": (
-                    partitions_over_threshold if partitions_over_threshold else None
-                ),
-            },
+    io_rates = sample["io_rates"]
+    if io_rates:
+        disk_info["io"] = {
+            "read_throughput": _format_rate(io_rates["read_bytes_per_sec"]),
+            "write_throughput": _format_rate(io_rates["write_bytes_per_sec"]),
+            "read_iops": f"{io_rates['read_iops']:.1f}",
+            "write_iops": f"{io_rates['write_iops']:.1f}",
+        }
+
+    # Calculate overall disk stats
+    overall_usage_percent = (used_space / total_space * 100) if total_space > 0 else 0
+
+    # Format for ADK tool return structure
+    return {
+        "result": disk_info,
+        "stats": {
+            "partition_count": len(disk_info["partitions"]),
+            "total_space_gb": total_space / (1024**3),
+            "used_space_gb": used_space / (1024**3),
+            "overall_usage_percent": overall_usage_percent,
+            "partitions_with_high_usage": len(partitions_over_threshold),
+            "unresponsive_partition_count": len(unresponsive_partitions),
+            "io_rates": io_rates,
+        },
+        "additional_info": {
+            "data_format": "dictionary",
+            "collection_timestamp": sample["timestamp"],
+            "high_usage_partitions": (
+                partitions_over_threshold if partitions_over_threshold else None
+            ),
+            "unresponsive_partitions": (
+                unresponsive_partitions if unresponsive_partitions else None
+            ),
+        },
+    }
+
+
+def build_disk_metrics(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the compact disk payload from a sample.
+
+    Partitions are sorted by usage (unresponsive mounts first) so trimming to
+    the byte budget drops the least interesting ones.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_disk_sample
+
+    Returns:
+        Dict[str, Any]: Raw byte counts, percentages and I/O rates
+    """
+    partitions = []
+    alerts = []
+    for partition in sample["partitions"]:
+        usage = partition["usage"]
+        if usage is None:
+            partitions.append(
+                {"mount": partition["mountpoint"], "status": partition["status"]}
+            )
+            alerts.append(f"unresponsive:{partition['mountpoint']}")
+            continue
+        partitions.append(
+            {
+                "mount": partition["mountpoint"],
+                "pct": usage.percent,
+                "used_b": usage.used,
+                "total_b": usage.total,
+            }
+        )
+        if usage.percent > 85:
+            alerts.append(f"high_disk:{partition['mountpoint']}")
+    partitions.sort(key=lambda entry: entry.get("pct", 101), reverse=True)
+
+    io_rates = sample["io_rates"]
+    return fit_to_budget(
+        {
+            "partitions": partitions,
+            "io": (
+                {
+                    "read_bps": round(io_rates["read_bytes_per_sec"]),
+                    "write_bps": round(io_rates["write_bytes_per_sec"]),
+                    "read_iops": round(io_rates["read_iops"], 1),
+                    "write_iops": round(io_rates["write_iops"], 1),
+                }
+                if io_rates
+                else None
+            ),
+            "alerts": alerts,
+            "ts": round(sample["timestamp"]),
         }
+    )
+
+
+def get_disk_info() -> Dict[str, Any]:
+    """
+    Gather disk information including partitions, usage and I/O rates.
+
+    Returns:
+        Dict[str, Any]: Dictionary with disk information structured for ADK
+    """
+    try:
+        return build_disk_info(collect_disk_sample())
     except Exception as e:
         return {
             "result": {"error": f"Failed to gather disk information: {str(e)}"},
             "stats": {"success": False},
             "additional_info": {"error_type": str(type(e).__name__)},
         }
+
+
+def get_disk_metrics() -> Dict[str, Any]:
+    """
+    Gather partition usage and disk I/O rates as compact raw numbers.
+
+    Sizes are in bytes and rates in bytes or operations per second.
+
+    Returns:
+        Dict[str, Any]: Compact dictionary with disk metrics
+    """
+    try:
+        return build_disk_metrics(collect_disk_sample())
+    except Exception as e:
+        return {"error": f"Failed to gather disk information: {str(e)}"}
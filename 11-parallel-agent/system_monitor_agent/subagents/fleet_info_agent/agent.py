@@ -0,0 +1,52 @@
+"""
+Fleet Information Agent
+
+This agent is responsible for gathering and analyzing metrics from every host
+in the fleet through their collector services.
+"""
+
+from google.adk.agents import LlmAgent
+
+from ..deterministic import ToolReportAgent
+from .formatter import format_fleet_info
+from .tools import get_fleet_info
+
+# --- Constants ---
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Fleet Information Agent
+fleet_info_agent = LlmAgent(
+    name="FleetInfoAgent",
+    model=GEMINI_MODEL,
+    instruction="""You are a Fleet Information Agent.
+    
+    When asked for system information, you should:
+    1. Use the 'get_fleet_info' tool to gather metrics from every fleet host
+    2. Analyze the returned dictionary data
+    3. Format this information into a concise, clear section of a system report
+    
+    The tool will return a dictionary with:
+    - result: One entry per host (status, CPU/memory/swap usage, fullest disk, alerts)
+    - stats: Fleet-wide aggregates (mean and max with the worst host)
+    - additional_info: Alerting and unreachable hosts
+    
+    Format your response as a well-structured report section with:
+    - Fleet-wide health (hosts reachable, average and worst usage)
+    - Hosts that are unreachable or have alerts
+    - Any fleet-wide concerns (many hosts above 80% CPU/memory or 85% disk)
+    
+    IMPORTANT: You MUST call the get_fleet_info tool. Do not make up information.
+    """,
+    description="Gathers and analyzes metrics from every host in the fleet",
+    tools=[get_fleet_info],
+    output_key="fleet_info",
+)
+
+# Deterministic Fleet Information Agent (no LLM call, used by the template report modes)
+fleet_info_reporter = ToolReportAgent(
+    name="FleetInfoReporter",
+    description="Gathers fleet metrics and formats them without an LLM",
+    tool=get_fleet_info,
+    formatter=format_fleet_info,
+    output_key="fleet_info",
+)
@@ -0,0 +1,77 @@
+"""
+Fleet Information Formatter
+
+This module renders the output of `get_fleet_info` as a report section without
+calling an LLM.
+"""
+
+from typing import Any, Dict, Optional
+
+
+def _format_aggregate(label: str, aggregate: Optional[Dict[str, Any]]) -> str:
+    """Format a fleet-wide mean/max aggregate."""
+    if not aggregate:
+        return f"- {label}: no data"
+    return (
+        f"- {label}: mean {aggregate['mean']:.1f}%,"
+        f" max {aggregate['max']:.1f}% ({aggregate['max_host']})"
+    )
+
+
+def _format_value(value: Optional[float]) -> str:
+    """Format an optional percentage."""
+    return "-" if value is None else f"{value:.1f}%"
+
+
+def format_fleet_info(data: Dict[str, Any]) -> str:
+    """
+    Format the fleet tool result as a markdown report section.
+
+    Args:
+        data (Dict[str, Any]): Dictionary returned by get_fleet_info
+
+    Returns:
+        str: Markdown section with fleet-wide aggregates and per-host rows
+    """
+    result = data.get("result", {})
+    if "error" in result:
+        return f"## Fleet\n\n**Unavailable:** {result['error']}"
+
+    stats = data.get("stats", {})
+    additional_info = data.get("additional_info", {})
+
+    lines = [
+        "## Fleet",
+        "",
+        f"- Hosts reachable: {stats.get('hosts_up')} of {stats.get('hosts_total')}",
+        f"- Total cores: {stats.get('total_cores')}",
+        _format_aggregate("CPU usage", stats.get("cpu_pct")),
+        _format_aggregate("Memory usage", stats.get("mem_pct")),
+        _format_aggregate("Fullest disk", stats.get("disk_max_pct")),
+        "",
+        "| Host | Status | CPU | Memory | Swap | Fullest disk | Alerts |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for host in result.get("hosts", []):
+        lines.append(
+            f"| {host['host']} | {host['status']}"
+            f" | {_format_value(host.get('cpu_pct'))}"
+            f" | {_format_value(host.get('mem_pct'))}"
+            f" | {_format_value(host.get('swap_pct'))}"
+            f" | {_format_value(host.get('disk_max_pct'))}"
+            f" | {', '.join(host.get('alerts', [])) or '-'} |"
+        )
+    omitted = data.get("omitted", {}).get("result.hosts")
+    if omitted:
+        lines.append(f"\n_{omitted} healthy hosts omitted._")
+
+    lines.append("")
+    unreachable = additional_info.get("unreachable_hosts")
+    alerting = additional_info.get("alerting_hosts")
+    if unreachable:
+        lines.append(f"**Concern:** Unreachable hosts: {', '.join(unreachable)}")
+    if alerting:
+        lines.append(f"**Concern:** Hosts with alerts: {', '.join(alerting)}")
+    if not unreachable and not alerting:
+        lines.append("All fleet hosts are reachable and healthy.")
+    return "\n".join(lines)
@@ -0,0 +1,175 @@
+"""
+Fleet Information Tool
+
+This module provides a tool for gathering metrics from several hosts.
+
+Every host runs the collector service (`collector.py`), which serves a compact
+metrics snapshot over HTTP. The tool queries all collectors concurrently with a
+timeout, then merges the answers into per-host summaries and fleet-wide
+aggregates. Unreachable or slow hosts are reported instead of delaying the
+report.
+"""
+
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from ...config import (
+    FLEET_HOSTS,
+    FLEET_MAX_WORKERS,
+    FLEET_RESULT_MAX_BYTES,
+    FLEET_TIMEOUT_SECONDS,
+)
+from ..compact import fit_to_budget
+
+
+def fetch_snapshot(host: str, timeout: float) -> Dict[str, Any]:
+    """
+    Fetch the metrics snapshot from one collector.
+
+    Args:
+        host (str): Collector address as host:port (or a full http:// URL)
+        timeout (float): Socket timeout in seconds
+
+    Returns:
+        Dict[str, Any]: The collector's compact snapshot
+    """
+    base_url = host if host.startswith(("http://", "https://")) else f"http://{host}"
+    with urllib.request.urlopen(f"{base_url}/snapshot", timeout=timeout) as response:
+        return json.load(response)
+
+
+def _summarize_host(address: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a collector snapshot to the per-host fields the report needs."""
+    cpu = snapshot.get("cpu", {})
+    memory = snapshot.get("memory", {})
+    disk = snapshot.get("disk", {})
+    disk_percentages = [
+        partition["pct"]
+        for partition in disk.get("partitions", [])
+        if "pct" in partition
+    ]
+    return {
+        "host": snapshot.get("host", address),
+        "address": address,
+        "status": "ok",
+        "cpu_pct": cpu.get("usage_pct"),
+        "cores": cpu.get("cores_logical"),
+        "mem_pct": memory.get("mem_pct"),
+        "swap_pct": memory.get("swap_pct"),
+        "disk_max_pct": max(disk_percentages) if disk_percentages else None,
+        "alerts": (
+            cpu.get("alerts", []) + memory.get("alerts", []) + disk.get("alerts", [])
+        ),
+    }
+
+
+def _aggregate(values: List[Dict[str, Any]], key: str) -> Optional[Dict[str, Any]]:
+    """Mean and maximum of one metric across hosts, with the worst host."""
+    measured = [host for host in values if host.get(key) is not None]
+    if not measured:
+        return None
+    worst = max(measured, key=lambda host: host[key])
+    return {
+        "mean": round(sum(host[key] for host in measured) / len(measured), 1),
+        "max": worst[key],
+        "max_host": worst["host"],
+    }
+
+
+def query_fleet(hosts: List[str], timeout: float) -> Dict[str, Any]:
+    """
+    Query collectors concurrently and merge their snapshots.
+
+    Args:
+        hosts (List[str]): Collector addresses as host:port
+        timeout (float): Deadline in seconds for the whole fan-in
+
+    Returns:
+        Dict[str, Any]: Dictionary with fleet information structured for ADK
+    """
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(FLEET_MAX_WORKERS, len(hosts)))
+    )
+    futures = {host: executor.submit(fetch_snapshot, host, timeout) for host in hosts}
+    wait(futures.values(), timeout=timeout)
+    # Do not wait for stragglers: their sockets time out on their own
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    per_host = []
+    for address, future in futures.items():
+        if not future.done():
+            per_host.append({"host": address, "address": address, "status": "timeout"})
+            continue
+        try:
+            per_host.append(_summarize_host(address, future.result()))
+        except Exception as e:
+            per_host.append(
+                {
+                    "host": address,
+                    "address": address,
+                    "status": "unreachable",
+                    "error": f"{type(e).__name__}: {e}",
+                }
+            )
+
+    up = [host for host in per_host if host["status"] == "ok"]
+    down = [host["host"] for host in per_host if host["status"] != "ok"]
+    alerting = [host["host"] for host in up if host["alerts"]]
+
+    # Most important hosts first, so trimming to the budget drops healthy ones
+    per_host.sort(
+        key=lambda host: (
+            host["status"] == "ok",
+            not host.get("alerts"),
+            -(host.get("cpu_pct") or 0),
+        )
+    )
+
+    return fit_to_budget(
+        {
+            "result": {"hosts": per_host},
+            "stats": {
+                "hosts_total": len(hosts),
+                "hosts_up": len(up),
+                "cpu_pct": _aggregate(up, "cpu_pct"),
+                "mem_pct": _aggregate(up, "mem_pct"),
+                "disk_max_pct": _aggregate(up, "disk_max_pct"),
+                "total_cores": sum(host.get("cores") or 0 for host in up),
+            },
+            "additional_info": {
+                "data_format": "dictionary",
+                "collection_timestamp": time.time(),
+                "fan_in_seconds": round(time.monotonic() - started, 3),
+                "alerting_hosts": alerting or None,
+                "unreachable_hosts": down or None,
+            },
+        },
+        FLEET_RESULT_MAX_BYTES,
+    )
+
+
+def get_fleet_info() -> Dict[str, Any]:
+    """
+    Gather CPU, memory and disk metrics from every host in the fleet.
+
+    Returns:
+        Dict[str, Any]: Dictionary with per-host and fleet-wide metrics
+    """
+    try:
+        if not FLEET_HOSTS:
+            return {
+                "result": {"error": "No fleet hosts configured"},
+                "stats": {"success": False},
+                "additional_info": {"hint": "Set SYSTEM_MONITOR_FLEET_HOSTS"},
+            }
+        return query_fleet(FLEET_HOSTS, FLEET_TIMEOUT_SECONDS)
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather fleet information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
@@ -1,3 +1,3 @@
 """Memory info agent for system monitoring."""
 
-from .agent import memory_info_agent
+from .agent import memory_info_agent, memory_info_reporter
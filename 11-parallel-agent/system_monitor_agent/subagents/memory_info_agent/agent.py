@@ -6,26 +6,41 @@ This agent is responsible for gathering and analyzing memory information.
 
 from google.adk.agents import LlmAgent
 
-from .tools import get_memory_info
+from ...config import PAYLOAD_MODE
+from ..deterministic import ToolReportAgent
+from .formatter import format_memory_info
+from .tools import get_memory_info, get_memory_metrics
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# The LLM agent gets the compact payload in "compact" payload mode
+if PAYLOAD_MODE == "compact":
+    memory_tool = get_memory_metrics
+    tool_result_description = """The tool will return a compact dictionary of raw numbers:
+    - mem_total_b, mem_avail_b, mem_used_b, mem_pct: RAM in bytes and usage
+    - swap_total_b, swap_used_b, swap_pct: Swap in bytes and usage
+    - alerts: Raised alerts (high_memory, high_swap)"""
+else:
+    memory_tool = get_memory_info
+    tool_result_description = """The tool will return a dictionary with:
+    - result: Core memory information
+    - stats: Key statistical data about memory usage
+    - additional_info: Context about the data collection"""
+tool_name = memory_tool.__name__
+
 # Memory Information Agent
 memory_info_agent = LlmAgent(
     name="MemoryInfoAgent",
     model=GEMINI_MODEL,
-    instruction="""You are a Memory Information Agent.
+    instruction=f"""You are a Memory Information Agent.
     
     When asked for system information, you should:
-    1. Use the 'get_memory_info' tool to gather memory data
+    1. Use the '{tool_name}' tool to gather memory data
     2. Analyze the returned dictionary data
     3. Format this information into a concise, clear section of a system report
     
-    The tool will return a dictionary with:
-    - result: Core memory information
-    - stats: Key statistical data about memory usage
-    - additional_info: Context about the data collection
+    {tool_result_description}
     
     Format your response as a well-structured report section with:
     - Total and available memory
@@ -33,9 +48,18 @@ memory_info_agent = LlmAgent(
     - Swap memory information
     - Any performance concerns (high usage > 80%)
     
-    IMPORTANT: You MUST call the get_memory_info tool. Do not make up information.
+    IMPORTANT: You MUST call the {tool_name} tool. Do not make up information.
     """,
     description="Gathers and analyzes memory information",
-    tools=[get_memory_info],
+    tools=[memory_tool],
+    output_key="memory_info",
+)
+
+# Deterministic Memory Information Agent (no LLM call, used by the template report modes)
+memory_info_reporter = ToolReportAgent(
+    name="MemoryInfoReporter",
+    description="Gathers memory information and formats it without an LLM",
+    tool=get_memory_info,
+    formatter=format_memory_info,
     output_key="memory_info",
 )
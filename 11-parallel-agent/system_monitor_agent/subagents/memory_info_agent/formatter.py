@@ -0,0 +1,49 @@
+"""
+Memory Information Formatter
+
+This module renders the output of `get_memory_info` as a report section without
+calling an LLM.
+"""
+
+from typing import Any, Dict
+
+
+def format_memory_info(data: Dict[str, Any]) -> str:
+    """
+    Format the memory tool result as a markdown report section.
+
+    Args:
+        data (Dict[str, Any]): Dictionary returned by get_memory_info
+
+    Returns:
+        str: Markdown section describing RAM, swap and concerns
+    """
+    result = data.get("result", {})
+    if "error" in result:
+        return f"## Memory\n\n**Unavailable:** {result['error']}"
+
+    additional_info = data.get("additional_info", {})
+    concerns = [
+        concern
+        for concern in (
+            additional_info.get("performance_concern"),
+            additional_info.get("swap_concern"),
+        )
+        if concern
+    ]
+
+    lines = [
+        "## Memory",
+        "",
+        f"- Total memory: {result.get('total_memory')}",
+        f"- Available memory: {result.get('available_memory')}",
+        f"- Used memory: {result.get('used_memory')} ({result.get('memory_percentage')})",
+        f"- Swap: {result.get('swap_used')} of {result.get('swap_total')}"
+        f" ({result.get('swap_percentage')})",
+        "",
+    ]
+    if concerns:
+        lines.extend(f"**Concern:** {concern}" for concern in concerns)
+    else:
+        lines.append("No memory concerns (RAM and swap usage <= 80%).")
+    return "\n".join(lines)
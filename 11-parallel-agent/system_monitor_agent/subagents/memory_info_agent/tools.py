@@ -1,7 +1,11 @@
 """
 Memory Information Tool
 
-This module provides a tool for gathering memory information.
+This module provides tools for gathering memory information.
+
+`get_memory_info` returns the verbose, pre-formatted payload and
+`get_memory_metrics` the compact one (raw byte counts and percentages). Both
+are built from the same `collect_memory_sample` measurement.
 """
 
 import time
@@ -9,56 +13,131 @@ from typing import Any, Dict
 
 import psutil
 
+from ..compact import fit_to_budget
 
-def get_memory_info() -> Dict[str, Any]:
+
+def collect_memory_sample() -> Dict[str, Any]:
     """
-    Gather memory information including RAM and swap usage.
+    Measure RAM and swap usage.
+
+    Returns:
+        Dict[str, Any]: Raw psutil results for virtual and swap memory
+    """
+    return {
+        "memory": psutil.virtual_memory(),
+        "swap": psutil.swap_memory(),
+        "timestamp": time.time(),
+    }
+
+
+def build_memory_info(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the verbose memory payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_memory_sample
 
     Returns:
         Dict[str, Any]: Dictionary with memory information structured for ADK
     """
-    try:
-        # Get memory information
-        memory = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-
-        memory_info = {
-            "total_memory": f"{memory.total / (1024 ** 3):.2f} GB",
-            "available_memory": f"{memory.available / (1024 ** 3):.2f} GB",
-            "used_memory": f"{memory.used / (1024 ** 3):.2f} GB",
-            "memory_percentage": f"{memory.percent:.1f}%",
-            "swap_total": f"{swap.total / (1024 ** 3):.2f} GB",
-            "swap_used": f"{swap.used / (1024 ** 3):.2f} GB",
-            "swap_percentage": f"{swap.percent:.1f}%",
-        }
+    memory = sample["memory"]
+    swap = sample["swap"]
 
-        # Calculate stats
-        memory_usage = memory.percent
-        swap_usage = swap.percent
-        high_memory_usage = memory_usage > 80
-        high_swap_usage = swap_usage > 80
+    memory_info = {
+        "total_memory": f"{memory.total / (1024 ** 3):.2f} GB",
+        "available_memory": f"{memory.available / (1024 ** 3):.2f} GB",
+        "used_memory": f"{memory.used / (1024 ** 3):.2f} GB",
+        "memory_percentage": f"{memory.percent:.1f}%",
+        "swap_total": f"{swap.total / (1024 ** 3):.2f} GB",
+        "swap_used": f"{swap.used / (1024 ** 3):.2f} GB",
+        "swap_percentage": f"{swap.percent:.1f}%",
+    }
 
-        # Format for ADK tool return structure
-        return {
-            "result": memory_info,
-            "stats": {
-                "memory_usage_percentage": memory_usage,
-                "swap_usage_percentage": swap_usage,
-                "total_memory_gb": memory.total / (1024**3),
-                "available_memory_gb": memory.available / (1024**3),
-            },
-            "additional_info": {
-                "data_format": "dictionary",
-                "collection_timestamp": time.time(),
-                "performance_concern": (
-                    "High memory usage detected" if high_memory_usage else None
-                ),
-                "swap_concern": "High swap usage detected" if high_swap_usage else None,
-            },
+    # Calculate stats
+    memory_usage = memory.percent
+    swap_usage = swap.percent
+    high_memory_usage = memory_usage > 80
+    high_swap_usage = swap_usage > 80
+
+    # Format for ADK tool return structure
+    return {
+        "result": memory_info,
+        "stats": {
+            "memory_usage_percentage": memory_usage,
+            "swap_usage_percentage": swap_usage,
+            "total_memory_gb": memory.total / (1024**3),
+            "available_memory_gb": memory.available / (1024**3),
+        },
+        "additional_info": {
+            "data_format": "dictionary",
+            "collection_timestamp": sample["timestamp"],
+            "performance_concern": (
+                "High memory usage detected" if high_memory_usage else None
+            ),
+            "swap_concern": "High swap usage detected" if high_swap_usage else None,
+        },
+    }
+
+
+def build_memory_metrics(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the compact memory payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_memory_sample
+
+    Returns:
+        Dict[str, Any]: Raw byte counts and percentages
+    """
+    memory = sample["memory"]
+    swap = sample["swap"]
+
+    alerts = []
+    if memory.percent > 80:
+        alerts.append("high_memory")
+    if swap.percent > 80:
+        alerts.append("high_swap")
+
+    return fit_to_budget(
+        {
+            "mem_total_b": memory.total,
+            "mem_avail_b": memory.available,
+            "mem_used_b": memory.used,
+            "mem_pct": memory.percent,
+            "swap_total_b": swap.total,
+            "swap_used_b": swap.used,
+            "swap_pct": swap.percent,
+            "alerts": alerts,
+            "ts": round(sample["timestamp"]),
         }
+    )
+
+
+def get_memory_info() -> Dict[str, Any]:
+    """
+    Gather memory information including RAM and swap usage.
+
+    Returns:
+        Dict[str, Any]: Dictionary with memory information structured for ADK
+    """
+    try:
+        return build_memory_info(collect_memory_sample())
     except Exception as e:
         return {
             "result": {"error": f"Failed to gather memory information: {str(e)}"},
             "stats": {"success": False},
             "additional_info": {"error_type": str(type(e).__name__)},
         }
+
+
+def get_memory_metrics() -> Dict[str, Any]:
+    """
+    Gather RAM and swap usage as compact raw numbers (sizes in bytes).
+
+    Returns:
+        Dict[str, Any]: Compact dictionary with memory metrics
+    """
+    try:
+        return build_memory_metrics(collect_memory_sample())
+    except Exception as e:
+        return {"error": f"Failed to gather memory information: {str(e)}"}
@@ -0,0 +1,3 @@
+"""Pressure info agent for system monitoring."""
+
+from .agent import pressure_info_agent, pressure_info_reporter
@@ -0,0 +1,74 @@
+"""
+Pressure Information Agent
+
+This agent is responsible for gathering and analyzing pressure stall
+information, load average, network throughput and container limits.
+"""
+
+from google.adk.agents import LlmAgent
+
+from ...config import PAYLOAD_MODE
+from ..deterministic import ToolReportAgent
+from .formatter import format_pressure_info
+from .tools import get_pressure_info, get_pressure_metrics
+
+# --- Constants ---
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# The LLM agent gets the compact payload in "compact" payload mode
+if PAYLOAD_MODE == "compact":
+    pressure_tool = get_pressure_metrics
+    tool_result_description = """The tool will return a compact dictionary of raw numbers:
+    - psi_scope: "cgroup" (this container) or "host"
+    - psi: Per resource (cpu, memory, io) [some avg10, some avg60, full avg10] in percent
+    - load: 1, 5 and 15 minute load average; cpus: CPUs available to this process
+    - net: Per interface rx_bps/tx_bps (bytes/s), err_ps and drop_ps (per second)
+    - cgroup: Container memory usage/limit in bytes (mem_pct of the limit),
+      oom_kills, cpu_max_cores (quota), cpu_cores (usage) and throttled_pct
+    - alerts: Raised alerts (cpu/memory/io_pressure, cgroup_memory_near_limit,
+      cpu_throttling, load_above_cpus)"""
+else:
+    pressure_tool = get_pressure_info
+    tool_result_description = """The tool will return a dictionary with:
+    - result: Pressure stall, load average, network and cgroup (container) information
+    - stats: Key statistical data about stalls, load and container limits
+    - additional_info: Context about the data collection and raised concerns"""
+tool_name = pressure_tool.__name__
+
+# Pressure Information Agent
+pressure_info_agent = LlmAgent(
+    name="PressureInfoAgent",
+    model=GEMINI_MODEL,
+    instruction=f"""You are a Pressure Information Agent.
+    
+    When asked for system information, you should:
+    1. Use the '{tool_name}' tool to gather pressure, load, network and container data
+    2. Analyze the returned dictionary data
+    3. Format this information into a concise, clear section of a system report
+    
+    {tool_result_description}
+    
+    Format your response as a well-structured report section with:
+    - Pressure stall information: how much time tasks waited for CPU, memory and I/O
+    - Load average compared to the available CPUs
+    - Network throughput, errors and drops per interface
+    - Container memory and CPU limits, OOM kills and CPU throttling
+    - Any concerns (stalls above 10%, memory near the container limit, throttling)
+    
+    Inside a container, the container limits matter more than host-wide usage.
+    
+    IMPORTANT: You MUST call the {tool_name} tool. Do not make up information.
+    """,
+    description="Gathers and analyzes pressure stalls, load, network and container limits",
+    tools=[pressure_tool],
+    output_key="pressure_info",
+)
+
+# Deterministic Pressure Information Agent (no LLM call, used by the template report modes)
+pressure_info_reporter = ToolReportAgent(
+    name="PressureInfoReporter",
+    description="Gathers pressure information and formats it without an LLM",
+    tool=get_pressure_info,
+    formatter=format_pressure_info,
+    output_key="pressure_info",
+)
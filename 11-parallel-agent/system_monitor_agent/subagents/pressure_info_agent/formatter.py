@@ -0,0 +1,89 @@
+"""
+Pressure Information Formatter
+
+This module renders the output of `get_pressure_info` as a report section
+without calling an LLM.
+"""
+
+from typing import Any, Dict
+
+CONCERN_DESCRIPTIONS = {
+    "cpu_pressure": "Tasks are stalling waiting for CPU",
+    "memory_pressure": "Tasks are stalling on memory reclaim",
+    "io_pressure": "Tasks are stalling on I/O",
+    "cgroup_memory_near_limit": "Container memory is close to its limit",
+    "cpu_throttling": "Container CPU is being throttled by its quota",
+    "load_above_cpus": "Load average exceeds the available CPUs",
+}
+
+
+def format_pressure_info(data: Dict[str, Any]) -> str:
+    """
+    Format the pressure tool result as a markdown report section.
+
+    Args:
+        data (Dict[str, Any]): Dictionary returned by get_pressure_info
+
+    Returns:
+        str: Markdown section describing stalls, load, network and cgroup limits
+    """
+    result = data.get("result", {})
+    if "error" in result:
+        return f"## Pressure, Load and Network\n\n**Unavailable:** {result['error']}"
+
+    additional_info = data.get("additional_info", {})
+    lines = ["## Pressure, Load and Network", ""]
+
+    pressure_stall = result.get("pressure_stall")
+    if pressure_stall:
+        scope = additional_info.get("pressure_scope", "host")
+        lines.append(f"**Pressure stall ({scope}, share of time tasks waited):**")
+        for resource, kinds in pressure_stall.items():
+            lines.append(f"- {resource} some: {kinds.get('some')}")
+    else:
+        lines.append("- Pressure stall information is not available on this kernel")
+
+    if result.get("load_average"):
+        lines.append(
+            f"- Load average: {result['load_average']},"
+            f" {result.get('load_per_cpu')} per CPU"
+        )
+
+    network = result.get("network")
+    if network:
+        lines.append("")
+        lines.append("**Network:**")
+        for name, rates in network.items():
+            lines.append(
+                f"- {name}: receive {rates['receive']}, transmit {rates['transmit']}"
+                f" ({rates['errors_per_sec']} errors/s, {rates['drops_per_sec']} drops/s)"
+            )
+
+    cgroup = result.get("cgroup", {})
+    if cgroup.get("version"):
+        lines.extend(["", f"**Container limits (cgroup {cgroup['version']}):**"])
+        if "memory_usage" in cgroup:
+            working_set = cgroup.get("memory_working_set_percentage")
+            lines.append(
+                f"- Memory: {cgroup['memory_usage']} of {cgroup['memory_limit']}"
+                + (f" (working set {working_set})" if working_set else "")
+                + f", {cgroup.get('oom_kills', 0)} OOM kills"
+            )
+        cpu_line = f"- CPU limit: {cgroup.get('cpu_limit')}"
+        if "cpu_usage" in cgroup:
+            cpu_line += (
+                f", using {cgroup['cpu_usage']},"
+                f" throttled in {cgroup['cpu_throttled_periods']} of periods"
+            )
+        lines.append(cpu_line)
+
+    lines.append("")
+    concerns = additional_info.get("concerns")
+    if concerns:
+        lines.extend(
+            f"**Concern:** {CONCERN_DESCRIPTIONS.get(concern, concern)}"
+            for concern in concerns
+        )
+    else:
+        lines.append("No pressure, load or container limit concerns.")
+    return "\n".join(lines)
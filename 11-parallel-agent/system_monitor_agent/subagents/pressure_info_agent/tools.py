@@ -0,0 +1,655 @@
+"""
+Pressure Information Tool
+
+This module provides tools for gathering pressure stall information (PSI),
+load average, network throughput and container (cgroup) limits.
+
+`get_pressure_info` returns the verbose, pre-formatted payload and
+`get_pressure_metrics` the compact one (raw numbers). Both are built from the
+same `collect_pressure_sample` measurement.
+
+Everything is read straight from /proc and /sys: each file is read with a
+single `os.read` into bytes and parsed without decoding. Inside a container
+psutil reports host-wide CPU and memory, so the cgroup section reports usage
+against the container's own limits (`memory.max`, `cpu.max`) and how often the
+container was throttled. cgroup v2 is preferred, with a v1 fallback.
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...config import (
+    MEMORY_ALERT_PERCENT,
+    PRESSURE_ALERT_PERCENT,
+    THROTTLING_ALERT_PERCENT,
+)
+from ..compact import fit_to_budget
+
+# --- Constants ---
+PROC_ROOT = "/proc"
+CGROUP_ROOT = "/sys/fs/cgroup"
+READ_CHUNK_BYTES = 64 * 1024  # Covers every file read here in one os.read
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+RATE_SAMPLE_INTERVAL_SECONDS = 0.5  # Minimum window for rate measurements
+RATE_SAMPLE_MAX_AGE_SECONDS = 60.0  # Older samples are replaced by a fresh window
+CGROUP_V1_UNLIMITED = 1 << 62  # v1 reports "no limit" as a huge page-aligned value
+
+# Resolved cgroup directories (looked up once, they do not change for a process)
+_cgroup_paths: Optional[Dict[str, str]] = None
+# Previous (timestamp, network counters, cgroup cpu.stat) sample used for rates
+_last_counter_sample: Optional[Tuple[float, Dict[str, Tuple[int, ...]], Any]] = None
+
+
+def _read(path: str) -> Optional[bytes]:
+    """Read a small /proc or /sys file, or return None if it does not exist."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        data = os.read(fd, READ_CHUNK_BYTES)
+        if len(data) == READ_CHUNK_BYTES:
+            # Rare (hundreds of interfaces in /proc/net/dev): read the rest
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+        return data
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _read_int(path: str) -> Optional[int]:
+    """Read a file holding a single integer ("max" and missing files give None)."""
+    data = _read(path)
+    if data is None:
+        return None
+    data = data.strip()
+    return int(data) if data and data != b"max" else None
+
+
+def _read_keyed(path: str) -> Dict[bytes, int]:
+    """Read a flat "key value" file such as cpu.stat or memory.events."""
+    data = _read(path)
+    values = {}
+    if data:
+        for line in data.splitlines():
+            key, _, value = line.partition(b" ")
+            if value:
+                values[key] = int(value)
+    return values
+
+
+def parse_pressure(data: bytes) -> Dict[str, Dict[str, float]]:
+    """
+    Parse a PSI file ("some avg10=0.12 avg60=... avg300=... total=...").
+
+    Returns:
+        Dict[str, Dict[str, float]]: "some" and "full" lines with avg10, avg60
+            and avg300 in percent and total stall time in microseconds
+    """
+    pressure = {}
+    for line in data.splitlines():
+        kind, *fields = line.split()
+        values = {}
+        for field in fields:
+            key, _, value = field.partition(b"=")
+            values[key.decode()] = int(value) if key == b"total" else float(value)
+        pressure[kind.decode()] = values
+    return pressure
+
+
+def parse_loadavg(data: bytes) -> Dict[str, float]:
+    """Parse /proc/loadavg ("0.12 0.11 0.08 2/72 5444")."""
+    load1, load5, load15, tasks = data.split()[:4]
+    running, _, total = tasks.partition(b"/")
+    return {
+        "load1": float(load1),
+        "load5": float(load5),
+        "load15": float(load15),
+        "running_tasks": int(running),
+        "total_tasks": int(total),
+    }
+
+
+def parse_net_dev(data: bytes) -> Dict[str, Tuple[int, ...]]:
+    """
+    Parse /proc/net/dev into per-interface counters (loopback excluded).
+
+    Returns:
+        Dict[str, Tuple[int, ...]]: (rx_bytes, tx_bytes, rx_packets,
+            tx_packets, errors, drops) per interface
+    """
+    counters = {}
+    # The first two lines are column headers
+    for line in data.splitlines()[2:]:
+        name, _, fields = line.partition(b":")
+        name = name.strip()
+        if name == b"lo":
+            continue
+        values = fields.split()
+        counters[name.decode()] = (
+            int(values[0]),
+            int(values[8]),
+            int(values[1]),
+            int(values[9]),
+            int(values[2]) + int(values[10]),
+            int(values[3]) + int(values[11]),
+        )
+    return counters
+
+
+def _resolve_cgroup_paths() -> Dict[str, str]:
+    """
+    Find this process's memory and cpu cgroup directories.
+
+    Returns:
+        Dict[str, str]: "version" ("v2", "v1" or "hybrid") and the "memory",
+            "cpu" (and for v1 "cpuacct") directories that were found
+    """
+    global _cgroup_paths
+    if _cgroup_paths is not None:
+        return _cgroup_paths
+
+    # /proc/self/cgroup: "0::/path" for v2, "4:memory:/path" for v1 controllers
+    memberships = {}
+    for line in (_read(f"{PROC_ROOT}/self/cgroup") or b"").splitlines():
+        _, controllers, path = line.decode().split(":", 2)
+        for controller in controllers.split(",") if controllers else [""]:
+            memberships[controller] = path
+
+    def locate(root: str, path: str, probe: str) -> Optional[str]:
+        # With a cgroup namespace the listed path may not exist under the
+        # mount, in which case the mount root is the process's own cgroup
+        for directory in (f"{root}{path}".rstrip("/"), root):
+            if os.path.exists(f"{directory}/{probe}"):
+                return directory
+        return None
+
+    paths = {}
+    unified_root = next(
+        (
+            root
+            for root in (CGROUP_ROOT, f"{CGROUP_ROOT}/unified")
+            if os.path.exists(f"{root}/cgroup.controllers")
+        ),
+        None,
+    )
+    if unified_root is not None and "" in memberships:
+        for controller, probe in (("memory", "memory.max"), ("cpu", "cpu.max")):
+            directory = locate(unified_root, memberships[""], probe)
+            if directory:
+                paths[controller] = directory
+        pressure_directory = locate(unified_root, memberships[""], "cpu.pressure")
+        if pressure_directory and pressure_directory != unified_root:
+            # The root cgroup's pressure is the same as /proc/pressure
+            paths["pressure"] = pressure_directory
+
+    # cgroup v1 (or hybrid) controllers not found in the unified hierarchy
+    if "memory" not in paths and "memory" in memberships:
+        directory = locate(
+            f"{CGROUP_ROOT}/memory", memberships["memory"], "memory.limit_in_bytes"
+        )
+        if directory:
+            paths["memory_v1"] = directory
+    if "cpu" not in paths and "cpu" in memberships:
+        for mount in ("cpu", "cpu,cpuacct"):
+            directory = locate(
+                f"{CGROUP_ROOT}/{mount}", memberships["cpu"], "cpu.cfs_quota_us"
+            )
+            if directory:
+                paths["cpu_v1"] = directory
+                break
+        if "cpuacct" in memberships:
+            for mount in ("cpuacct", "cpu,cpuacct"):
+                directory = locate(
+                    f"{CGROUP_ROOT}/{mount}", memberships["cpuacct"], "cpuacct.usage"
+                )
+                if directory:
+                    paths["cpuacct_v1"] = directory
+                    break
+
+    v2 = any(key in paths for key in ("memory", "cpu", "pressure"))
+    v1 = any(key.endswith("_v1") for key in paths)
+    paths["version"] = "hybrid" if v1 and v2 else "v1" if v1 else "v2" if v2 else None
+    _cgroup_paths = paths
+    return paths
+
+
+def _read_cgroup_cpu_stat(paths: Dict[str, str]) -> Optional[Dict[str, int]]:
+    """Read cumulative cgroup CPU usage and throttling counters in microseconds."""
+    if "cpu" in paths:
+        stat = _read_keyed(f"{paths['cpu']}/cpu.stat")
+        return {
+            "usage_usec": stat.get(b"usage_usec", 0),
+            "nr_periods": stat.get(b"nr_periods", 0),
+            "nr_throttled": stat.get(b"nr_throttled", 0),
+            "throttled_usec": stat.get(b"throttled_usec", 0),
+        }
+    if "cpu_v1" in paths:
+        stat = _read_keyed(f"{paths['cpu_v1']}/cpu.stat")
+        usage_ns = (
+            _read_int(f"{paths['cpuacct_v1']}/cpuacct.usage")
+            if "cpuacct_v1" in paths
+            else None
+        )
+        return {
+            "usage_usec": (usage_ns or 0) // 1000,
+            "nr_periods": stat.get(b"nr_periods", 0),
+            "nr_throttled": stat.get(b"nr_throttled", 0),
+            "throttled_usec": stat.get(b"throttled_time", 0) // 1000,
+        }
+    return None
+
+
+def _read_cgroup_limits(paths: Dict[str, str]) -> Dict[str, Any]:
+    """Read the cgroup memory usage/limit and the CPU quota."""
+    limits: Dict[str, Any] = {"version": paths.get("version")}
+
+    if "memory" in paths:
+        directory = paths["memory"]
+        stat = _read_keyed(f"{directory}/memory.stat")
+        events = _read_keyed(f"{directory}/memory.events")
+        limits.update(
+            {
+                "memory_limit_bytes": _read_int(f"{directory}/memory.max"),
+                "memory_current_bytes": _read_int(f"{directory}/memory.current"),
+                "memory_inactive_file_bytes": stat.get(b"inactive_file", 0),
+                "oom_kills": events.get(b"oom_kill", 0),
+            }
+        )
+    elif "memory_v1" in paths:
+        directory = paths["memory_v1"]
+        stat = _read_keyed(f"{directory}/memory.stat")
+        oom_control = _read_keyed(f"{directory}/memory.oom_control")
+        limit = _read_int(f"{directory}/memory.limit_in_bytes")
+        limits.update(
+            {
+                "memory_limit_bytes": (
+                    limit if limit is not None and limit < CGROUP_V1_UNLIMITED else None
+                ),
+                "memory_current_bytes": _read_int(
+                    f"{directory}/memory.usage_in_bytes"
+                ),
+                "memory_inactive_file_bytes": stat.get(b"total_inactive_file", 0),
+                "oom_kills": oom_control.get(b"oom_kill", 0),
+            }
+        )
+
+    if "cpu" in paths:
+        cpu_max = _read(f"{paths['cpu']}/cpu.max") or b"max"
+        quota, _, period = cpu_max.strip().partition(b" ")
+        if quota != b"max" and period:
+            limits["cpu_limit_cores"] = int(quota) / int(period)
+    elif "cpu_v1" in paths:
+        quota = _read_int(f"{paths['cpu_v1']}/cpu.cfs_quota_us")
+        period = _read_int(f"{paths['cpu_v1']}/cpu.cfs_period_us")
+        if quota is not None and quota > 0 and period:
+            limits["cpu_limit_cores"] = quota / period
+
+    if "pressure" in paths:
+        limits["pressure"] = {
+            resource: parse_pressure(data)
+            for resource in PRESSURE_RESOURCES
+            if (data := _read(f"{paths['pressure']}/{resource}.pressure"))
+        }
+    return limits
+
+
+def _take_counter_sample() -> Tuple[float, Dict[str, Tuple[int, ...]], Any]:
+    """Take a timestamped sample of the counters that are reported as rates."""
+    return (
+        time.monotonic(),
+        parse_net_dev(_read(f"{PROC_ROOT}/net/dev") or b""),
+        _read_cgroup_cpu_stat(_resolve_cgroup_paths()),
+    )
+
+
+def _compute_rates(
+    previous: Tuple[float, Dict[str, Tuple[int, ...]], Any],
+    current: Tuple[float, Dict[str, Tuple[int, ...]], Any],
+) -> Dict[str, Any]:
+    """Compute network and cgroup CPU rates between two counter samples."""
+    (start, net_before, cpu_before), (end, net_after, cpu_after) = previous, current
+    elapsed = max(end - start, 1e-6)
+
+    interfaces = {}
+    for name, after in net_after.items():
+        before = net_before.get(name)
+        if before is None:
+            continue
+        rx_bytes, tx_bytes, rx_packets, tx_packets, errors, drops = (
+            max(a - b, 0) / elapsed for a, b in zip(after, before)
+        )
+        interfaces[name] = {
+            "rx_bytes_per_sec": rx_bytes,
+            "tx_bytes_per_sec": tx_bytes,
+            "rx_packets_per_sec": rx_packets,
+            "tx_packets_per_sec": tx_packets,
+            "errors_per_sec": errors,
+            "drops_per_sec": drops,
+        }
+
+    cpu = None
+    if cpu_before is not None and cpu_after is not None:
+        periods = cpu_after["nr_periods"] - cpu_before["nr_periods"]
+        cpu = {
+            "usage_cores": max(cpu_after["usage_usec"] - cpu_before["usage_usec"], 0)
+            / 1e6
+            / elapsed,
+            "throttled_percent": (
+                (cpu_after["nr_throttled"] - cpu_before["nr_throttled"]) / periods * 100
+                if periods > 0
+                else 0.0
+            ),
+            "throttled_seconds": max(
+                cpu_after["throttled_usec"] - cpu_before["throttled_usec"], 0
+            )
+            / 1e6,
+        }
+
+    return {"interfaces": interfaces, "cgroup_cpu": cpu, "window_seconds": elapsed}
+
+
+def collect_pressure_sample() -> Dict[str, Any]:
+    """
+    Measure PSI, load average, network rates and cgroup usage and limits.
+
+    Returns:
+        Dict[str, Any]: Raw measurements. Missing sources (no PSI support, no
+            cgroup controller) are None.
+    """
+    global _last_counter_sample
+
+    # Reuse the previous call's counters as the start of the rate window if
+    # they are recent, otherwise measure over a fresh window during this call
+    if (
+        _last_counter_sample is not None
+        and time.monotonic() - _last_counter_sample[0] <= RATE_SAMPLE_MAX_AGE_SECONDS
+    ):
+        window_start = _last_counter_sample
+    else:
+        window_start = _take_counter_sample()
+
+    loadavg_data = _read(f"{PROC_ROOT}/loadavg")
+    cgroup = _read_cgroup_limits(_resolve_cgroup_paths())
+    # Inside a container its own cgroup's stalls matter, not the host's
+    pressure = cgroup.pop("pressure", None)
+    pressure_scope = "cgroup"
+    if not pressure:
+        pressure = {
+            resource: parse_pressure(data)
+            for resource in PRESSURE_RESOURCES
+            if (data := _read(f"{PROC_ROOT}/pressure/{resource}"))
+        }
+        pressure_scope = "host"
+
+    elapsed = time.monotonic() - window_start[0]
+    if elapsed < RATE_SAMPLE_INTERVAL_SECONDS:
+        time.sleep(RATE_SAMPLE_INTERVAL_SECONDS - elapsed)
+    current = _take_counter_sample()
+    _last_counter_sample = current
+
+    return {
+        "pressure": pressure or None,
+        "pressure_scope": pressure_scope,
+        "loadavg": parse_loadavg(loadavg_data) if loadavg_data else None,
+        "cpu_count": (
+            len(os.sched_getaffinity(0))
+            if hasattr(os, "sched_getaffinity")
+            else os.cpu_count()
+        ),
+        "cgroup": cgroup,
+        "rates": _compute_rates(window_start, current),
+        "timestamp": time.time(),
+    }
+
+
+def _cgroup_memory_percent(cgroup: Dict[str, Any]) -> Optional[float]:
+    """Working set (usage minus reclaimable page cache) as a share of the limit."""
+    limit = cgroup.get("memory_limit_bytes")
+    current = cgroup.get("memory_current_bytes")
+    if not limit or current is None:
+        return None
+    working_set = max(current - cgroup.get("memory_inactive_file_bytes", 0), 0)
+    return working_set / limit * 100
+
+
+def _effective_cpus(sample: Dict[str, Any]) -> float:
+    """CPUs this process can use: the cgroup quota if set, else its CPU affinity."""
+    return sample["cgroup"].get("cpu_limit_cores") or sample["cpu_count"] or 1
+
+
+def _some_avg10(sample: Dict[str, Any], resource: str) -> Optional[float]:
+    """Share of the last 10 seconds in which some tasks stalled on a resource."""
+    return (sample["pressure"] or {}).get(resource, {}).get("some", {}).get("avg10")
+
+
+def _collect_alerts(sample: Dict[str, Any]) -> List[str]:
+    """Collect alert names for stalls, memory limits and throttling."""
+    alerts = []
+    for resource in sample["pressure"] or {}:
+        if (_some_avg10(sample, resource) or 0) > PRESSURE_ALERT_PERCENT:
+            alerts.append(f"{resource}_pressure")
+    memory_percent = _cgroup_memory_percent(sample["cgroup"])
+    if memory_percent is not None and memory_percent > MEMORY_ALERT_PERCENT:
+        alerts.append("cgroup_memory_near_limit")
+    cgroup_cpu = sample["rates"]["cgroup_cpu"]
+    if cgroup_cpu and cgroup_cpu["throttled_percent"] > THROTTLING_ALERT_PERCENT:
+        alerts.append("cpu_throttling")
+    if sample["loadavg"] and sample["loadavg"]["load1"] > _effective_cpus(sample):
+        alerts.append("load_above_cpus")
+    return alerts
+
+
+def _format_bytes(value: Optional[float]) -> Optional[str]:
+    """Format a byte count using the largest fitting unit."""
+    if value is None:
+        return None
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.2f} {unit}"
+        value /= 1024
+    return f"{value:.2f} TB"
+
+
+def build_pressure_info(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the verbose pressure payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_pressure_sample
+
+    Returns:
+        Dict[str, Any]: Dictionary with pressure information structured for ADK
+    """
+    pressure_info: Dict[str, Any] = {}
+
+    if sample["pressure"]:
+        pressure_info["pressure_stall"] = {
+            resource: {
+                kind: (
+                    f"{values['avg10']:.2f}% (10s), {values['avg60']:.2f}% (60s),"
+                    f" {values['avg300']:.2f}% (300s)"
+                )
+                for kind, values in pressure.items()
+            }
+            for resource, pressure in sample["pressure"].items()
+        }
+
+    loadavg = sample["loadavg"]
+    effective_cpus = _effective_cpus(sample)
+    if loadavg:
+        pressure_info["load_average"] = (
+            f"{loadavg['load1']:.2f}, {loadavg['load5']:.2f}, {loadavg['load15']:.2f}"
+            f" ({loadavg['running_tasks']} of {loadavg['total_tasks']} tasks running)"
+        )
+        pressure_info["load_per_cpu"] = f"{loadavg['load1'] / effective_cpus:.2f}"
+
+    pressure_info["network"] = {
+        name: {
+            "receive": f"{_format_bytes(rates['rx_bytes_per_sec'])}/s",
+            "transmit": f"{_format_bytes(rates['tx_bytes_per_sec'])}/s",
+            "errors_per_sec": f"{rates['errors_per_sec']:.1f}",
+            "drops_per_sec": f"{rates['drops_per_sec']:.1f}",
+        }
+        for name, rates in sample["rates"]["interfaces"].items()
+    }
+
+    cgroup = sample["cgroup"]
+    cgroup_cpu = sample["rates"]["cgroup_cpu"]
+    memory_percent = _cgroup_memory_percent(cgroup)
+    cgroup_info: Dict[str, Any] = {"version": cgroup.get("version")}
+    if "memory_current_bytes" in cgroup:
+        cgroup_info["memory_usage"] = _format_bytes(cgroup["memory_current_bytes"])
+        cgroup_info["memory_limit"] = (
+            _format_bytes(cgroup["memory_limit_bytes"]) or "unlimited"
+        )
+        if memory_percent is not None:
+            cgroup_info["memory_working_set_percentage"] = f"{memory_percent:.1f}%"
+        cgroup_info["oom_kills"] = cgroup.get("oom_kills", 0)
+    cgroup_info["cpu_limit"] = (
+        f"{cgroup['cpu_limit_cores']:.2f} cores"
+        if cgroup.get("cpu_limit_cores")
+        else "unlimited"
+    )
+    if cgroup_cpu:
+        cgroup_info["cpu_usage"] = f"{cgroup_cpu['usage_cores']:.2f} cores"
+        cgroup_info["cpu_throttled_periods"] = f"{cgroup_cpu['throttled_percent']:.1f}%"
+    pressure_info["cgroup"] = cgroup_info
+
+    alerts = _collect_alerts(sample)
+
+    # Format for ADK tool return structure
+    return {
+        "result": pressure_info,
+        "stats": {
+            "cpu_some_avg10": _some_avg10(sample, "cpu"),
+            "memory_some_avg10": _some_avg10(sample, "memory"),
+            "io_some_avg10": _some_avg10(sample, "io"),
+            "load1": loadavg["load1"] if loadavg else None,
+            "effective_cpus": effective_cpus,
+            "cgroup_memory_percent": memory_percent,
+            "cgroup_cpu_throttled_percent": (
+                cgroup_cpu["throttled_percent"] if cgroup_cpu else None
+            ),
+        },
+        "additional_info": {
+            "data_format": "dictionary",
+            "collection_timestamp": sample["timestamp"],
+            "rate_window_seconds": sample["rates"]["window_seconds"],
+            "pressure_supported": sample["pressure"] is not None,
+            "pressure_scope": sample["pressure_scope"],
+            "concerns": alerts or None,
+        },
+    }
+
+
+def build_pressure_metrics(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the compact pressure payload from a sample.
+
+    Interfaces are sorted by total throughput so trimming to the byte budget
+    drops the quietest ones.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_pressure_sample
+
+    Returns:
+        Dict[str, Any]: Raw PSI percentages, load, rates and cgroup numbers
+    """
+    cgroup = sample["cgroup"]
+    cgroup_cpu = sample["rates"]["cgroup_cpu"] or {}
+    memory_percent = _cgroup_memory_percent(cgroup)
+    loadavg = sample["loadavg"]
+
+    interfaces = sorted(
+        (
+            {
+                "if": name,
+                "rx_bps": round(rates["rx_bytes_per_sec"]),
+                "tx_bps": round(rates["tx_bytes_per_sec"]),
+                "err_ps": round(rates["errors_per_sec"], 1),
+                "drop_ps": round(rates["drops_per_sec"], 1),
+            }
+            for name, rates in sample["rates"]["interfaces"].items()
+        ),
+        key=lambda entry: entry["rx_bps"] + entry["tx_bps"],
+        reverse=True,
+    )
+
+    return fit_to_budget(
+        {
+            "psi_scope": sample["pressure_scope"],
+            # [some avg10, some avg60, full avg10] per resource
+            "psi": {
+                resource: [
+                    pressure.get("some", {}).get("avg10"),
+                    pressure.get("some", {}).get("avg60"),
+                    pressure.get("full", {}).get("avg10"),
+                ]
+                for resource, pressure in (sample["pressure"] or {}).items()
+            }
+            or None,
+            "load": (
+                [loadavg["load1"], loadavg["load5"], loadavg["load15"]]
+                if loadavg
+                else None
+            ),
+            "cpus": _effective_cpus(sample),
+            "net": interfaces,
+            "cgroup": {
+                "mem_cur_b": cgroup.get("memory_current_bytes"),
+                "mem_max_b": cgroup.get("memory_limit_bytes"),
+                "mem_pct": (
+                    round(memory_percent, 1) if memory_percent is not None else None
+                ),
+                "oom_kills": cgroup.get("oom_kills"),
+                "cpu_max_cores": cgroup.get("cpu_limit_cores"),
+                "cpu_cores": round(cgroup_cpu.get("usage_cores", 0), 2) or None,
+                "throttled_pct": (
+                    round(cgroup_cpu["throttled_percent"], 1) if cgroup_cpu else None
+                ),
+            },
+            "alerts": _collect_alerts(sample),
+            "ts": round(sample["timestamp"]),
+        }
+    )
+
+
+def get_pressure_info() -> Dict[str, Any]:
+    """
+    Gather pressure stall information, load average, network throughput and
+    container (cgroup) memory and CPU limits.
+
+    Returns:
+        Dict[str, Any]: Dictionary with pressure information structured for ADK
+    """
+    try:
+        return build_pressure_info(collect_pressure_sample())
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather pressure information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
+
+
+def get_pressure_metrics() -> Dict[str, Any]:
+    """
+    Gather PSI, load average, network rates and cgroup limits as compact raw
+    numbers (PSI in percent, sizes in bytes, rates per second).
+
+    Returns:
+        Dict[str, Any]: Compact dictionary with pressure metrics
+    """
+    try:
+        return build_pressure_metrics(collect_pressure_sample())
+    except Exception as e:
+        return {"error": f"Failed to gather pressure information: {str(e)}"}
@@ -0,0 +1,66 @@
+"""
+Process Information Agent
+
+This agent is responsible for identifying the processes that consume the most
+CPU, memory and disk I/O.
+"""
+
+from google.adk.agents import LlmAgent
+
+from ...config import PAYLOAD_MODE
+from ..deterministic import ToolReportAgent
+from .formatter import format_process_info
+from .tools import get_process_metrics, get_top_processes
+
+# --- Constants ---
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# The LLM agent gets the compact payload in "compact" payload mode
+if PAYLOAD_MODE == "compact":
+    process_tool = get_process_metrics
+    tool_result_description = """The tool will return a compact dictionary of raw numbers:
+    - cpu_pct, rss_b, io_bps: Rankings as [pid, name, value] rows (CPU percent of
+      one core, resident memory in bytes, disk I/O in bytes per second)
+    - procs: Number of processes on the host"""
+else:
+    process_tool = get_top_processes
+    tool_result_description = """The tool will return a dictionary with:
+    - result: Top CPU, memory (RSS) and disk I/O consuming processes
+    - stats: Process counts and sampling statistics
+    - additional_info: Context about the data collection"""
+tool_name = process_tool.__name__
+
+# Process Information Agent
+process_info_agent = LlmAgent(
+    name="ProcessInfoAgent",
+    model=GEMINI_MODEL,
+    instruction=f"""You are a Process Information Agent.
+    
+    When asked for system information, you should:
+    1. Use the '{tool_name}' tool to find the top resource consumers
+    2. Analyze the returned dictionary data
+    3. Format this information into a concise, clear section of a system report
+    
+    {tool_result_description}
+    
+    Format your response as a well-structured report section with:
+    - The top CPU consumers (CPU percent is relative to one core)
+    - The top memory consumers
+    - The top disk I/O consumers
+    - Any process that stands out as the likely cause of high resource usage
+    
+    IMPORTANT: You MUST call the {tool_name} tool. Do not make up information.
+    """,
+    description="Identifies the top CPU, memory and I/O consuming processes",
+    tools=[process_tool],
+    output_key="process_info",
+)
+
+# Deterministic Process Information Agent (no LLM call, used by the template report modes)
+process_info_reporter = ToolReportAgent(
+    name="ProcessInfoReporter",
+    description="Finds the top resource consuming processes without an LLM",
+    tool=get_top_processes,
+    formatter=format_process_info,
+    output_key="process_info",
+)
@@ -0,0 +1,52 @@
+"""
+Process Information Formatter
+
+This module renders the output of `get_top_processes` as a report section
+without calling an LLM.
+"""
+
+from typing import Any, Dict, List
+
+
+def _format_ranking(title: str, entries: List[Dict[str, Any]], value_key: str) -> List[str]:
+    """Format one top-N ranking as a markdown list."""
+    if not entries:
+        return [f"**{title}:** no data"]
+    return [f"**{title}:**"] + [
+        f"- {entry['name']} (PID {entry['pid']}): {entry[value_key]}"
+        for entry in entries
+    ]
+
+
+def format_process_info(data: Dict[str, Any]) -> str:
+    """
+    Format the process tool result as a markdown report section.
+
+    Args:
+        data (Dict[str, Any]): Dictionary returned by get_top_processes
+
+    Returns:
+        str: Markdown section listing the top resource consumers
+    """
+    result = data.get("result", {})
+    if "error" in result:
+        return f"## Top Processes\n\n**Unavailable:** {result['error']}"
+
+    stats = data.get("stats", {})
+    note = data.get("additional_info", {}).get("sampling_note")
+
+    lines = [
+        "## Top Processes",
+        "",
+        f"- Processes: {stats.get('process_count')}"
+        f" (sampled {stats.get('sampled_process_count')})",
+        "",
+    ]
+    lines.extend(_format_ranking("CPU", result.get("top_cpu", []), "cpu_percent"))
+    lines.append("")
+    lines.extend(_format_ranking("Memory (RSS)", result.get("top_memory", []), "rss"))
+    lines.append("")
+    lines.extend(_format_ranking("Disk I/O", result.get("top_io", []), "io_rate"))
+    if note:
+        lines.extend(["", f"_Note: {note}_"])
+    return "\n".join(lines)
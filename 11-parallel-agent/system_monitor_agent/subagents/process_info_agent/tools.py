@@ -0,0 +1,327 @@
+"""
+Process Information Tool
+
+This module provides tools for finding the processes that consume the most
+CPU, memory and disk I/O.
+
+CPU and I/O usage are rates, so they are computed from the difference between
+two samples. A per-PID cache keeps the previous CPU-time and I/O counters
+between calls, and each call only reads the cheap counters (`/proc/<pid>/stat`,
+`statm` and `io` on Linux) for every process. Names are looked up for the
+top-N winners only. On very large hosts the sampling pass stops at a time
+budget and the next call resumes where it left off.
+
+`get_top_processes` returns the verbose, pre-formatted payload and
+`get_process_metrics` the compact one (raw numbers).
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+
+from ..compact import fit_to_budget
+
+# --- Constants ---
+DEFAULT_TOP_N = 5  # Number of processes reported per ranking
+SAMPLE_TIME_BUDGET_SECONDS = 0.5  # Time budget for one sampling pass
+BOOTSTRAP_INTERVAL_SECONDS = 0.5  # Gap between the two samples of a first call
+
+_PROCESS_ERRORS = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+
+class _ProcessSample:
+    """Cached counters for one process, kept between tool calls."""
+
+    __slots__ = (
+        "process",
+        "cpu_time",
+        "io_bytes",
+        "rss",
+        "sampled_at",
+        "cpu_rate",
+        "io_rate",
+    )
+
+    def __init__(self, process: psutil.Process):
+        self.process = process
+        self.cpu_time: Optional[float] = None
+        self.io_bytes: Optional[int] = None
+        self.rss = 0
+        self.sampled_at: Optional[float] = None
+        self.cpu_rate: Optional[float] = None
+        self.io_rate: Optional[float] = None
+
+
+_cache: Dict[int, _ProcessSample] = {}
+_cache_lock = threading.Lock()
+# Position in the PID list where a truncated sampling pass should resume
+_resume_index = 0
+
+
+def _update_sample(pid: int, now: float) -> bool:
+    """
+    Read the counters of one process and update its cached rates.
+
+    Returns:
+        bool: False if the process is gone or cannot be read
+    """
+    sample = _cache.get(pid)
+    try:
+        if sample is None:
+            sample = _ProcessSample(psutil.Process(pid))
+            _cache[pid] = sample
+
+        process = sample.process
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            rss = process.memory_info().rss
+        try:
+            io_counters = process.io_counters()
+            io_bytes = io_counters.read_bytes + io_counters.write_bytes
+        except (psutil.AccessDenied, AttributeError):
+            # io_counters needs extra privileges and is not available everywhere
+            io_bytes = None
+    except _PROCESS_ERRORS:
+        _cache.pop(pid, None)
+        return False
+
+    cpu_time = cpu_times.user + cpu_times.system
+    if sample.cpu_time is not None and cpu_time < sample.cpu_time:
+        # CPU time never decreases, so the PID was reused by a new process
+        sample.sampled_at = None
+        sample.cpu_rate = sample.io_rate = None
+
+    if sample.sampled_at is not None and now > sample.sampled_at:
+        elapsed = now - sample.sampled_at
+        sample.cpu_rate = max(cpu_time - sample.cpu_time, 0) / elapsed
+        if io_bytes is not None and sample.io_bytes is not None:
+            sample.io_rate = max(io_bytes - sample.io_bytes, 0) / elapsed
+
+    sample.cpu_time = cpu_time
+    sample.io_bytes = io_bytes
+    sample.rss = rss
+    sample.sampled_at = now
+    return True
+
+
+def _sample_processes(time_budget: float) -> Dict[str, Any]:
+    """
+    Refresh the per-PID cache within a time budget.
+
+    Returns:
+        Dict[str, Any]: Counts describing how complete the pass was
+    """
+    global _resume_index
+
+    pids = psutil.pids()
+    live_pids = set(pids)
+    # Drop processes that have exited since the last pass
+    for pid in [pid for pid in _cache if pid not in live_pids]:
+        del _cache[pid]
+
+    deadline = time.monotonic() + time_budget
+    start = _resume_index % len(pids) if pids else 0
+    sampled = 0
+    truncated = False
+
+    for offset in range(len(pids)):
+        if time.monotonic() > deadline:
+            truncated = True
+            break
+        index = (start + offset) % len(pids)
+        if _update_sample(pids[index], time.monotonic()):
+            sampled += 1
+
+    # Resume after the PIDs visited, including ones that exited or were denied
+    _resume_index = start + offset if truncated else 0
+    return {"process_count": len(pids), "sampled": sampled, "truncated": truncated}
+
+
+def _describe(sample: _ProcessSample) -> Dict[str, Any]:
+    """Look up the name of a top-N process and snapshot its values."""
+    try:
+        name = sample.process.name()
+    except _PROCESS_ERRORS:
+        name = "<exited>"
+    return {
+        "pid": sample.process.pid,
+        "name": name,
+        "cpu_rate": sample.cpu_rate,
+        "rss": sample.rss,
+        "io_rate": sample.io_rate,
+    }
+
+
+def collect_process_sample(limit: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    Refresh the per-PID cache and rank the top resource consumers.
+
+    Args:
+        limit (int): Number of processes to keep in each ranking
+
+    Returns:
+        Dict[str, Any]: Raw rankings (CPU rate in seconds per second, RSS in
+            bytes, I/O rate in bytes per second) and sampling statistics
+    """
+    started = time.monotonic()
+    with _cache_lock:
+        bootstrapped = not _cache
+        pass_info = _sample_processes(SAMPLE_TIME_BUDGET_SECONDS)
+        if bootstrapped:
+            # Rates need two samples, so take the second one now
+            time.sleep(BOOTSTRAP_INTERVAL_SECONDS)
+            pass_info = _sample_processes(SAMPLE_TIME_BUDGET_SECONDS)
+
+        samples = list(_cache.values())
+        top_cpu = heapq.nlargest(
+            limit, (s for s in samples if s.cpu_rate), key=lambda s: s.cpu_rate
+        )
+        top_memory = heapq.nlargest(limit, samples, key=lambda s: s.rss)
+        top_io = heapq.nlargest(
+            limit, (s for s in samples if s.io_rate), key=lambda s: s.io_rate
+        )
+
+        return {
+            "top_cpu": [_describe(s) for s in top_cpu],
+            "top_memory": [_describe(s) for s in top_memory],
+            "top_io": [_describe(s) for s in top_io],
+            **pass_info,
+            "duration": time.monotonic() - started,
+            "timestamp": time.time(),
+        }
+
+
+def build_process_info(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the verbose process payload from a sample.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_process_sample
+
+    Returns:
+        Dict[str, Any]: Dictionary with process information structured for ADK
+    """
+    process_info = {
+        "top_cpu": [
+            {
+                "pid": p["pid"],
+                "name": p["name"],
+                "cpu_percent": f"{p['cpu_rate'] * 100:.1f}%",
+            }
+            for p in sample["top_cpu"]
+        ],
+        "top_memory": [
+            {
+                "pid": p["pid"],
+                "name": p["name"],
+                "rss": f"{p['rss'] / (1024 ** 2):.1f} MB",
+            }
+            for p in sample["top_memory"]
+        ],
+        "top_io": [
+            {
+                "pid": p["pid"],
+                "name": p["name"],
+                "io_rate": f"{p['io_rate'] / (1024 ** 2):.2f} MB/s",
+            }
+            for p in sample["top_io"]
+        ],
+    }
+
+    # Format for ADK tool return structure
+    return {
+        "result": process_info,
+        "stats": {
+            "process_count": sample["process_count"],
+            "sampled_process_count": sample["sampled"],
+            "sampling_truncated": sample["truncated"],
+            "sample_duration_seconds": sample["duration"],
+            "top_cpu_percent": (
+                sample["top_cpu"][0]["cpu_rate"] * 100 if sample["top_cpu"] else 0.0
+            ),
+        },
+        "additional_info": {
+            "data_format": "dictionary",
+            "collection_timestamp": sample["timestamp"],
+            "cpu_percent_note": (
+                "Percent of one core (can exceed 100% for multi-threaded processes)"
+            ),
+            "sampling_note": (
+                "Sampling hit its time budget; "
+                "unsampled processes use their previous values"
+                if sample["truncated"]
+                else None
+            ),
+        },
+    }
+
+
+def build_process_metrics(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the compact process payload from a sample.
+
+    Each ranking is a list of [pid, name, value] rows.
+
+    Args:
+        sample (Dict[str, Any]): Result of collect_process_sample
+
+    Returns:
+        Dict[str, Any]: Raw rankings and sampling statistics
+    """
+    return fit_to_budget(
+        {
+            "cpu_pct": [
+                [p["pid"], p["name"], round(p["cpu_rate"] * 100, 1)]
+                for p in sample["top_cpu"]
+            ],
+            "rss_b": [[p["pid"], p["name"], p["rss"]] for p in sample["top_memory"]],
+            "io_bps": [
+                [p["pid"], p["name"], round(p["io_rate"])] for p in sample["top_io"]
+            ],
+            "procs": sample["process_count"],
+            "truncated": sample["truncated"],
+            "ts": round(sample["timestamp"]),
+        }
+    )
+
+
+def get_top_processes(limit: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    Find the top CPU, memory (RSS) and disk I/O consuming processes.
+
+    Args:
+        limit (int): Number of processes to report in each ranking
+
+    Returns:
+        Dict[str, Any]: Dictionary with process information structured for ADK
+    """
+    try:
+        return build_process_info(collect_process_sample(limit))
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather process information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
+
+
+def get_process_metrics(limit: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    Find the top CPU, memory and disk I/O consuming processes as raw numbers.
+
+    Each ranking is a list of [pid, name, value] rows: cpu_pct is percent of one
+    core, rss_b is resident memory in bytes, io_bps is disk I/O in bytes/second.
+
+    Args:
+        limit (int): Number of processes to report in each ranking
+
+    Returns:
+        Dict[str, Any]: Compact dictionary with process rankings
+    """
+    try:
+        return build_process_metrics(collect_process_sample(limit))
+    except Exception as e:
+        return {"error": f"Failed to gather process information: {str(e)}"}
@@ -1,3 +1,7 @@
 """System report synthesizer agent for system monitoring."""
 
-from .agent import system_report_synthesizer
+from .agent import (
+    alert_report_synthesizer,
+    system_report_synthesizer,
+    template_report_synthesizer,
+)
@@ -7,6 +7,10 @@ to create a comprehensive system health report.
 
 from google.adk.agents import LlmAgent
 
+from ..deterministic import TemplateReportAgent
+from .template import render_system_report
+from .tools import search_logs
+
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -20,14 +24,87 @@ system_report_synthesizer = LlmAgent(
     - CPU information: {cpu_info}
     - Memory information: {memory_info}
     - Disk information: {disk_info}
+    - Top processes: {process_info}
+    - Pressure stalls, load, network and container limits: {pressure_info}
+    - Fleet information (other hosts, may be empty): {fleet_info?}
     
     Create a well-formatted report with:
     1. An executive summary at the top with overall system health status
     2. Sections for each component with their respective information
     3. Recommendations based on any concerning metrics
     
+    When CPU, memory or disk I/O usage is high, use the top processes to name the
+    process that is most likely responsible.
+    
+    When running in a container (cgroup limits are set), judge memory and CPU against
+    the container limits and throttling rather than the host-wide usage.
+    
+    A section that says it timed out or failed had no data in time: mention it as
+    missing instead of guessing its values.
+    
+    If fleet information is present, add a fleet section with the fleet-wide averages,
+    the worst hosts and any unreachable hosts.
+    
+    If any metric is concerning, call the 'search_logs' tool to find recent error lines
+    in the system logs (optionally with a pattern for the component, e.g. "oom|out of
+    memory" or "i/o error|ext4") and cite the relevant lines as likely causes. Repeated
+    searches with the same pattern only return lines written since the last search.
+    
     Use markdown formatting to make the report readable and professional.
     Highlight any concerning values and provide practical recommendations.
     """,
     description="Synthesizes all system information into a comprehensive report",
+    tools=[search_logs],
+)
+
+# Template Report Synthesizer (no LLM call, used by the "template" report mode)
+template_report_synthesizer = TemplateReportAgent(
+    name="TemplateReportSynthesizer",
+    description="Renders the system health report from a fixed template",
+    renderer=render_system_report,
+    input_keys=[
+        "cpu_info",
+        "memory_info",
+        "disk_info",
+        "process_info",
+        "pressure_info",
+        "fleet_info",
+        "cpu_info_data",
+        "memory_info_data",
+        "disk_info_data",
+        "pressure_info_data",
+        "fleet_info_data",
+        "branch_timings",
+    ],
+    output_key="system_report",
+)
+
+# Alert Report Synthesizer (used by the monitoring daemon on alert state changes)
+alert_report_synthesizer = LlmAgent(
+    name="AlertReportSynthesizer",
+    model=GEMINI_MODEL,
+    instruction="""You are a System Alert Reporter.
+    
+    The monitoring daemon calls you only when an alert starts firing or is resolved.
+    The user message lists the alert state changes and the recent metric window
+    (one row per sample, oldest first) that triggered them.
+    
+    Current system information:
+    - CPU information: {cpu_info}
+    - Memory information: {memory_info}
+    - Disk information: {disk_info}
+    - Top processes: {process_info}
+    - Pressure stalls, load, network and container limits: {pressure_info}
+    
+    Write a short markdown alert report with:
+    1. A one-line headline naming each alert and whether it is firing or resolved
+    2. How the metric developed over the window (rising, sustained, spike, recovered)
+    3. The likely cause, using the top processes where relevant. For firing alerts, call
+       the 'search_logs' tool for recent related error lines and quote the relevant ones
+    4. Concrete next steps for firing alerts
+    
+    Keep it brief: this report is sent to an on-call engineer.
+    """,
+    description="Explains alert state changes detected by the monitoring daemon",
+    tools=[search_logs],
 )
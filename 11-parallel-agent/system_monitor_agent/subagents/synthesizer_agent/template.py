@@ -0,0 +1,167 @@
+"""
+System Report Template
+
+This module renders the final system health report from the formatted
+sections and raw tool data, for the report mode that makes no LLM calls.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from ..pressure_info_agent.formatter import CONCERN_DESCRIPTIONS
+
+
+def _collect_concerns(
+    cpu_data: Optional[Dict[str, Any]],
+    memory_data: Optional[Dict[str, Any]],
+    disk_data: Optional[Dict[str, Any]],
+    pressure_data: Optional[Dict[str, Any]] = None,
+    fleet_data: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Collect the alert messages raised by the monitoring tools."""
+    concerns = []
+
+    for component, data in (
+        ("CPU", cpu_data),
+        ("Memory", memory_data),
+        ("Disk", disk_data),
+    ):
+        if not data:
+            concerns.append(f"{component} information was not collected")
+        elif data.get("stats", {}).get("success") is False:
+            concerns.append(f"{component} information could not be gathered")
+
+    if cpu_data and cpu_data.get("additional_info", {}).get("performance_concern"):
+        concerns.append(cpu_data["additional_info"]["performance_concern"])
+
+    if memory_data:
+        memory_additional = memory_data.get("additional_info", {})
+        for key in ("performance_concern", "swap_concern"):
+            if memory_additional.get(key):
+                concerns.append(memory_additional[key])
+
+    if disk_data:
+        disk_additional = disk_data.get("additional_info", {})
+        if disk_additional.get("high_usage_partitions"):
+            concerns.append(
+                f"High disk usage on {', '.join(disk_additional['high_usage_partitions'])}"
+            )
+        if disk_additional.get("unresponsive_partitions"):
+            concerns.append(
+                "Unresponsive mounts: "
+                f"{', '.join(disk_additional['unresponsive_partitions'])}"
+            )
+
+    if pressure_data:
+        for concern in pressure_data.get("additional_info", {}).get("concerns") or []:
+            concerns.append(CONCERN_DESCRIPTIONS.get(concern, concern))
+
+    if fleet_data:
+        fleet_additional = fleet_data.get("additional_info", {})
+        if fleet_additional.get("alerting_hosts"):
+            concerns.append(
+                f"Fleet hosts with alerts: {', '.join(fleet_additional['alerting_hosts'])}"
+            )
+        if fleet_additional.get("unreachable_hosts"):
+            concerns.append(
+                "Unreachable fleet hosts: "
+                f"{', '.join(fleet_additional['unreachable_hosts'])}"
+            )
+
+    return concerns
+
+
+def render_system_report(
+    cpu_info: Optional[str] = None,
+    memory_info: Optional[str] = None,
+    disk_info: Optional[str] = None,
+    process_info: Optional[str] = None,
+    pressure_info: Optional[str] = None,
+    fleet_info: Optional[str] = None,
+    cpu_info_data: Optional[Dict[str, Any]] = None,
+    memory_info_data: Optional[Dict[str, Any]] = None,
+    disk_info_data: Optional[Dict[str, Any]] = None,
+    pressure_info_data: Optional[Dict[str, Any]] = None,
+    fleet_info_data: Optional[Dict[str, Any]] = None,
+    branch_timings: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> str:
+    """
+    Render the system health report as markdown.
+
+    Args:
+        cpu_info (Optional[str]): Formatted CPU section
+        memory_info (Optional[str]): Formatted memory section
+        disk_info (Optional[str]): Formatted disk section
+        process_info (Optional[str]): Formatted top processes section
+        pressure_info (Optional[str]): Formatted pressure, load and network section
+        fleet_info (Optional[str]): Formatted fleet section (if fleet hosts are set)
+        cpu_info_data (Optional[Dict[str, Any]]): Raw get_cpu_info result
+        memory_info_data (Optional[Dict[str, Any]]): Raw get_memory_info result
+        disk_info_data (Optional[Dict[str, Any]]): Raw get_disk_info result
+        pressure_info_data (Optional[Dict[str, Any]]): Raw get_pressure_info result
+        fleet_info_data (Optional[Dict[str, Any]]): Raw get_fleet_info result
+        branch_timings (Optional[Dict[str, Dict[str, Any]]]): Status and duration
+            of each information branch
+
+    Returns:
+        str: The complete markdown report
+    """
+    concerns = _collect_concerns(
+        cpu_info_data,
+        memory_info_data,
+        disk_info_data,
+        pressure_info_data,
+        fleet_info_data,
+    )
+    for name, timing in (branch_timings or {}).items():
+        if timing["status"] == "timed_out":
+            concerns.append(f"{name} timed out after {timing['deadline_seconds']:g}s")
+        elif timing["status"] == "error":
+            concerns.append(f"{name} failed: {timing.get('error')}")
+    status = "ATTENTION NEEDED" if concerns else "HEALTHY"
+
+    lines = [
+        "# System Health Report",
+        "",
+        f"_Generated {time.strftime('%Y-%m-%d %H:%M:%S')}_",
+        "",
+        "## Executive Summary",
+        "",
+        f"**Overall status: {status}**",
+        "",
+    ]
+    if concerns:
+        lines.extend(f"- {concern}" for concern in concerns)
+    else:
+        lines.append("- All monitored metrics are within normal thresholds.")
+
+    for section in (
+        cpu_info,
+        memory_info,
+        disk_info,
+        process_info,
+        pressure_info,
+        fleet_info,
+    ):
+        if section:
+            lines.extend(["", section])
+
+    if branch_timings:
+        lines.extend(["", "## Collection Times", ""])
+        lines.extend(
+            f"- {name}: {timing['seconds']:.2f}s ({timing['status']})"
+            for name, timing in sorted(
+                branch_timings.items(), key=lambda item: item[1]["seconds"]
+            )
+        )
+
+    lines.extend(["", "## Recommendations", ""])
+    if concerns:
+        lines.append(
+            "- Investigate the components listed above, or rerun the monitor in"
+            " `llm` mode for a detailed analysis."
+        )
+    else:
+        lines.append("- No action required.")
+
+    return "\n".join(lines)
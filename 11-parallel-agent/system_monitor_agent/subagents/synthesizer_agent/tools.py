@@ -0,0 +1,216 @@
+"""
+Log Search Tool
+
+This module provides a tool for finding recent error lines in system logs,
+so the synthesizer can explain a health anomaly.
+
+Log files are memory-mapped and searched backwards in chunks from the end, so
+only the tail of a large file is read until enough matching lines are found.
+The regex runs directly on the mapped pages (no copy into Python strings) and
+only matching lines are decoded. Searches stop at a byte and a time budget.
+
+The searched end offset is remembered per (file, pattern). The next search with
+the same pattern only reads data appended since then, and starts over when the
+file was rotated (new inode) or truncated.
+"""
+
+import mmap
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from ...config import (
+    LOG_PATHS,
+    LOG_READ_MAX_BYTES,
+    LOG_RESULT_MAX_BYTES,
+    LOG_SEARCH_BUDGET_SECONDS,
+)
+from ..compact import fit_to_budget
+
+# --- Constants ---
+DEFAULT_LOG_PATTERN = r"error|fail|critical|fatal|panic|oom|killed process|segfault"
+CHUNK_BYTES = 1024 * 1024  # Size of each backwards read
+MAX_LINE_CHARS = 300  # Longer lines are truncated in the result
+MAX_MATCHES_LIMIT = 100
+
+
+class _LogOffset(NamedTuple):
+    """Where the previous search of a file with a pattern stopped."""
+
+    inode: int
+    offset: int
+
+
+_log_offsets: Dict[Tuple[str, str], _LogOffset] = {}
+_offsets_lock = threading.Lock()
+
+
+def _search_backwards(
+    data: mmap.mmap,
+    regex: "re.Pattern[bytes]",
+    lower: int,
+    upper: int,
+    max_matches: int,
+    max_bytes: int,
+    deadline: float,
+) -> Tuple[List[bytes], int, bool]:
+    """
+    Find the last matching lines between two offsets, reading backwards.
+
+    Args:
+        data: The mapped file
+        regex: Compiled bytes pattern
+        lower: Offset of the first byte that may be read
+        upper: Offset just past the last complete line to read
+        max_matches: Stop after this many matching lines
+        max_bytes: Stop after reading this many bytes
+        deadline: Stop at this time.monotonic() value
+
+    Returns:
+        Tuple[List[bytes], int, bool]: Matching lines (newest first), the lowest
+            offset that was searched and whether a budget stopped the search
+    """
+    lines: List[bytes] = []
+    end = upper
+    while end > lower and len(lines) < max_matches:
+        if upper - end >= max_bytes or time.monotonic() >= deadline:
+            return lines, end, True
+        # Extend the chunk back to a line start so no line is split
+        start = max(lower, end - CHUNK_BYTES)
+        if start > lower:
+            start = max(lower, data.rfind(b"\n", lower, start) + 1)
+
+        chunk_lines = []
+        last_line_start = -1
+        for match in regex.finditer(data, start, end):
+            line_start = max(data.rfind(b"\n", start, match.start()) + 1, start)
+            if line_start == last_line_start:
+                continue  # Several matches on one line
+            line_end = data.find(b"\n", match.end(), end)
+            chunk_lines.append(data[line_start : line_end if line_end != -1 else end])
+            last_line_start = line_start
+        lines.extend(reversed(chunk_lines))
+        end = start
+    return lines[:max_matches], end, False
+
+
+def _search_file(
+    path: str,
+    pattern: str,
+    regex: "re.Pattern[bytes]",
+    max_matches: int,
+    max_bytes: int,
+    deadline: float,
+) -> Dict[str, Any]:
+    """Search one log file, reading only what was appended since the last search."""
+    with open(path, "rb") as log_file:
+        stat_result = os.fstat(log_file.fileno())
+        size = stat_result.st_size
+        previous = _log_offsets.get((path, pattern))
+        rotated = previous is not None and (
+            previous.inode != stat_result.st_ino or previous.offset > size
+        )
+        lower = previous.offset if previous is not None and not rotated else 0
+
+        if size == lower:
+            lines, searched_from, upper, budget_reached = [], lower, lower, False
+        else:
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # A partially written last line is left for the next search
+                upper = data.rfind(b"\n", lower, size) + 1
+                if upper <= lower:
+                    upper = lower
+                lines, searched_from, budget_reached = _search_backwards(
+                    data, regex, lower, upper, max_matches, max_bytes, deadline
+                )
+
+    with _offsets_lock:
+        _log_offsets[(path, pattern)] = _LogOffset(stat_result.st_ino, upper)
+
+    return {
+        "lines": [
+            line.decode("utf-8", errors="replace")[:MAX_LINE_CHARS] for line in lines
+        ],
+        "bytes_read": upper - searched_from,
+        "new_data_only": previous is not None and not rotated,
+        "rotated": rotated,
+        # Older data the byte or time budget did not allow to search
+        "skipped_bytes": searched_from - lower if budget_reached else 0,
+    }
+
+
+def search_logs(
+    pattern: str = DEFAULT_LOG_PATTERN, max_matches: int = 20
+) -> Dict[str, Any]:
+    """
+    Find the most recent log lines matching a regular expression.
+
+    Searches the configured system logs from the end. Repeated searches with the
+    same pattern only return lines written since the previous search.
+
+    Args:
+        pattern (str): Case-insensitive regular expression, by default common
+            error keywords (error, fail, critical, panic, oom, segfault, ...)
+        max_matches (int): Maximum number of matching lines per log file
+
+    Returns:
+        Dict[str, Any]: Dictionary with the matching lines, newest first
+    """
+    try:
+        regex = re.compile(pattern.encode("utf-8"), re.IGNORECASE)
+        max_matches = max(1, min(int(max_matches), MAX_MATCHES_LIMIT))
+        deadline = time.monotonic() + LOG_SEARCH_BUDGET_SECONDS
+        remaining_bytes = LOG_READ_MAX_BYTES
+
+        matches = []
+        files: Dict[str, Any] = {}
+        unreadable: List[str] = []
+        for path in LOG_PATHS:
+            if remaining_bytes <= 0 or time.monotonic() >= deadline:
+                files[path] = {"status": "skipped (budget exhausted)"}
+                continue
+            try:
+                found = _search_file(
+                    path, pattern, regex, max_matches, remaining_bytes, deadline
+                )
+            except FileNotFoundError:
+                continue  # Not every distribution has every configured log
+            except OSError as e:
+                unreadable.append(f"{path} ({type(e).__name__})")
+                continue
+            remaining_bytes -= found.pop("bytes_read")
+            matches.extend({"file": path, "line": line} for line in found.pop("lines"))
+            files[path] = found
+
+        complete = all(file.get("skipped_bytes", 1) == 0 for file in files.values())
+        return fit_to_budget(
+            {
+                "result": {"matches": matches},
+                "stats": {
+                    "match_count": len(matches),
+                    "files_searched": len(files),
+                    "bytes_read": LOG_READ_MAX_BYTES - remaining_bytes,
+                    "complete": complete,
+                },
+                "additional_info": {
+                    "data_format": "dictionary",
+                    "collection_timestamp": time.time(),
+                    "pattern": pattern,
+                    "files": files,
+                    "unreadable_files": unreadable or None,
+                    "note": (
+                        None if complete else "Budget reached: older lines were not searched"
+                    ),
+                },
+            },
+            LOG_RESULT_MAX_BYTES,
+        )
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to search logs: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
+
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for trimming compact tool payloads to a byte budget.
+
+Usage:
+    python test_compact.py
+"""
+
+from system_monitor_agent.subagents.compact import dumps, fit_to_budget
+
+
+def test_rows_stay_intact():
+    payload = {
+        "cpu_pct": [[pid, "x" * 200, float(pid)] for pid in range(1, 9)],
+        "load": [0.5, 0.4, 0.3],
+    }
+    trimmed = fit_to_budget(payload, 600)
+
+    assert len(dumps(trimmed)) <= 600
+    assert trimmed["cpu_pct"], "at least one row is kept"
+    for row in trimmed["cpu_pct"]:
+        assert len(row) == 3, f"row was cut: {row}"
+    assert trimmed["load"] == [0.5, 0.4, 0.3]
+    assert trimmed["omitted"]["cpu_pct"] == 8 - len(trimmed["cpu_pct"])
+    print("✅ Rows stay intact")
+
+
+def test_single_row_is_not_split():
+    payload = {"cpu_pct": [[1, "x" * 200, 1.0], [2, "y" * 200, 2.0]]}
+    trimmed = fit_to_budget(payload, 300)
+
+    assert trimmed["cpu_pct"] == [[1, "x" * 200, 1.0]]
+    print("✅ A remaining row over budget is kept whole")
+
+
+def test_nested_record_lists_are_trimmed():
+    payload = {
+        "partitions": [
+            {"mount": "/", "files": [[i, "f" * 50] for i in range(20)]},
+            {"mount": "/data", "files": []},
+        ]
+    }
+    trimmed = fit_to_budget(payload, 800)
+
+    files = trimmed["partitions"][0]["files"]
+    assert len(dumps(trimmed)) <= 800
+    assert files and all(len(row) == 2 for row in files)
+    assert "partitions.0.files" in trimmed["omitted"]
+    print("✅ Lists inside records are trimmed by whole rows")
+
+
+if __name__ == "__main__":
+    test_rows_stay_intact()
+    test_single_row_is_not_split()
+    test_nested_record_lists_are_trimmed()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Fan-in test for the fleet info tool using several local collector processes.
+
+Starts three collectors on localhost under different host names, then queries
+them together with a closed port (unreachable host) and a listening socket that
+never answers (slow host), and checks the merged per-host and fleet results.
+
+Usage:
+    python test_fleet_fan_in.py
+"""
+
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from system_monitor_agent.subagents.fleet_info_agent.formatter import format_fleet_info
+from system_monitor_agent.subagents.fleet_info_agent.tools import query_fleet
+
+HERE = Path(__file__).resolve().parent
+COLLECTOR_NAMES = ["web-1", "web-2", "db-1"]
+TIMEOUT_SECONDS = 3
+
+
+def free_port():
+    """Ask the OS for an unused localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(address, deadline):
+    """Poll a collector's /health endpoint until it answers."""
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://{address}/health", timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Collector {address} did not start")
+
+
+def test_fleet_fan_in():
+    collectors = []
+    addresses = []
+    # Accepts connections but never replies, like a hung host
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen()
+    silent_address = f"127.0.0.1:{silent.getsockname()[1]}"
+    dead_address = f"127.0.0.1:{free_port()}"
+
+    try:
+        for name in COLLECTOR_NAMES:
+            port = free_port()
+            collectors.append(
+                subprocess.Popen(
+                    [
+                        sys.executable,
+                        str(HERE / "collector.py"),
+                        "--host",
+                        "127.0.0.1",
+                        "--port",
+                        str(port),
+                        "--name",
+                        name,
+                    ],
+                    cwd=HERE,
+                )
+            )
+            addresses.append(f"127.0.0.1:{port}")
+
+        deadline = time.monotonic() + 30
+        for address in addresses:
+            wait_until_healthy(address, deadline)
+
+        started = time.monotonic()
+        data = query_fleet(addresses + [dead_address, silent_address], TIMEOUT_SECONDS)
+        elapsed = time.monotonic() - started
+
+        hosts = {host["address"]: host for host in data["result"]["hosts"]}
+        stats = data["stats"]
+        print(format_fleet_info(data))
+        print(f"\nFan-in took {elapsed:.2f}s for {len(hosts)} hosts")
+
+        assert stats["hosts_total"] == 5
+        assert stats["hosts_up"] == 3
+        assert sorted(hosts[address]["host"] for address in addresses) == sorted(
+            COLLECTOR_NAMES
+        )
+        assert hosts[dead_address]["status"] == "unreachable"
+        assert hosts[silent_address]["status"] in ("timeout", "unreachable")
+        assert stats["cpu_pct"]["max_host"] in COLLECTOR_NAMES
+        assert elapsed < TIMEOUT_SECONDS + 1, "slow hosts must not delay the fan-in"
+        print("✅ Fleet fan-in test passed")
+    finally:
+        for collector in collectors:
+            collector.terminate()
+        for collector in collectors:
+            collector.wait()
+        silent.close()
+
+
+if __name__ == "__main__":
+    test_fleet_fan_in()
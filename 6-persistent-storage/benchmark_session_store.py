@@ -0,0 +1,113 @@
+"""
+Benchmark event appends per second for the session stores.
+
+Compares the default DatabaseSessionService (SQLAlchemy on SQLite) with
+TunedSqliteSessionService. Each run creates a fresh database in a temporary
+directory and appends events that update the reminders list, like the memory
+agent's tools do.
+
+Usage:
+    python benchmark_session_store.py [--events 500] [--sessions 4]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+from sqlite_session_service import TunedSqliteSessionService
+
+APP_NAME = "Memory Agent"
+
+
+def make_event(index):
+    """Create an agent event that adds one reminder."""
+    return Event(
+        invocation_id=f"invocation-{index // 4}",
+        author="memory_agent",
+        content=types.Content(
+            role="model", parts=[types.Part(text=f"Added reminder number {index}.")]
+        ),
+        actions=EventActions(
+            state_delta={"reminders": [f"reminder {i}" for i in range(index % 20)]}
+        ),
+    )
+
+
+async def run_benchmark(session_service, events, sessions):
+    """
+    Append events to several sessions concurrently.
+
+    Returns:
+        float: Appended events per second (including the final flush)
+    """
+    created = [
+        await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=f"user-{i}",
+            state={"user_name": f"User {i}", "reminders": []},
+        )
+        for i in range(sessions)
+    ]
+
+    async def append_all(session):
+        for index in range(events):
+            await session_service.append_event(session, make_event(index))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(append_all(session) for session in created))
+    if hasattr(session_service, "flush"):
+        await session_service.flush()
+    elapsed = time.perf_counter() - started
+
+    # Check that everything was persisted (asking for every event, since the
+    # tuned service only returns its hot events by default)
+    stored = await session_service.get_session(
+        app_name=APP_NAME,
+        user_id=created[0].user_id,
+        session_id=created[0].id,
+        config=GetSessionConfig(num_recent_events=events),
+    )
+    assert len(stored.events) == events, f"{len(stored.events)} events stored"
+    return events * sessions / elapsed
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as directory:
+        default_service = DatabaseSessionService(
+            db_url=f"sqlite+aiosqlite:///{os.path.join(directory, 'default.db')}"
+        )
+        tuned_service = TunedSqliteSessionService(
+            db_path=os.path.join(directory, "tuned.db")
+        )
+        unbatched_service = TunedSqliteSessionService(
+            db_path=os.path.join(directory, "unbatched.db"), batch_size=1
+        )
+
+        results = {}
+        for label, service in (
+            ("DatabaseSessionService (default)", default_service),
+            ("TunedSqliteSessionService, batch_size=1", unbatched_service),
+            ("TunedSqliteSessionService", tuned_service),
+        ):
+            results[label] = await run_benchmark(service, args.events, args.sessions)
+            if hasattr(service, "close"):
+                await service.close()
+
+    baseline = results["DatabaseSessionService (default)"]
+    print(f"\n{args.events} events x {args.sessions} concurrent sessions")
+    print(f"{'Session service':<42} {'appends/s':>10} {'speedup':>8}")
+    for label, rate in results.items():
+        print(f"{label:<42} {rate:>10.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=500, help="Events per session")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions")
+    asyncio.run(main_async(parser.parse_args()))
@@ -0,0 +1,153 @@
+"""
+Event Archive
+
+Hot and cold event storage for TunedSqliteSessionService.
+
+Only the newest `hot_events` events of a session stay in `session_events`;
+older ones are moved to `session_events_archive` in chunks of `ARCHIVE_CHUNK`
+as new events are written, so most writes skip archiving entirely. Reads look
+at the hot table first and continue into the archive only when the hot events
+do not satisfy the request, so reading a long session's newest events costs the
+same as reading a new session. `list_events_page` pages through the whole
+history, newest page first.
+"""
+
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+from google.adk.events import Event
+
+# --- Constants ---
+ARCHIVE_CHUNK = 50  # Events are archived once this many are past the hot window
+
+
+class EventArchiveMixin:
+    """
+    Event archiving and paged event reads for TunedSqliteSessionService.
+
+    Uses the service's `hot_events` setting and its `_read` helper.
+    """
+
+    def _archive_old_events(
+        self, connection: sqlite3.Connection, key: Tuple[str, str, str]
+    ) -> None:
+        """Move events past the hot window to the archive (inside a transaction)."""
+        newest_first = (
+            "SELECT seq FROM session_events"
+            " WHERE app_name = ? AND user_id = ? AND session_id = ?"
+            " ORDER BY seq DESC LIMIT 1 OFFSET ?"
+        )
+        # Only move whole chunks, so most writes skip archiving entirely
+        if not connection.execute(
+            newest_first, (*key, self.hot_events + ARCHIVE_CHUNK - 1)
+        ).fetchone():
+            return
+        (cutoff,) = connection.execute(newest_first, (*key, self.hot_events)).fetchone()
+        columns = (
+            "seq, app_name, user_id, session_id, id, invocation_id, timestamp, event"
+        )
+        where = " WHERE app_name = ? AND user_id = ? AND session_id = ? AND seq <= ?"
+        connection.execute(
+            f"INSERT INTO session_events_archive ({columns})"
+            f" SELECT {columns} FROM session_events{where}",
+            (*key, cutoff),
+        )
+        connection.execute(f"DELETE FROM session_events{where}", (*key, cutoff))
+
+    def _select_event_rows(
+        self,
+        connection: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        limit: Optional[int] = None,
+        before_seq: Optional[int] = None,
+        after_timestamp: Optional[float] = None,
+        include_archive: bool = True,
+    ) -> List[Tuple[int, str]]:
+        """
+        Read (seq, event JSON) rows of a session, newest first.
+
+        The hot table is read first; the archive (which only holds older
+        events) is read only if the hot events do not satisfy the request.
+        """
+        rows: List[Tuple[int, str]] = []
+        for table in ("session_events", "session_events_archive"):
+            if table == "session_events_archive":
+                if not include_archive or (limit is not None and len(rows) >= limit):
+                    break
+                if after_timestamp:
+                    # Archived events are older than every hot event
+                    oldest_hot = connection.execute(
+                        "SELECT timestamp FROM session_events"
+                        " WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                        " ORDER BY seq LIMIT 1",
+                        key,
+                    ).fetchone()
+                    if oldest_hot and oldest_hot[0] < after_timestamp:
+                        break
+            sql = (
+                f"SELECT seq, event FROM {table}"
+                " WHERE app_name = ? AND user_id = ? AND session_id = ?"
+            )
+            params: List[Any] = list(key)
+            if before_seq is not None:
+                sql += " AND seq < ?"
+                params.append(before_seq)
+            if after_timestamp:
+                sql += " AND timestamp >= ?"
+                params.append(after_timestamp)
+            sql += " ORDER BY seq DESC"
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit - len(rows))
+            rows.extend(connection.execute(sql, params).fetchall())
+        return rows
+
+    async def list_events_page(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Event], Optional[str]]:
+        """
+        Read a session's events one page at a time, newest page first.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            session_id: The session ID
+            limit: Maximum number of events to return
+            cursor: The cursor returned with the previous page (None for the
+                newest events)
+
+        Returns:
+            Tuple of (events oldest first, cursor of the next older page or
+            None on the last page)
+        """
+        return await self._read(
+            self._select_events_page,
+            (app_name, user_id, session_id),
+            max(1, limit),
+            cursor,
+        )
+
+    def _select_events_page(
+        self,
+        connection: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[Event], Optional[str]]:
+        rows = self._select_event_rows(
+            connection, key, limit=limit + 1, before_seq=int(cursor) if cursor else None
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1][0])
+        events = [
+            Event.model_validate_json(event_json) for _, event_json in reversed(rows)
+        ]
+        return events, next_cursor
@@ -1,17 +1,60 @@
 import asyncio
+import sqlite3
+from contextlib import closing
 
 from dotenv import load_dotenv
 from google.adk.runners import Runner
 from google.adk.sessions import DatabaseSessionService
-from memory_agent.agent import memory_agent
+from google.adk.sessions.base_session_service import GetSessionConfig
+from memory_agent.agent import root_agent
+from memory_agent.reminder_index import load_reminders
+from memory_agent.schema import memory_agent_schema
+from memory_agent.scheduler import scheduler
+from sqlite_session_service import TunedSqliteSessionService
 from utils import call_agent_async
 
 load_dotenv()
 
 # ===== PART 1: Initialize Persistent Session Service =====
-# Using SQLite database for persistent storage
-db_url = "sqlite:///./my_agent_data.db"
-session_service = DatabaseSessionService(db_url=db_url)
+# Using SQLite database for persistent storage (WAL mode, pooled connections -
+# see sqlite_session_service.py). shared=True lets several worker processes use
+# the same database: every event is committed right away and rejected with a
+# SessionConflictError if another worker changed the session first.
+# Sessions saved by older versions are upgraded to the current state schema
+# when they are read (see memory_agent/schema.py).
+db_path = "./my_agent_data.db"
+session_service = TunedSqliteSessionService(
+    db_path=db_path, shared=True, state_schema=memory_agent_schema
+)
+
+
+async def import_adk_sessions(app_name):
+    """
+    Copy the sessions DatabaseSessionService stored in the database file, once.
+
+    This example used DatabaseSessionService before. The tuned service keeps
+    its sessions in its own tables, so the older sessions are imported on the
+    first start; later starts skip the import.
+    """
+    with closing(sqlite3.connect(db_path)) as connection:
+        has_adk_tables = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions'"
+        ).fetchone()
+    if not has_adk_tables:
+        return
+    db_url = f"sqlite+aiosqlite:///{db_path}"
+    adk_service = DatabaseSessionService(db_url=db_url)
+    try:
+        counts = await session_service.import_from_service(
+            adk_service, app_name=app_name, name=db_url
+        )
+    finally:
+        await adk_service.close()
+    if counts is not None:
+        print(
+            f"Imported {counts['session']} sessions from DatabaseSessionService"
+            f" (skipped {counts['skipped_sessions']} that already exist)"
+        )
 
 
 # ===== PART 2: Define Initial State =====
@@ -28,31 +71,22 @@ async def main_async():
     USER_ID = "aiwithazril"
 
     # ===== PART 3: Session Management - Find or Create =====
-    # Check for existing sessions for this user
-    existing_sessions = await session_service.list_sessions(
+    # Sessions saved by DatabaseSessionService in the same file are copied into
+    # the tuned service's tables on the first start
+    await import_adk_sessions(APP_NAME)
+
+    # Look up this user's most recently updated session (an indexed query that
+    # does not load other sessions or any events)
+    session = await session_service.get_latest_session(
         app_name=APP_NAME,
         user_id=USER_ID,
     )
 
     # If there's an existing session, use it, otherwise create a new one
-    if existing_sessions and existing_sessions.sessions:
+    if session:
         # Continue the most recent session
-        session = existing_sessions.sessions[0]
         SESSION_ID = session.id
         print(f"Continuing existing session: {SESSION_ID}")
-
-        # Ensure state has the required keys and update if necessary
-        state_updated = False
-        if "user_name" not in session.state:
-            session.state["user_name"] = ""
-            state_updated = True
-        if "reminders" not in session.state:
-            session.state["reminders"] = []
-            state_updated = True
-
-        if state_updated:
-            await session_service.update_session(session)
-            print("Session state updated with missing keys.")
     else:
         # Create a new session with a unique ID and initial state
         initial_state = {"user_name": "", "reminders": []}
@@ -65,10 +99,19 @@ async def main_async():
         SESSION_ID = new_session.id
         print(f"Created new session: {SESSION_ID}")
 
+    # Schedule the due times of the saved reminders (tools keep it up to date)
+    session = await session_service.get_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=SESSION_ID,
+        config=GetSessionConfig(num_recent_events=0),
+    )
+    scheduler.sync((APP_NAME, USER_ID, SESSION_ID), load_reminders(session.state)[0])
+
     # ===== PART 4: Agent Runner Setup =====
     # Create a runner with the memory agent
     runner = Runner(
-        agent=memory_agent,
+        agent=root_agent,
         app_name=APP_NAME,
         session_service=session_service,
     )
@@ -79,6 +122,11 @@ async def main_async():
     print("Type 'exit' or 'quit' to end the conversation.\n")
 
     while True:
+        # Notify the user of reminders that came due since the last turn
+        for reminder in scheduler.pop_due():
+            if reminder["session_id"] == SESSION_ID:
+                print(f"🔔 Due {reminder['due']}: {reminder['text']}")
+
         # Get user input
         user_input = input("You: ")
 
@@ -87,8 +135,15 @@ async def main_async():
             print("Ending conversation. Your data has been saved to the database.")
             break
 
-        # Process the user query through the agent
-        await call_agent_async(runner, USER_ID, SESSION_ID, user_input)
+        # Process the user query through the agent, holding the session's lock
+        # so no other worker runs a turn of this session at the same time
+        async with session_service.session_lock(
+            app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
+        ):
+            await call_agent_async(runner, USER_ID, SESSION_ID, user_input)
+
+    # Write any batched events before exiting
+    await session_service.close()
 
 
 if __name__ == "__main__":
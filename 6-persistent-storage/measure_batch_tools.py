@@ -0,0 +1,196 @@
+"""
+Measure model round-trips with single and batch reminder tools.
+
+Runs the memory agent through a Runner on a temporary database with a scripted
+model in place of Gemini, so the runs are repeatable and need no API key. The
+scripted model answers "add / change / delete these N reminders" the two ways
+a real model can:
+
+- One call per reminder: add_reminder, update_reminder or delete_reminder,
+  one tool call per model turn (N + 1 model calls)
+- Batch: a single add_reminders, update_reminders or delete_reminders call
+  with all N reminders (2 model calls)
+
+Every model call waits `--latency` seconds to stand in for the network and
+generation time of a real model.
+
+Usage:
+    python measure_batch_tools.py [--reminders 5] [--latency 0.5]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import AsyncGenerator, List, Union
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.genai import types
+from memory_agent.agent import root_agent
+from memory_agent.reminder_index import load_reminders
+from sqlite_session_service import TunedSqliteSessionService
+
+APP_NAME = "Memory Agent"
+USER_ID = "benchmark-user"
+
+# A model turn is either tool calls [(name, args), ...] or the final text
+Turn = Union[List[tuple], str]
+
+
+class ScriptedModel(BaseLlm):
+    """A model that replays a fixed list of turns and counts its calls."""
+
+    model: str = "scripted"
+    turns: List[Turn] = []
+    latency: float = 0.0
+    calls: int = 0
+    prompt_chars: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        # The conversation so far is sent again on every call
+        chars = sum(
+            len(content.model_dump_json(exclude_none=True))
+            for content in llm_request.contents
+        )
+        self.prompt_chars += chars
+        await asyncio.sleep(self.latency)
+
+        turn = self.turns.pop(0)
+        if isinstance(turn, str):
+            parts = [types.Part(text=turn)]
+        else:
+            parts = [
+                types.Part(function_call=types.FunctionCall(name=name, args=args))
+                for name, args in turn
+            ]
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            # Rough token count (about 4 characters per token)
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=chars // 4
+            ),
+        )
+
+
+def scripts(count: int):
+    """The turns for adding, updating and deleting `count` reminders, both ways."""
+    texts = [f"Reminder number {i}" for i in range(1, count + 1)]
+    ids = list(range(1, count + 1))
+    due = "2030-01-01T09:00"
+    return {
+        "add": (
+            [[("add_reminder", {"reminder": text})] for text in texts] + ["Added."],
+            [[("add_reminders", {"reminders": [{"text": t} for t in texts]})], "Added."],
+        ),
+        "update": (
+            [[("update_reminder", {"reminder_id": i, "due": due})] for i in ids]
+            + ["Updated."],
+            [
+                [("update_reminders", {"updates": [{"id": i, "due": due} for i in ids]})],
+                "Updated.",
+            ],
+        ),
+        "delete": (
+            [[("delete_reminder", {"reminder_id": i})] for i in ids] + ["Deleted."],
+            [[("delete_reminders", {"reminder_ids": ids})], "Deleted."],
+        ),
+    }
+
+
+async def run_mode(session_service, turns_by_step, latency):
+    """
+    Run the add, update and delete steps in one new session.
+
+    Returns:
+        dict: Per step, the model calls, tool calls, state writes, prompt size,
+            wall time and the number of reminders afterwards
+    """
+    model = ScriptedModel(latency=latency)
+    runner = Runner(
+        agent=root_agent.clone(update={"model": model}),
+        app_name=APP_NAME,
+        session_service=session_service,
+    )
+    session = await session_service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, state={"user_name": "", "reminders": []}
+    )
+
+    results = {}
+    for step, turns in turns_by_step.items():
+        model.turns, model.calls, model.prompt_chars = list(turns), 0, 0
+        tool_calls = state_writes = 0
+        message = types.Content(role="user", parts=[types.Part(text=step)])
+
+        started = time.perf_counter()
+        async for event in runner.run_async(
+            user_id=USER_ID, session_id=session.id, new_message=message
+        ):
+            tool_calls += len(event.get_function_calls())
+            if event.actions and "reminders" in event.actions.state_delta:
+                state_writes += 1
+        elapsed = time.perf_counter() - started
+
+        stored = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+        )
+        results[step] = {
+            "model_calls": model.calls,
+            "tool_calls": tool_calls,
+            "state_writes": state_writes,
+            "prompt_chars": model.prompt_chars,
+            "seconds": elapsed,
+            "reminders": len(load_reminders(stored.state)[0]),
+        }
+    return results
+
+
+async def main_async(args):
+    steps = scripts(args.reminders)
+    with tempfile.TemporaryDirectory() as directory:
+        session_service = TunedSqliteSessionService(
+            db_path=os.path.join(directory, "measure.db")
+        )
+        single = await run_mode(
+            session_service, {s: turns[0] for s, turns in steps.items()}, args.latency
+        )
+        batch = await run_mode(
+            session_service, {s: turns[1] for s, turns in steps.items()}, args.latency
+        )
+        await session_service.close()
+
+    # Both ways must leave the same reminders behind
+    for step in steps:
+        assert single[step]["reminders"] == batch[step]["reminders"], step
+
+    print(f"\n{args.reminders} reminders per step, {args.latency:.2f}s per model call")
+    print(
+        f"{'Step':<8} {'Tools':<8} {'model calls':>11} {'tool calls':>10} "
+        f"{'state writes':>12} {'prompt chars':>12} {'seconds':>8}"
+    )
+    for step in steps:
+        for label, results in (("single", single), ("batch", batch)):
+            r = results[step]
+            print(
+                f"{step:<8} {label:<8} {r['model_calls']:>11} {r['tool_calls']:>10} "
+                f"{r['state_writes']:>12} {r['prompt_chars']:>12} {r['seconds']:>8.2f}"
+            )
+        saved = 1 - batch[step]["seconds"] / single[step]["seconds"]
+        print(f"{'':<8} {'':<8} latency saved by batching: {saved:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--reminders", type=int, default=5, help="Reminders per add/update/delete"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Simulated seconds per model call"
+    )
+    asyncio.run(main_async(parser.parse_args()))
@@ -1,35 +1,116 @@
+from datetime import datetime
+
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from .reminder_index import (
+    DEFAULT_MATCHES,
+    index_for_context,
+    load_reminders,
+    store_reminders,
+)
+from .scheduler import format_due, parse_due, scheduler, session_key
+
+
+def _save_reminders(tool_context: ToolContext, reminders: list, next_id: int) -> None:
+    """Write the reminders to state and update their due-time schedule."""
+    store_reminders(tool_context.state, reminders, next_id)
+    scheduler.sync(session_key(tool_context), reminders)
+
+
+def _normalize_due(due: str):
+    """Return (due time in DUE_FORMAT or "", error message or None)."""
+    if not due:
+        return "", None
+    try:
+        return format_due(parse_due(due)), None
+    except ValueError:
+        return "", f"Could not read the due time '{due}'. Use the format YYYY-MM-DDTHH:MM."
+
 
-def add_reminder(reminder: str, tool_context: ToolContext) -> dict:
+def add_reminder(reminder: str, tool_context: ToolContext, due: str = "") -> dict:
     """Add a new reminder to the user's reminder list.
 
     Args:
         reminder: The reminder text to add
         tool_context: Context for accessing and updating session state
+        due: Optional due time as YYYY-MM-DDTHH:MM (local time)
 
     Returns:
         A confirmation message
     """
-    print(f"--- Tool: add_reminder called for '{reminder}' ---")
+    print(f"--- Tool: add_reminder called for '{reminder}' (due '{due}') ---")
+
+    due, error = _normalize_due(due)
+    if error:
+        return {"action": "add_reminder", "status": "error", "message": error}
 
     # Get current reminders from state
-    reminders = tool_context.state.get("reminders", [])
+    reminders, next_id = load_reminders(tool_context.state)
 
-    # Add the new reminder
-    reminders.append(reminder)
+    # Add the new reminder with the next free id
+    entry = {"id": next_id, "text": reminder}
+    if due:
+        entry["due"] = due
+    reminders.append(entry)
 
     # Update state with the new list of reminders
-    tool_context.state["reminders"] = reminders
+    _save_reminders(tool_context, reminders, next_id + 1)
 
     return {
         "action": "add_reminder",
+        "id": next_id,
         "reminder": reminder,
-        "message": f"Added reminder: {reminder}",
+        "due": due or None,
+        "message": f"Added reminder #{next_id}: {reminder}"
+        + (f" (due {due})" if due else ""),
+    }
+
+
+def list_due_reminders(window_hours: float, tool_context: ToolContext) -> dict:
+    """List the reminders due within the next hours, including overdue ones.
+
+    Args:
+        window_hours: How many hours ahead to look, e.g. 24 for "today"
+        tool_context: Context for accessing session state
+
+    Returns:
+        The due reminders, earliest first
+    """
+    print(f"--- Tool: list_due_reminders called for {window_hours} hours ---")
+
+    key = session_key(tool_context)
+    scheduler.sync(key, load_reminders(tool_context.state)[0])
+    due = scheduler.list_due(key, window_hours * 3600)
+
+    return {
+        "action": "list_due_reminders",
+        "window_hours": window_hours,
+        "reminders": due,
+        "count": len(due),
     }
 
 
+def find_reminders(query: str, tool_context: ToolContext) -> dict:
+    """Find the reminders that best match a description, best match first.
+
+    Matching is fuzzy: partial text, other word forms and small misspellings
+    still match.
+
+    Args:
+        query: Words describing the reminder, e.g. "dentist" or "groceries"
+        tool_context: Context for accessing session state
+
+    Returns:
+        The matching reminders with their ids
+    """
+    print(f"--- Tool: find_reminders called for '{query}' ---")
+
+    matches = index_for_context(tool_context).search(query)
+
+    return {"action": "find_reminders", "query": query, "matches": matches}
+
+
 def view_reminders(tool_context: ToolContext) -> dict:
     """View all current reminders.
 
@@ -42,87 +123,294 @@ def view_reminders(tool_context: ToolContext) -> dict:
     print("--- Tool: view_reminders called ---")
 
     # Get reminders from state
-    reminders = tool_context.state.get("reminders", [])
+    reminders, _ = load_reminders(tool_context.state)
 
     return {"action": "view_reminders", "reminders": reminders, "count": len(reminders)}
 
 
-def update_reminder(index: int, updated_text: str, tool_context: ToolContext) -> dict:
-    """Update an existing reminder.
+def _parse_id(value):
+    """Read a reminder id given as a number or numeric text (None if invalid)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_by_id(reminders: list, reminder_id: int):
+    """Return the position of a reminder in the list, or None."""
+    for position, reminder in enumerate(reminders):
+        if reminder["id"] == reminder_id:
+            return position
+    return None
+
+
+def update_reminder(
+    reminder_id: int,
+    tool_context: ToolContext,
+    updated_text: str = "",
+    due: str = "",
+) -> dict:
+    """Update the text and/or the due time of an existing reminder.
 
     Args:
-        index: The 1-based index of the reminder to update
-        updated_text: The new text for the reminder
+        reminder_id: The id of the reminder to update (from find_reminders)
         tool_context: Context for accessing and updating session state
+        updated_text: The new text for the reminder (empty keeps the text)
+        due: The new due time as YYYY-MM-DDTHH:MM (empty keeps the due time)
 
     Returns:
         A confirmation message
     """
     print(
-        f"--- Tool: update_reminder called for index {index} with '{updated_text}' ---"
+        f"--- Tool: update_reminder called for #{reminder_id} with '{updated_text}' ---"
     )
 
+    due, error = _normalize_due(due)
+    if error:
+        return {"action": "update_reminder", "status": "error", "message": error}
+
     # Get current reminders from state
-    reminders = tool_context.state.get("reminders", [])
+    reminders, next_id = load_reminders(tool_context.state)
 
-    # Check if the index is valid
-    if not reminders or index < 1 or index > len(reminders):
+    # Check if the id exists
+    position = _find_by_id(reminders, _parse_id(reminder_id))
+    if position is None:
         return {
             "action": "update_reminder",
             "status": "error",
-            "message": f"Could not find reminder at position {index}. Currently there are {len(reminders)} reminders.",
+            "message": f"Could not find reminder #{reminder_id}. Use find_reminders to look up its id.",
         }
+    reminder_id = reminders[position]["id"]  # The id as stored, not as given
 
-    # Update the reminder (adjusting for 0-based indices)
-    old_reminder = reminders[index - 1]
-    reminders[index - 1] = updated_text
+    # Update the reminder
+    old_reminder = reminders[position]["text"]
+    updated_text = updated_text or old_reminder
+    reminders[position] = {**reminders[position], "text": updated_text}
+    if due:
+        reminders[position]["due"] = due
 
     # Update state with the modified list
-    tool_context.state["reminders"] = reminders
+    _save_reminders(tool_context, reminders, next_id)
 
     return {
         "action": "update_reminder",
-        "index": index,
+        "id": reminder_id,
         "old_text": old_reminder,
         "updated_text": updated_text,
-        "message": f"Updated reminder {index} from '{old_reminder}' to '{updated_text}'",
+        "message": f"Updated reminder #{reminder_id} from '{old_reminder}' to '{updated_text}'",
     }
 
 
-def delete_reminder(index: int, tool_context: ToolContext) -> dict:
+def delete_reminder(reminder_id: int, tool_context: ToolContext) -> dict:
     """Delete a reminder.
 
     Args:
-        index: The 1-based index of the reminder to delete
+        reminder_id: The id of the reminder to delete (from find_reminders)
         tool_context: Context for accessing and updating session state
 
     Returns:
         A confirmation message
     """
-    print(f"--- Tool: delete_reminder called for index {index} ---")
+    print(f"--- Tool: delete_reminder called for #{reminder_id} ---")
 
     # Get current reminders from state
-    reminders = tool_context.state.get("reminders", [])
+    reminders, next_id = load_reminders(tool_context.state)
 
-    # Check if the index is valid
-    if not reminders or index < 1 or index > len(reminders):
+    # Check if the id exists
+    position = _find_by_id(reminders, _parse_id(reminder_id))
+    if position is None:
         return {
             "action": "delete_reminder",
             "status": "error",
-            "message": f"Could not find reminder at position {index}. Currently there are {len(reminders)} reminders.",
+            "message": f"Could not find reminder #{reminder_id}. Use find_reminders to look up its id.",
         }
+    reminder_id = reminders[position]["id"]  # The id as stored, not as given
 
-    # Remove the reminder (adjusting for 0-based indices)
-    deleted_reminder = reminders.pop(index - 1)
+    # Remove the reminder
+    deleted_reminder = reminders.pop(position)["text"]
 
     # Update state with the modified list
-    tool_context.state["reminders"] = reminders
+    _save_reminders(tool_context, reminders, next_id)
 
     return {
         "action": "delete_reminder",
-        "index": index,
+        "id": reminder_id,
         "deleted_reminder": deleted_reminder,
-        "message": f"Deleted reminder {index}: '{deleted_reminder}'",
+        "message": f"Deleted reminder #{reminder_id}: '{deleted_reminder}'",
+    }
+
+
+def add_reminders(reminders: list[dict], tool_context: ToolContext) -> dict:
+    """Add several reminders at once, in a single state update.
+
+    Use this instead of calling add_reminder repeatedly when the user lists
+    several things. Either all reminders are added or, if one is invalid, none.
+
+    Args:
+        reminders: The reminders to add, each {"text": "...", "due": "YYYY-MM-DDTHH:MM"}
+            (due is optional)
+        tool_context: Context for accessing and updating session state
+
+    Returns:
+        The added reminders with their ids, or the errors
+    """
+    print(f"--- Tool: add_reminders called for {len(reminders)} reminders ---")
+
+    # Get current reminders from state
+    current, next_id = load_reminders(tool_context.state)
+
+    # Validate every reminder before changing anything
+    added, errors = [], []
+    for item in reminders:
+        if isinstance(item, str):
+            text, due = item, ""
+        elif isinstance(item, dict):
+            text, due = item.get("text", ""), item.get("due", "")
+        else:
+            errors.append(f"A reminder must be text or an object, not {item!r}.")
+            continue
+        due, error = _normalize_due(due)
+        if not text or not isinstance(text, str):
+            error = "A reminder has no text."
+        if error:
+            errors.append(error)
+            continue
+        entry = {"id": next_id + len(added), "text": text}
+        if due:
+            entry["due"] = due
+        added.append(entry)
+
+    if errors:
+        return {
+            "action": "add_reminders",
+            "status": "error",
+            "errors": errors,
+            "message": "No reminders were added. " + " ".join(errors),
+        }
+
+    # Update state once with all new reminders
+    _save_reminders(tool_context, current + added, next_id + len(added))
+
+    return {
+        "action": "add_reminders",
+        "added": added,
+        "count": len(added),
+        "message": f"Added {len(added)} reminders: "
+        + ", ".join(f"#{entry['id']} {entry['text']}" for entry in added),
+    }
+
+
+def update_reminders(updates: list[dict], tool_context: ToolContext) -> dict:
+    """Update several reminders at once, in a single state update.
+
+    Either all updates are applied or, if one is invalid, none.
+
+    Args:
+        updates: The changes, each {"id": 3, "text": "...", "due": "YYYY-MM-DDTHH:MM"}
+            (text and due are optional; omitted fields are kept)
+        tool_context: Context for accessing and updating session state
+
+    Returns:
+        The updated reminders, or the errors
+    """
+    print(f"--- Tool: update_reminders called for {len(updates)} reminders ---")
+
+    # Get current reminders from state
+    reminders, next_id = load_reminders(tool_context.state)
+
+    # Validate every update before changing anything
+    changes, errors = [], []
+    for update in updates:
+        if not isinstance(update, dict):
+            errors.append(f"An update must be an object with an id, not {update!r}.")
+            continue
+        position = _find_by_id(reminders, _parse_id(update.get("id")))
+        due, error = _normalize_due(update.get("due", ""))
+        if position is None:
+            error = f"Could not find reminder #{update.get('id')}."
+        if error:
+            errors.append(error)
+            continue
+        changes.append((position, update.get("text", ""), due))
+
+    if errors:
+        return {
+            "action": "update_reminders",
+            "status": "error",
+            "errors": errors,
+            "message": "No reminders were updated. " + " ".join(errors),
+        }
+
+    # Apply all updates, then update state once
+    for position, text, due in changes:
+        reminders[position] = {
+            **reminders[position],
+            "text": text or reminders[position]["text"],
+        }
+        if due:
+            reminders[position]["due"] = due
+    _save_reminders(tool_context, reminders, next_id)
+
+    updated = [reminders[position] for position, _, _ in changes]
+    return {
+        "action": "update_reminders",
+        "updated": updated,
+        "count": len(updated),
+        "message": f"Updated {len(updated)} reminders: "
+        + ", ".join(f"#{entry['id']} {entry['text']}" for entry in updated),
+    }
+
+
+def delete_reminders(reminder_ids: list[int], tool_context: ToolContext) -> dict:
+    """Delete several reminders at once, in a single state update.
+
+    Either all reminders are deleted or, if an id does not exist, none.
+
+    Args:
+        reminder_ids: The ids of the reminders to delete (from find_reminders)
+        tool_context: Context for accessing and updating session state
+
+    Returns:
+        The deleted reminders, or the ids that were not found
+    """
+    print(f"--- Tool: delete_reminders called for {reminder_ids} ---")
+
+    # Get current reminders from state
+    reminders, next_id = load_reminders(tool_context.state)
+
+    # Check that every id exists before changing anything
+    existing = {reminder["id"] for reminder in reminders}
+    ids = [_parse_id(reminder_id) for reminder_id in reminder_ids]
+    missing = [
+        reminder_id
+        for reminder_id, parsed in zip(reminder_ids, ids)
+        if parsed not in existing
+    ]
+    if missing:
+        return {
+            "action": "delete_reminders",
+            "status": "error",
+            "missing_ids": missing,
+            "message": "No reminders were deleted. Could not find reminders "
+            + ", ".join(f"#{reminder_id}" for reminder_id in missing)
+            + ". Use find_reminders to look up their ids.",
+        }
+
+    # Remove all of them, then update state once
+    to_delete = set(ids)
+    deleted = [reminder for reminder in reminders if reminder["id"] in to_delete]
+    _save_reminders(
+        tool_context,
+        [reminder for reminder in reminders if reminder["id"] not in to_delete],
+        next_id,
+    )
+
+    return {
+        "action": "delete_reminders",
+        "deleted": deleted,
+        "count": len(deleted),
+        "message": f"Deleted {len(deleted)} reminders: "
+        + ", ".join(f"#{entry['id']} {entry['text']}" for entry in deleted),
     }
 
 
@@ -152,53 +440,101 @@ def update_user_name(name: str, tool_context: ToolContext) -> dict:
     }
 
 
-# Create a simple persistent agent
-root_agent = Agent(
-    name="memory_agent",
-    model="gemini-1.5-flash",
-    description="A smart reminder agent with persistent memory",
-    instruction="""
+INSTRUCTION = """
     You are a friendly reminder assistant that remembers users across conversations.
 
+    The current time is {now}.
+
     The user's information is stored in state.
-    - User's name: {user_name|} (if available)
-    - Reminders: {reminders|[]}
+    - User's name: {user_name} (if available)
+    - Number of reminders: {reminder_count}
+    - Reminders that best match the user's message (id: text, due time):
+    {matching_reminders}
 
     You can help users manage their reminders with the following capabilities:
-    1. Add new reminders
-    2. View existing reminders
-    3. Update reminders
-    4. Delete reminders
-    5. Update the user's name
+    1. Add new reminders, optionally with a due time
+    2. Find reminders by description (find_reminders)
+    3. List reminders that are due soon (list_due_reminders)
+    4. View all reminders
+    5. Update reminders (text or due time)
+    6. Delete reminders
+    7. Update the user's name
 
     Always be friendly and address the user by name if you know it. If you don't know their name yet,
     ask them for it and use the update_user_name tool to store it when they introduce themselves.
 
     **REMINDER MANAGEMENT GUIDELINES:**
 
-    When dealing with reminders, you need to be smart about finding the right reminder:
+    Reminders are identified by their id. update_reminder and delete_reminder take the id.
 
-    1. **Partial Matching**: If a user refers to a reminder with partial text, find the best match.
-       Example: "delete the dentist one" should match "Dentist appointment on Tuesday"
+    1. **Resolving References**: If the user refers to a reminder ("delete the dentist one"), use
+       the matching reminders above. If the right one is not among them, call find_reminders with
+       the words the user used. It matches partial text, other word forms and small misspellings.
 
-    2. **Context Awareness**: Use context from the conversation to identify reminders.
-       Example: If discussing meetings and user says "update the second one", refer to the second meeting-related reminder.
+    2. **Context Awareness**: Use context from the conversation to choose between matches.
+       Example: If discussing meetings and user says "update the second one", pick the second meeting-related reminder.
 
-    3. **Fuzzy Matching**: Be flexible with variations in wording.
-       Example: "grocery shopping" should match "buy groceries" or "go to the store"
+    3. **Confirmation**: When several reminders match equally well, show the user what you found and confirm before proceeding.
+       Example: "I found #4 'Call mom at 3pm'. Is this the reminder you want to delete?"
 
-    4. **Confirmation**: When there's ambiguity, show the user what you found and confirm before proceeding.
-       Example: "I found 'Call mom at 3pm'. Is this the reminder you want to delete?"
+    4. **Error Handling**: If no match is found, suggest viewing all reminders to help the user identify the correct one.
 
-    5. **Error Handling**: If no match is found, suggest viewing all reminders to help the user identify the correct one.
+    5. **Several Reminders at Once**: When the user adds, changes or deletes more than one reminder in a
+       message ("add milk, eggs and bread"), make ONE call to add_reminders, update_reminders or
+       delete_reminders with all of them, not one call per reminder.
 
-    Remember: Users often refer to reminders casually. Your job is to understand their intent and find the right reminder even with vague references.
-    """,
+    **DUE TIMES:**
+
+    Pass due times as YYYY-MM-DDTHH:MM in the user's local time. Work out relative times such as
+    "tomorrow at 3pm" from the current time above. For questions like "what's due today?" or
+    "anything due this week?", call list_due_reminders with the number of hours to look ahead
+    (until the end of today, 168 for a week) instead of reading every reminder.
+
+    Only call view_reminders when the user asks to see all of their reminders.
+    """
+
+
+def build_instruction(context) -> str:
+    """Fill the instruction with the reminders that match the user's message."""
+    reminders, _ = load_reminders(context.state)
+    message = ""
+    if context.user_content and context.user_content.parts:
+        message = " ".join(part.text or "" for part in context.user_content.parts)
+    matches = index_for_context(context, reminders).search(message, DEFAULT_MATCHES)
+    if not matches:
+        # Nothing matches the message: show the newest reminders instead
+        matches = reminders[-DEFAULT_MATCHES:]
+    due_times = {reminder["id"]: reminder.get("due") for reminder in reminders}
+    lines = "\n    ".join(
+        f"- {match['id']}: {match['text']}"
+        + (f" (due {due_times[match['id']]})" if due_times.get(match["id"]) else "")
+        for match in matches
+    )
+    return (
+        INSTRUCTION.replace("{now}", datetime.now().strftime("%A %Y-%m-%dT%H:%M"))
+        .replace("{user_name}", str(context.state.get("user_name", "")))
+        .replace("{reminder_count}", str(len(reminders)))
+        .replace("{matching_reminders}", lines or "- (none)")
+    )
+
+
+# Create a simple persistent agent
+root_agent = Agent(
+    name="memory_agent",
+    model="gemini-1.5-flash",
+    description="A smart reminder agent with persistent memory",
+    # A callable instruction: only the best matching reminders are included
+    instruction=build_instruction,
     tools=[
         add_reminder,
+        find_reminders,
+        list_due_reminders,
         view_reminders,
         update_reminder,
         delete_reminder,
+        add_reminders,
+        update_reminders,
+        delete_reminders,
         update_user_name,
     ],
 )
@@ -0,0 +1,213 @@
+"""
+Reminder Index
+
+A local search index over a user's reminders, so the agent can resolve "the
+dentist one" without reading every reminder.
+
+The instructions used to inline the whole reminder list and ask the model to
+do partial and fuzzy matching over it, so every prompt grew with the list.
+`ReminderIndex` ranks reminders for a query with BM25 over two kinds of terms:
+
+- Words: exact word matches ("dentist" finds "Dentist appointment")
+- Trigrams: three-letter pieces of each word, weighted lower, so misspellings
+  and other word forms still match ("dentst", "groceries" for "grocery")
+
+The index is maintained incrementally. Adding, changing or removing one
+reminder only touches that reminder's postings, and `sync` compares the
+indexed texts with the reminders in state and re-indexes only what changed.
+
+Reminders are stored in state as {"id": int, "text": str} entries. Lists of
+plain strings from earlier versions are given ids by `load_reminders`.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- Constants ---
+BM25_K1 = 1.2
+BM25_B = 0.75
+TRIGRAM_WEIGHT = 0.3  # A trigram match counts less than a whole-word match
+MIN_SCORE = 0.5  # Weaker matches are not returned
+DEFAULT_MATCHES = 5
+INDEX_CACHE_SIZE = 256  # Sessions whose index is kept in memory
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(words: List[str]) -> List[str]:
+    """Three-letter pieces of each word, padded so word starts and ends count."""
+    grams = []
+    for word in words:
+        padded = f" {word} "
+        grams.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def load_reminders(state) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read the reminders and the next free id from state.
+
+    Plain-text reminders (the format before ids were added) are converted to
+    {"id", "text"} entries. The returned list is a copy; write it back with
+    `store_reminders` after changing it.
+
+    Returns:
+        Tuple of (reminders, next free id)
+    """
+    reminders = []
+    next_id = state.get("next_reminder_id", 1)
+    for reminder in state.get("reminders", []) or []:
+        if isinstance(reminder, dict):
+            reminders.append(dict(reminder))
+            next_id = max(next_id, reminder["id"] + 1)
+        else:
+            reminders.append({"id": None, "text": str(reminder)})
+    for reminder in reminders:
+        if reminder["id"] is None:
+            reminder["id"] = next_id
+            next_id += 1
+    return reminders, next_id
+
+
+def store_reminders(state, reminders: List[Dict[str, Any]], next_id: int) -> None:
+    """Write the reminders and the next free id back to state."""
+    state["reminders"] = reminders
+    state["next_reminder_id"] = next_id
+
+
+class _Field:
+    """BM25 postings for one kind of term (words or trigrams)."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}  # term -> {id: frequency}
+        self.lengths: Dict[int, int] = {}
+        self.total_length = 0
+
+    def add(self, reminder_id: int, terms: List[str]) -> None:
+        for term, count in Counter(terms).items():
+            self.postings.setdefault(term, {})[reminder_id] = count
+        self.lengths[reminder_id] = len(terms)
+        self.total_length += len(terms)
+
+    def remove(self, reminder_id: int, terms: List[str]) -> None:
+        for term in set(terms):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(reminder_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(reminder_id, 0)
+
+    def score(self, terms: List[str], scores: Dict[int, float], weight: float):
+        """Add the BM25 scores of the query terms to `scores`."""
+        count = len(self.lengths)
+        if not count:
+            return
+        average_length = self.total_length / count or 1.0
+        for term in set(terms):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for reminder_id, frequency in posting.items():
+                norm = 1 - BM25_B + BM25_B * self.lengths[reminder_id] / average_length
+                scores[reminder_id] = scores.get(reminder_id, 0.0) + weight * idf * (
+                    frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                )
+
+
+class ReminderIndex:
+    """A word and trigram BM25 index over one session's reminders."""
+
+    def __init__(self):
+        self.texts: Dict[int, str] = {}
+        self._words = _Field()
+        self._trigrams = _Field()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _add(self, reminder_id: int, text: str) -> None:
+        words = _words(text)
+        self.texts[reminder_id] = text
+        self._words.add(reminder_id, words)
+        self._trigrams.add(reminder_id, _trigrams(words))
+
+    def _remove(self, reminder_id: int) -> None:
+        text = self.texts.pop(reminder_id, None)
+        if text is not None:
+            words = _words(text)
+            self._words.remove(reminder_id, words)
+            self._trigrams.remove(reminder_id, _trigrams(words))
+
+    def sync(self, reminders: List[Dict[str, Any]]) -> None:
+        """Bring the index up to date with the reminders in state."""
+        current = {reminder["id"]: reminder["text"] for reminder in reminders}
+        with self._lock:
+            for reminder_id in [i for i in self.texts if i not in current]:
+                self._remove(reminder_id)
+            for reminder_id, text in current.items():
+                if self.texts.get(reminder_id) != text:
+                    self._remove(reminder_id)
+                    self._add(reminder_id, text)
+
+    def search(self, query: str, limit: int = DEFAULT_MATCHES) -> List[Dict[str, Any]]:
+        """
+        Find the reminders that best match a query.
+
+        Returns:
+            List of {"id", "text", "score"} dicts, best match first
+        """
+        words = _words(query)
+        scores: Dict[int, float] = {}
+        with self._lock:
+            self._words.score(words, scores, 1.0)
+            self._trigrams.score(_trigrams(words), scores, TRIGRAM_WEIGHT)
+            best = heapq.nlargest(
+                limit,
+                ((score, i) for i, score in scores.items() if score >= MIN_SCORE),
+            )
+            return [
+                {"id": i, "text": self.texts[i], "score": round(score, 2)}
+                for score, i in best
+            ]
+
+
+_indexes: "OrderedDict[Tuple[str, str, str], ReminderIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def index_for_context(context, reminders: Optional[List[Dict[str, Any]]] = None):
+    """
+    Return the reminder index of the session a tool or instruction runs in.
+
+    Args:
+        context: A ToolContext or ReadonlyContext
+        reminders: The current reminders (loaded from the context's state if
+            not given); the index is synced with them
+
+    Returns:
+        ReminderIndex: The up-to-date index
+    """
+    session = context.session
+    key = (session.app_name, session.user_id, session.id)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ReminderIndex()
+        _indexes.move_to_end(key)
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    if reminders is None:
+        reminders, _ = load_reminders(context.state)
+    index.sync(reminders)
+    return index
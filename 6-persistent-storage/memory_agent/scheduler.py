@@ -0,0 +1,203 @@
+"""
+Reminder Scheduler
+
+Due times for reminders, and the notifications for reminders that come due.
+
+A reminder can have a due time ({"id": 3, "text": "...", "due": "2025-06-01T15:00"}).
+Answering "what's due today?" used to mean giving the model every reminder.
+The scheduler keeps two structures instead:
+
+- One heap of (due time, reminder) for all sessions. The earliest reminder is
+  always at the top, so `pop_due` finds each due reminder in O(log n), however
+  many reminders all users have
+- Per session, the reminders sorted by due time. `list_due` finds the end of
+  the window with a binary search, so it is O(log m + k) for a user with m
+  reminders and k due in the window
+
+Changes are applied with `sync`, which compares the reminders in state with
+the scheduled ones and only reschedules what changed. Heap entries of changed
+or deleted reminders are skipped when they reach the top instead of being
+searched for, and the heap is rebuilt when most of it is such entries.
+"""
+
+import bisect
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+SessionKey = Tuple[str, str, str]  # (app_name, user_id, session_id)
+
+# --- Constants ---
+DUE_FORMAT = "%Y-%m-%dT%H:%M"  # Local time, e.g. 2025-06-01T15:00
+MIN_HEAP_REBUILD = 1024  # Do not rebuild small heaps
+
+
+def parse_due(due: str) -> float:
+    """
+    Parse a due time in ISO format ("2025-06-01T15:00" or "2025-06-01 15:00").
+
+    Raises:
+        ValueError: The text is not an ISO date and time
+    """
+    return datetime.fromisoformat(due.strip()).timestamp()
+
+
+def format_due(timestamp: float) -> str:
+    """Format a timestamp as a due time (local time, minute precision)."""
+    return datetime.fromtimestamp(timestamp).strftime(DUE_FORMAT)
+
+
+class _SessionSchedule:
+    """The due reminders of one session."""
+
+    __slots__ = ("due_by_id", "texts", "ordered", "fired")
+
+    def __init__(self):
+        self.due_by_id: Dict[int, float] = {}
+        self.texts: Dict[int, str] = {}
+        self.ordered: List[Tuple[float, int]] = []  # (due time, id), sorted
+        self.fired: Set[Tuple[int, float]] = set()  # Notified (id, due time)
+
+
+class ReminderScheduler:
+    """Due reminders of all sessions, with O(log n) firing."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, SessionKey, int]] = []
+        self._order = itertools.count()  # Tie-breaker for equal due times
+        self._schedules: Dict[SessionKey, _SessionSchedule] = {}
+        self._live = 0  # Heap entries that are still scheduled
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _unschedule(self, schedule: _SessionSchedule, reminder_id: int) -> None:
+        due = schedule.due_by_id.pop(reminder_id)
+        schedule.texts.pop(reminder_id, None)
+        schedule.ordered.pop(bisect.bisect_left(schedule.ordered, (due, reminder_id)))
+        if (reminder_id, due) in schedule.fired:
+            schedule.fired.discard((reminder_id, due))
+        else:
+            self._live -= 1
+
+    def _schedule(
+        self, key: SessionKey, schedule: _SessionSchedule, reminder_id: int, due: float
+    ) -> None:
+        schedule.due_by_id[reminder_id] = due
+        bisect.insort(schedule.ordered, (due, reminder_id))
+        heapq.heappush(self._heap, (due, next(self._order), key, reminder_id))
+        self._live += 1
+
+    def sync(self, key: SessionKey, reminders: List[Dict[str, Any]]) -> None:
+        """Schedule a session's reminders (those with a valid "due" time)."""
+        wanted: Dict[int, Tuple[float, str]] = {}
+        for reminder in reminders:
+            if reminder.get("due"):
+                try:
+                    wanted[reminder["id"]] = (parse_due(reminder["due"]), reminder["text"])
+                except ValueError:
+                    continue
+        with self._lock:
+            schedule = self._schedules.get(key)
+            if schedule is None:
+                if not wanted:
+                    return
+                schedule = self._schedules[key] = _SessionSchedule()
+            for reminder_id in list(schedule.due_by_id):
+                if wanted.get(reminder_id, (None,))[0] != schedule.due_by_id[reminder_id]:
+                    self._unschedule(schedule, reminder_id)
+            for reminder_id, (due, text) in wanted.items():
+                schedule.texts[reminder_id] = text
+                if reminder_id not in schedule.due_by_id:
+                    self._schedule(key, schedule, reminder_id, due)
+            if not schedule.due_by_id:
+                del self._schedules[key]
+            self._rebuild_if_stale()
+
+    def _rebuild_if_stale(self) -> None:
+        """Drop heap entries of changed reminders once they are the majority."""
+        if len(self._heap) > max(MIN_HEAP_REBUILD, 2 * self._live):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, entry: Tuple[float, int, SessionKey, int]) -> bool:
+        due, _, key, reminder_id = entry
+        schedule = self._schedules.get(key)
+        return (
+            schedule is not None
+            and schedule.due_by_id.get(reminder_id) == due
+            and (reminder_id, due) not in schedule.fired
+        )
+
+    def pop_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Return the reminders that have come due since the last call.
+
+        Each reminder is returned once per due time. It stays scheduled, so
+        `list_due` still shows it as overdue until it is changed or deleted.
+
+        Returns:
+            List of {"app_name", "user_id", "session_id", "id", "text", "due"}
+            dicts, earliest first
+        """
+        now = time.time() if now is None else now
+        fired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if not self._is_live(entry):
+                    continue
+                due, _, key, reminder_id = entry
+                schedule = self._schedules[key]
+                schedule.fired.add((reminder_id, due))
+                self._live -= 1
+                fired.append(
+                    {
+                        "app_name": key[0],
+                        "user_id": key[1],
+                        "session_id": key[2],
+                        "id": reminder_id,
+                        "text": schedule.texts.get(reminder_id, ""),
+                        "due": format_due(due),
+                    }
+                )
+        return fired
+
+    def list_due(
+        self, key: SessionKey, window_seconds: float, now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List a session's reminders due before now + window, including overdue ones.
+
+        Returns:
+            List of {"id", "text", "due", "overdue"} dicts, earliest first
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            schedule = self._schedules.get(key)
+            if schedule is None:
+                return []
+            end = bisect.bisect_right(schedule.ordered, (now + window_seconds, float("inf")))
+            return [
+                {
+                    "id": reminder_id,
+                    "text": schedule.texts.get(reminder_id, ""),
+                    "due": format_due(due),
+                    "overdue": due <= now,
+                }
+                for due, reminder_id in schedule.ordered[:end]
+            ]
+
+
+# One scheduler for all sessions of the process
+scheduler = ReminderScheduler()
+
+
+def session_key(context) -> SessionKey:
+    """The (app_name, user_id, session_id) of a tool or instruction context."""
+    session = context.session
+    return (session.app_name, session.user_id, session.id)
@@ -0,0 +1,28 @@
+"""
+Memory Agent State Schema
+
+The versions of the memory agent's session state, as migrations of a
+StateSchema (see state_schema.py). Add a change by registering the next
+number.
+"""
+
+from typing import Any, Dict
+
+from state_schema import StateSchema
+
+from .reminder_index import load_reminders, store_reminders
+
+memory_agent_schema = StateSchema()
+
+
+@memory_agent_schema.migration(1)
+def _add_default_keys(state: Dict[str, Any]) -> None:
+    """Sessions from the first version may lack the user name or reminders."""
+    state.setdefault("user_name", "")
+    state.setdefault("reminders", [])
+
+
+@memory_agent_schema.migration(2)
+def _number_reminders(state: Dict[str, Any]) -> None:
+    """Turn plain-text reminders into {"id", "text"} entries."""
+    store_reminders(state, *load_reminders(state))
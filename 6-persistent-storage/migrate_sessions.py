@@ -0,0 +1,45 @@
+"""
+Upgrade every session in the database to the current state schema.
+
+Sessions are also migrated lazily when they are read, so running this is
+optional. It is useful before removing an old migration, or to measure how
+many sessions are still at an older version (--dry-run writes nothing).
+
+Usage:
+    python migrate_sessions.py [--db ./my_agent_data.db] [--batch-size 500] [--dry-run]
+"""
+
+import argparse
+import asyncio
+
+from memory_agent.schema import memory_agent_schema
+from sqlite_session_service import TunedSqliteSessionService
+
+
+async def main_async(args):
+    session_service = TunedSqliteSessionService(
+        db_path=args.db, state_schema=memory_agent_schema
+    )
+    try:
+        counts = await session_service.migrate_stored_sessions(
+            args.batch_size, dry_run=args.dry_run
+        )
+    finally:
+        await session_service.close()
+    verb = "Would migrate" if args.dry_run else "Migrated"
+    print(
+        f"{verb} {counts['migrated']} of {counts['checked']} sessions"
+        f" to schema version {memory_agent_schema.version}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", default="./my_agent_data.db", help="Database file")
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Sessions per transaction"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only count outdated sessions"
+    )
+    asyncio.run(main_async(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""
+Session Leases
+
+Advisory per-session locks for several TunedSqliteSessionService processes.
+
+A lock is a row in `session_leases` with an owner and an expiry time. Taking
+it is one INSERT that only succeeds if the row does not exist or has expired,
+so a crashed holder blocks a session for at most `LEASE_SECONDS`. Version
+checks still reject conflicting writes if a lease expires while its holder is
+running.
+"""
+
+import asyncio
+import sqlite3
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Tuple
+
+from sqlite_store import transaction
+
+# --- Constants ---
+LEASE_SECONDS = 60.0  # A session lock expires if its holder does not release it
+LEASE_RETRY_INTERVAL = 0.05  # Seconds between attempts to take a held lock
+
+
+class SessionLeaseMixin:
+    """
+    Per-session locks for TunedSqliteSessionService.
+
+    Uses the service's `_write` helper.
+    """
+
+    @asynccontextmanager
+    async def session_lock(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        timeout: float = 30.0,
+        lease_seconds: float = LEASE_SECONDS,
+    ) -> AsyncIterator[None]:
+        """
+        Hold an advisory lock on a session, shared by all processes.
+
+        Wrap an agent turn in it so two workers never run the same session at
+        the same time. The lock is a lease: if its holder crashes, it expires
+        after `lease_seconds`. Version checks still reject conflicting writes
+        if a lease expires while its holder is running.
+
+        Raises:
+            TimeoutError: Another worker held the lock for `timeout` seconds
+        """
+        key = (app_name, user_id, session_id)
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while not await self._write(self._acquire_lease, key, owner, lease_seconds):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Session {session_id} is locked by another worker.")
+            await asyncio.sleep(LEASE_RETRY_INTERVAL)
+        try:
+            yield
+        finally:
+            await self._write(self._release_lease, key, owner)
+
+    def _acquire_lease(
+        self,
+        connection: sqlite3.Connection,
+        key: Tuple[str, str, str],
+        owner: str,
+        lease_seconds: float,
+    ) -> bool:
+        """Take the lease if it is free or expired."""
+        now = time.time()
+        with transaction(connection):
+            cursor = connection.execute(
+                "INSERT INTO session_leases"
+                " (app_name, user_id, session_id, owner, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (app_name, user_id, session_id) DO UPDATE"
+                " SET owner = excluded.owner, expires_at = excluded.expires_at"
+                " WHERE session_leases.expires_at < ?",
+                (*key, owner, now + lease_seconds, now),
+            )
+        return cursor.rowcount == 1
+
+    def _release_lease(
+        self, connection: sqlite3.Connection, key: Tuple[str, str, str], owner: str
+    ) -> None:
+        with transaction(connection):
+            connection.execute(
+                "DELETE FROM session_leases"
+                " WHERE app_name = ? AND user_id = ? AND session_id = ? AND owner = ?",
+                (*key, owner),
+            )
@@ -0,0 +1,111 @@
+"""
+Session Migrations
+
+State schema migrations for TunedSqliteSessionService (see state_schema.py).
+
+Sessions are migrated in memory when they are read, and the changed keys are
+stored with the session's next event. `migrate_stored_sessions` upgrades every
+stored session at once instead; `migrate_sessions.py` runs it from the command
+line.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Optional, Tuple
+
+from sqlite_store import replay_ops, transaction
+
+
+class SessionMigrationMixin:
+    """
+    State migrations for TunedSqliteSessionService.
+
+    Uses the service's `state_schema`, its `_write` and `_write_pending`
+    helpers and its cached states (`_shadows`).
+    """
+
+    def _migrate(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Migrate a session-scoped state in place, returning the changed keys."""
+        if self.state_schema is None:
+            return {}
+        return self.state_schema.migrate(state)
+
+    async def migrate_stored_sessions(
+        self, batch_size: int = 500, dry_run: bool = False
+    ) -> Dict[str, int]:
+        """
+        Upgrade every stored session to the current state schema.
+
+        Sessions are read and rewritten in batches of `batch_size`, one
+        transaction per batch. A migrated session gets a new snapshot and a
+        new version, so a worker still holding the old session gets a
+        SessionConflictError instead of overwriting the migration.
+
+        Args:
+            batch_size: Sessions per transaction
+            dry_run: Only count the sessions that need migrating
+
+        Returns:
+            Dict[str, int]: The number of sessions checked and migrated (or
+                that would be migrated)
+
+        Raises:
+            ValueError: The service has no state schema
+        """
+        if self.state_schema is None:
+            raise ValueError("No state schema to migrate to.")
+        await self._write_pending()
+        counts = {"checked": 0, "migrated": 0}
+        after: Optional[Tuple[str, str, str]] = ("", "", "")
+        while after is not None:
+            checked, migrated, after = await self._write(
+                self._migrate_batch, after, max(1, batch_size), dry_run
+            )
+            counts["checked"] += checked
+            counts["migrated"] += migrated
+        if not dry_run:
+            # Cached states are from before the migration
+            self._shadows.clear()
+        return counts
+
+    def _migrate_batch(
+        self,
+        connection: sqlite3.Connection,
+        after: Tuple[str, str, str],
+        limit: int,
+        dry_run: bool,
+    ) -> Tuple[int, int, Optional[Tuple[str, str, str]]]:
+        """
+        Migrate the sessions after a key, in key order.
+
+        Returns:
+            Tuple of (sessions checked, sessions migrated, key to continue
+            after or None when done)
+        """
+        migrated = 0
+        with transaction(connection):
+            rows = connection.execute(
+                "SELECT app_name, user_id, id, state FROM session_store"
+                " WHERE (app_name, user_id, id) > (?, ?, ?)"
+                " ORDER BY app_name, user_id, id LIMIT ?",
+                (*after, limit),
+            ).fetchall()
+            for *key, snapshot in rows:
+                state, _ = replay_ops(connection, tuple(key), snapshot)
+                if not self._migrate(state):
+                    continue
+                migrated += 1
+                if dry_run:
+                    continue
+                connection.execute(
+                    "UPDATE session_store SET state = ?, version = version + 1"
+                    " WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (json.dumps(state), *key),
+                )
+                connection.execute(
+                    "DELETE FROM session_state_ops"
+                    " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                    key,
+                )
+        last = tuple(rows[-1][:3]) if len(rows) == limit else None
+        return len(rows), migrated, last
@@ -0,0 +1,622 @@
+"""
+Session Transfer
+
+Bulk export and import of TunedSqliteSessionService sessions as JSON Lines.
+
+An export file holds one JSON record per line: the app and user states first,
+then each session followed by its events, oldest first:
+
+    {"type": "app_state", "app_name": ..., "state": {...}}
+    {"type": "user_state", "app_name": ..., "user_id": ..., "state": {...}}
+    {"type": "session", "app_name": ..., "user_id": ..., "id": ..., "state": {...},
+     "create_time": ..., "update_time": ...}
+    {"type": "event", "id": ..., "invocation_id": ..., "timestamp": ..., "event": {...}}
+
+Both directions stream: sessions are read in chunks and events are copied one
+row at a time, so memory use does not grow with the size of the database. A
+path ending in ".gz" is gzip-compressed. `transfer_sessions.py` is the command
+line front end.
+
+`export_service_sessions` and `import_service_sessions` write and read the same
+format through the `BaseSessionService` API only, so sessions of any service
+(for example ADK's `DatabaseSessionService`) can be backed up, restored, or
+moved into this service. They read one session at a time instead of streaming.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import IO, Any, Dict, List, Optional, Set, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, State
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from sqlite_store import replay_ops, split_state_delta, transaction, where_clause
+
+
+def _open_transfer_file(path: str, mode: str) -> IO[str]:
+    """Open an export file for text reading or writing, gzipped if it ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class SessionTransferMixin:
+    """
+    Export and import for TunedSqliteSessionService.
+
+    Uses the service's `_read`, `_write` and `_write_pending` helpers, its
+    cached states (`_shadows`) and `_archive_old_events`.
+    """
+
+    async def export_sessions(
+        self,
+        path: str,
+        *,
+        app_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        chunk_size: int = 500,
+    ) -> Dict[str, int]:
+        """
+        Write sessions and their events to a JSON Lines file.
+
+        The file holds one record per line: the matching app and user states,
+        then each session followed by its events, oldest first. Sessions are
+        read `chunk_size` at a time in key order and events are streamed from
+        the database to the file, so memory use does not grow with the number
+        of sessions or events. A path ending in ".gz" is gzip-compressed.
+
+        Args:
+            path: The file to write
+            app_name: Only export this app
+            user_id: Only export this user
+            updated_after: Only export sessions updated at or after this time
+                (seconds since the epoch)
+            updated_before: Only export sessions updated before this time
+            chunk_size: Sessions read per query
+
+        Returns:
+            Dict[str, int]: The number of records written, by type
+        """
+        return await self._read(
+            self._export_to_file,
+            path,
+            app_name,
+            user_id,
+            updated_after,
+            updated_before,
+            max(1, chunk_size),
+        )
+
+    def _export_to_file(
+        self,
+        connection: sqlite3.Connection,
+        path: str,
+        app_name: Optional[str],
+        user_id: Optional[str],
+        updated_after: Optional[float],
+        updated_before: Optional[float],
+        chunk_size: int,
+    ) -> Dict[str, int]:
+        counts = {"app_state": 0, "user_state": 0, "session": 0, "event": 0}
+        filters: List[str] = []
+        params: List[Any] = []
+        if app_name is not None:
+            filters.append("app_name = ?")
+            params.append(app_name)
+        app_filters, app_params = filters[:], params[:]
+        if user_id is not None:
+            filters.append("user_id = ?")
+            params.append(user_id)
+        user_filters, user_params = filters[:], params[:]
+        if updated_after is not None:
+            filters.append("update_time >= ?")
+            params.append(updated_after)
+        if updated_before is not None:
+            filters.append("update_time < ?")
+            params.append(updated_before)
+
+        with _open_transfer_file(path, "w") as file:
+
+            def write(record: Dict[str, Any]) -> None:
+                file.write(json.dumps(record) + "\n")
+                counts[record["type"]] += 1
+
+            for row_app, state in connection.execute(
+                "SELECT app_name, state FROM app_state" + where_clause(app_filters),
+                app_params,
+            ):
+                write(
+                    {
+                        "type": "app_state",
+                        "app_name": row_app,
+                        "state": json.loads(state),
+                    }
+                )
+            for row_app, row_user, state in connection.execute(
+                "SELECT app_name, user_id, state FROM user_state"
+                + where_clause(user_filters),
+                user_params,
+            ):
+                write(
+                    {
+                        "type": "user_state",
+                        "app_name": row_app,
+                        "user_id": row_user,
+                        "state": json.loads(state),
+                    }
+                )
+
+            # Keyset pagination over the primary key, one chunk per query
+            after = ("", "", "")
+            while True:
+                rows = connection.execute(
+                    "SELECT app_name, user_id, id, state, create_time, update_time"
+                    " FROM session_store"
+                    + where_clause(filters + ["(app_name, user_id, id) > (?, ?, ?)"])
+                    + " ORDER BY app_name, user_id, id LIMIT ?",
+                    (*params, *after, chunk_size),
+                ).fetchall()
+                for *key, snapshot, create_time, update_time in rows:
+                    state, _ = replay_ops(connection, tuple(key), snapshot)
+                    write(
+                        {
+                            "type": "session",
+                            "app_name": key[0],
+                            "user_id": key[1],
+                            "id": key[2],
+                            "state": state,
+                            "create_time": create_time,
+                            "update_time": update_time,
+                        }
+                    )
+                    # Archived events are older than the hot ones
+                    for table in ("session_events_archive", "session_events"):
+                        event_rows = connection.execute(
+                            f"SELECT id, invocation_id, timestamp, event FROM {table}"
+                            " WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                            " ORDER BY seq",
+                            key,
+                        )
+                        for event_id, invocation_id, timestamp, event in event_rows:
+                            # The stored event JSON is copied without decoding it
+                            head = json.dumps(
+                                {
+                                    "type": "event",
+                                    "id": event_id,
+                                    "invocation_id": invocation_id,
+                                    "timestamp": timestamp,
+                                }
+                            )
+                            file.write(f'{head[:-1]}, "event": {event}}}\n')
+                            counts["event"] += 1
+                if len(rows) < chunk_size:
+                    return counts
+                after = tuple(rows[-1][:3])
+
+    async def import_sessions(
+        self, path: str, *, replace: bool = False, chunk_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Read sessions and their events from a file written by `export_sessions`.
+
+        Records are written in transactions of `chunk_size` rows, so memory use
+        only grows by the keys of the imported sessions, not with their events.
+        A session that appears more than once in the file is imported the
+        first time only. Other writes wait until the import is done. If the
+        file is invalid, the chunks before the invalid line stay imported.
+
+        Args:
+            path: The file to read (gzip-compressed if it ends in ".gz")
+            replace: Replace sessions and app/user states that already exist
+                (by default they are kept and the imported ones are skipped)
+            chunk_size: Rows written per transaction
+
+        Returns:
+            Dict[str, int]: The number of records imported, by type, and the
+                number of sessions skipped because they exist or are repeated
+                (existing app and user states are counted, but only replaced
+                with `replace`)
+
+        Raises:
+            ValueError: A line is not a record written by `export_sessions`
+        """
+        await self._write_pending()
+        counts = await self._write(
+            self._import_from_file, path, replace, max(1, chunk_size)
+        )
+        # Cached states may belong to replaced sessions
+        self._shadows.clear()
+        return counts
+
+    def _import_from_file(
+        self, connection: sqlite3.Connection, path: str, replace: bool, chunk_size: int
+    ) -> Dict[str, int]:
+        counts = {
+            "app_state": 0,
+            "user_state": 0,
+            "session": 0,
+            "event": 0,
+            "skipped_sessions": 0,
+        }
+        insert = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        app_states: List[tuple] = []
+        user_states: List[tuple] = []
+        sessions: List[tuple] = []
+        events: List[tuple] = []
+        finished: List[Tuple[str, str, str]] = []  # Sessions with all events read
+        now = time.time()
+
+        def write_chunk() -> None:
+            with transaction(connection):
+                connection.executemany(
+                    f"{insert} INTO app_state (app_name, state, update_time)"
+                    " VALUES (?, ?, ?)",
+                    app_states,
+                )
+                connection.executemany(
+                    f"{insert} INTO user_state (app_name, user_id, state, update_time)"
+                    " VALUES (?, ?, ?, ?)",
+                    user_states,
+                )
+                for table in (
+                    "session_events",
+                    "session_events_archive",
+                    "session_state_ops",
+                ):
+                    # Replaced sessions lose their old events and operations
+                    connection.executemany(
+                        f"DELETE FROM {table}"
+                        " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                        [row[:3] for row in sessions],
+                    )
+                # A replaced session gets a new version, so workers holding
+                # the old one get a conflict instead of overwriting it
+                connection.executemany(
+                    "INSERT INTO session_store"
+                    " (app_name, user_id, id, state, create_time, update_time)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (app_name, user_id, id) DO UPDATE"
+                    " SET state = excluded.state, create_time = excluded.create_time,"
+                    " update_time = excluded.update_time, version = version + 1",
+                    sessions,
+                )
+                connection.executemany(
+                    "INSERT INTO session_events (app_name, user_id, session_id, id,"
+                    " invocation_id, timestamp, event) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    events,
+                )
+                if self.hot_events is not None:
+                    for key in finished:
+                        self._archive_old_events(connection, key)
+            for rows in (app_states, user_states, sessions, events, finished):
+                rows.clear()
+
+        current: Optional[Tuple[str, str, str]] = None  # None: skip its events
+        seen: set = set()  # Sessions read so far; a repeated record is skipped
+        with _open_transfer_file(path, "r") as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    record_type = record["type"]
+                    if record_type == "event":
+                        if current is not None:
+                            events.append(
+                                (
+                                    *current,
+                                    record["id"],
+                                    record["invocation_id"],
+                                    record["timestamp"],
+                                    json.dumps(record["event"]),
+                                )
+                            )
+                            counts["event"] += 1
+                    elif record_type == "session":
+                        if current is not None:
+                            finished.append(current)
+                        current = (record["app_name"], record["user_id"], record["id"])
+                        if current in seen or (
+                            not replace
+                            and connection.execute(
+                                "SELECT 1 FROM session_store"
+                                " WHERE app_name = ? AND user_id = ? AND id = ?",
+                                current,
+                            ).fetchone()
+                        ):
+                            current = None
+                            counts["skipped_sessions"] += 1
+                            continue
+                        seen.add(current)
+                        sessions.append(
+                            (
+                                *current,
+                                json.dumps(record["state"]),
+                                record["create_time"],
+                                record["update_time"],
+                            )
+                        )
+                        counts["session"] += 1
+                    elif record_type == "app_state":
+                        app_states.append(
+                            (record["app_name"], json.dumps(record["state"]), now)
+                        )
+                        counts["app_state"] += 1
+                    elif record_type == "user_state":
+                        user_states.append(
+                            (
+                                record["app_name"],
+                                record["user_id"],
+                                json.dumps(record["state"]),
+                                now,
+                            )
+                        )
+                        counts["user_state"] += 1
+                    else:
+                        raise ValueError(f"unknown record type {record_type!r}")
+                except (KeyError, TypeError, ValueError) as error:
+                    raise ValueError(
+                        f"{path}, line {line_number}: not an exported record ({error})"
+                    ) from None
+                pending = len(app_states) + len(user_states) + len(sessions) + len(events)
+                if pending >= chunk_size:
+                    write_chunk()
+        if current is not None:
+            finished.append(current)
+        write_chunk()
+        return counts
+
+    async def import_from_service(
+        self, source: BaseSessionService, *, app_name: str, name: str
+    ) -> Optional[Dict[str, int]]:
+        """
+        Copy an app's sessions from another session service, once.
+
+        The sessions are exported through the source's API to a temporary file
+        (see `export_service_sessions`) and imported with `import_sessions`;
+        sessions that already exist here are kept. The import is recorded under
+        `name`, so later calls with the same name do nothing.
+
+        Args:
+            source: The service to copy from
+            app_name: The app whose sessions are copied
+            name: Identifies the source, e.g. its database URL
+
+        Returns:
+            Dict[str, int]: The import counts, or None if `name` was already
+                imported
+        """
+
+        def select_import(connection: sqlite3.Connection) -> bool:
+            return bool(
+                connection.execute(
+                    "SELECT 1 FROM service_imports WHERE name = ?", (name,)
+                ).fetchone()
+            )
+
+        def record_import(connection: sqlite3.Connection) -> None:
+            with transaction(connection):
+                connection.execute(
+                    "INSERT OR REPLACE INTO service_imports (name, imported_at)"
+                    " VALUES (?, ?)",
+                    (name, time.time()),
+                )
+
+        if await self._read(select_import):
+            return None
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sessions.jsonl")
+            await export_service_sessions(source, path, app_name=app_name)
+            counts = await self.import_sessions(path)
+        await self._write(record_import)
+        return counts
+
+
+async def export_service_sessions(
+    session_service: BaseSessionService,
+    path: str,
+    *,
+    app_name: str,
+    user_id: Optional[str] = None,
+    updated_after: Optional[float] = None,
+    updated_before: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Write the sessions of any session service to a JSON Lines file.
+
+    Sessions are listed with `list_sessions` and read one at a time with
+    `get_session`, so this works for every `BaseSessionService`. The file has
+    the format `export_sessions` writes: the "app:" and "user:" keys of each
+    session's state become app and user state records (written before the
+    first session of that app or user), and its creation time is its last
+    update time, which the API does not expose. Services whose `get_session`
+    returns only recent events (like TunedSqliteSessionService) should use
+    their own export.
+
+    Args:
+        session_service: The service to read from
+        path: The file to write (gzip-compressed if it ends in ".gz")
+        app_name: The app whose sessions are exported
+        user_id: Only export this user
+        updated_after: Only export sessions updated at or after this time
+            (seconds since the epoch)
+        updated_before: Only export sessions updated before this time
+
+    Returns:
+        Dict[str, int]: The number of records written, by type
+    """
+    counts = {"app_state": 0, "user_state": 0, "session": 0, "event": 0}
+    listed = await session_service.list_sessions(app_name=app_name, user_id=user_id)
+    users_written: Set[str] = set()
+    with _open_transfer_file(path, "w") as file:
+
+        def write(record: Dict[str, Any]) -> None:
+            file.write(json.dumps(record) + "\n")
+            counts[record["type"]] += 1
+
+        for listed_session in listed.sessions:
+            update_time = listed_session.last_update_time
+            if updated_after is not None and update_time < updated_after:
+                continue
+            if updated_before is not None and update_time >= updated_before:
+                continue
+            session = await session_service.get_session(
+                app_name=app_name,
+                user_id=listed_session.user_id,
+                session_id=listed_session.id,
+            )
+            if session is None:
+                continue  # Deleted since it was listed
+            app_state, user_state, session_state = split_state_delta(session.state)
+            if not counts["session"]:
+                write({"type": "app_state", "app_name": app_name, "state": app_state})
+            if session.user_id not in users_written:
+                users_written.add(session.user_id)
+                write(
+                    {
+                        "type": "user_state",
+                        "app_name": app_name,
+                        "user_id": session.user_id,
+                        "state": user_state,
+                    }
+                )
+            write(
+                {
+                    "type": "session",
+                    "app_name": app_name,
+                    "user_id": session.user_id,
+                    "id": session.id,
+                    "state": session_state,
+                    "create_time": session.last_update_time,
+                    "update_time": session.last_update_time,
+                }
+            )
+            for event in session.events:
+                write(
+                    {
+                        "type": "event",
+                        "id": event.id,
+                        "invocation_id": event.invocation_id,
+                        "timestamp": event.timestamp,
+                        "event": event.model_dump(mode="json", exclude_none=True),
+                    }
+                )
+    return counts
+
+
+async def import_service_sessions(
+    session_service: BaseSessionService, path: str, *, replace: bool = False
+) -> Dict[str, int]:
+    """
+    Read sessions into any session service from an exported JSON Lines file.
+
+    Each session is created with `create_session` and its events are added
+    with `append_event`. The session is created with its exported state, which
+    already includes the changes of its events, so the events are stored
+    without their state deltas. App and user states are stored with the first
+    imported session of that app or user; the API cannot store them without a
+    session.
+
+    Args:
+        session_service: The service to write to
+        path: The file to read (gzip-compressed if it ends in ".gz")
+        replace: Delete and re-create sessions that already exist (by default
+            they are kept and the imported ones are skipped)
+
+    Returns:
+        Dict[str, int]: The number of records imported, by type, and the
+            number of sessions skipped because they exist or are repeated
+
+    Raises:
+        ValueError: A line is not an exported record
+    """
+    counts = {
+        "app_state": 0,
+        "user_state": 0,
+        "session": 0,
+        "event": 0,
+        "skipped_sessions": 0,
+    }
+    # Prefixed app and user states not stored with a session yet
+    app_states: Dict[str, Dict[str, Any]] = {}
+    user_states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    current = None  # The session being imported (None: skip its events)
+    seen: Set[Tuple[str, str, str]] = set()
+    with _open_transfer_file(path, "r") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            # Only parsing errors are reported as invalid lines; errors of the
+            # session service are raised as they are
+            try:
+                record = json.loads(line)
+                record_type = record["type"]
+                if record_type == "event":
+                    event = Event.model_validate(record["event"])
+                elif record_type == "session":
+                    key = (record["app_name"], record["user_id"], record["id"])
+                    state = dict(record["state"])
+                elif record_type == "app_state":
+                    app_states[record["app_name"]] = {
+                        State.APP_PREFIX + name: value
+                        for name, value in record["state"].items()
+                    }
+                    counts["app_state"] += 1
+                elif record_type == "user_state":
+                    user_states[(record["app_name"], record["user_id"])] = {
+                        State.USER_PREFIX + name: value
+                        for name, value in record["state"].items()
+                    }
+                    counts["user_state"] += 1
+                else:
+                    raise ValueError(f"unknown record type {record_type!r}")
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(
+                    f"{path}, line {line_number}: not an exported record ({error})"
+                ) from None
+
+            if record_type == "event" and current is not None:
+                if event.actions.state_delta:
+                    event.actions = event.actions.model_copy(
+                        update={"state_delta": {}}
+                    )
+                await session_service.append_event(current, event)
+                counts["event"] += 1
+            elif record_type == "session":
+                current = None
+                if key in seen:
+                    counts["skipped_sessions"] += 1
+                    continue
+                seen.add(key)
+                existing = await session_service.get_session(
+                    app_name=key[0],
+                    user_id=key[1],
+                    session_id=key[2],
+                    config=GetSessionConfig(num_recent_events=1),
+                )
+                if existing is not None:
+                    if not replace:
+                        counts["skipped_sessions"] += 1
+                        continue
+                    await session_service.delete_session(
+                        app_name=key[0], user_id=key[1], session_id=key[2]
+                    )
+                current = await session_service.create_session(
+                    app_name=key[0],
+                    user_id=key[1],
+                    session_id=key[2],
+                    state={
+                        **app_states.pop(key[0], {}),
+                        **user_states.pop(key[:2], {}),
+                        **state,
+                    },
+                )
+                counts["session"] += 1
+    return counts
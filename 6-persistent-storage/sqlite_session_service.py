@@ -0,0 +1,868 @@
+"""
+Tuned SQLite Session Service
+
+A session service for SQLite databases that is tuned for many small writes.
+
+`DatabaseSessionService` opens a SQLAlchemy session per call and commits every
+event in its own rollback-journal transaction, so each agent turn pays for
+several fsyncs. This service keeps the same session/state model but:
+
+- runs SQLite in WAL mode with `synchronous=NORMAL`, a larger page cache and
+  memory-mapped reads, so readers never block the writer and a commit only
+  appends to the write-ahead log
+- keeps a small pool of reader connections and one writer connection, and runs
+  all database work in worker threads so the event loop is never blocked
+- batches event writes (group commit): `append_event` updates the in-memory
+  session immediately and queues the event; queued events are written in one
+  transaction when `batch_size` events are waiting, `commit_interval` seconds
+  after the first one was queued, or before any read of the database
+
+With batching, a process crash can lose the events of the last
+`commit_interval` seconds. Set `batch_size=1` to commit every event.
+
+Session-scoped state is stored as a snapshot plus a log of fine-grained
+operations (see state_ops.py). Tools assign whole lists back to the state, so
+each new value is compared with the previous one and only the change (for
+example "append one reminder") is written. Keys stored this way are left out
+of the stored event's state delta. The current state is rebuilt on read by
+replaying the log onto the snapshot, and every `compact_every` operation rows
+the log is folded into a new snapshot.
+
+Events are split into a hot and a cold table (see event_archive.py): only the
+newest `hot_events` events of a session stay hot, and `get_session` without a
+config returns the session's state and its hot events only. Older events are
+read with `list_events_page`, or with `GetSessionConfig(num_recent_events=N)`
+or `after_timestamp`, which continue into the archive when needed.
+
+Several processes can share one database. Every session row has a version
+that each written event increases, and every Session this service returns
+remembers the version it was read at. An event is only written if the stored
+version still matches (compare-and-swap); otherwise another process changed
+the session first and `SessionConflictError` is raised instead of silently
+losing either write. Use `shared=True` so each event is committed (and checked)
+before `append_event` returns, and `session_lock` (see session_leases.py) to
+keep two workers from running the same session at the same time.
+
+The tables and connection helpers are in sqlite_store.py. Bulk export and
+import (session_transfer.py) and state schema migrations
+(session_migrations.py) are mixed into the service from their own modules.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+from event_archive import EventArchiveMixin
+from session_leases import SessionLeaseMixin
+from session_migrations import SessionMigrationMixin
+from session_transfer import SessionTransferMixin
+from sqlite_store import (
+    SCHEMA,
+    ConnectionPool,
+    SessionConflictError,
+    merge_state,
+    replay_ops,
+    split_state_delta,
+    transaction,
+)
+from state_ops import apply_ops, diff_state
+from state_schema import StateSchema
+
+logger = logging.getLogger(__name__)
+
+# --- Constants ---
+FLUSH_RETRY_MAX_INTERVAL = 5.0  # Longest wait before retrying a failed write
+
+
+def _migrate_schema(connection: sqlite3.Connection) -> None:
+    """Add columns that databases created by earlier versions are missing."""
+    with transaction(connection):
+        columns = connection.execute("PRAGMA table_info(session_store)").fetchall()
+        if "version" not in {column[1] for column in columns}:
+            connection.execute(
+                "ALTER TABLE session_store"
+                " ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+
+
+def _load_state(connection: sqlite3.Connection, sql: str, params: tuple) -> Dict:
+    """Read one JSON state column, or an empty dict if the row does not exist."""
+    row = connection.execute(sql, params).fetchone()
+    return json.loads(row[0]) if row else {}
+
+
+class _ShadowState:
+    """A session's stored state including queued operations, used for diffing."""
+
+    __slots__ = ("state", "op_rows", "version")
+
+    def __init__(self, state: Dict[str, Any], op_rows: int = 0, version: int = 0):
+        self.state = state
+        self.op_rows = op_rows  # Operation rows since the last snapshot
+        self.version = version  # Session version the state belongs to
+
+
+class TunedSqliteSessionService(
+    EventArchiveMixin,
+    SessionTransferMixin,
+    SessionMigrationMixin,
+    SessionLeaseMixin,
+    BaseSessionService,
+):
+    """
+    A SQLite session service with WAL, pooled connections and group commit.
+
+    Args:
+        db_path: Path of the SQLite database file (created if needed)
+        pool_size: Number of idle reader connections to keep open
+        batch_size: Write queued events once this many are waiting
+        commit_interval: Write queued events at most this many seconds after
+            the first one was queued
+        compact_every: Fold a session's operation log into its snapshot once
+            it has this many rows
+        shadow_cache_size: Number of sessions whose state is kept in memory
+            for computing operations
+        hot_events: Events per session kept in the hot table and returned by
+            `get_session` without a config (None keeps every event hot)
+        shared: Set when several processes use the database. Every event is
+            committed before `append_event` returns, so version conflicts
+            are raised to the caller (batch_size is ignored)
+        state_schema: Migrations applied to session state when sessions are
+            read or created (None to use the stored state as it is)
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./my_agent_data.db",
+        pool_size: int = 4,
+        batch_size: int = 64,
+        commit_interval: float = 0.05,
+        compact_every: int = 100,
+        shadow_cache_size: int = 1024,
+        hot_events: Optional[int] = 200,
+        shared: bool = False,
+        state_schema: Optional[StateSchema] = None,
+    ):
+        if db_path.startswith("sqlite:///"):
+            db_path = db_path[len("sqlite:///") :]
+        self.shared = shared
+        self.state_schema = state_schema
+        self.batch_size = 1 if shared else max(1, batch_size)
+        self.commit_interval = commit_interval
+        self.compact_every = max(1, compact_every)
+        self.shadow_cache_size = max(1, shadow_cache_size)
+        self.hot_events = None if hot_events is None else max(1, hot_events)
+        self._readers = ConnectionPool(db_path, pool_size)
+        self._writer = self._readers.open()
+        self._writer.executescript(SCHEMA)
+        _migrate_schema(self._writer)
+        self._write_lock = asyncio.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Write conflicts not reported yet, raised by the session's next
+        # append_event or by the next flush
+        self._conflicts: Dict[Tuple[str, str, str], SessionConflictError] = {}
+        self._shadows: "OrderedDict[Tuple[str, str, str], _ShadowState]" = (
+            OrderedDict()
+        )
+        # Version each returned Session was read at, by id(session)
+        self._session_versions: Dict[int, int] = {}
+        # State keys changed by migrations and not stored yet, by id(session)
+        self._migrations: Dict[int, Dict[str, Any]] = {}
+
+    def _track_version(
+        self,
+        session: Session,
+        version: int,
+        migration: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Remember the version a Session object holds (until it is collected),
+        and the migrated state keys to store with its next event.
+        """
+        token = id(session)
+        if token not in self._session_versions:
+            weakref.finalize(session, self._forget_session, token)
+        self._session_versions[token] = version
+        if migration:
+            self._migrations[token] = migration
+
+    def _forget_session(self, token: int) -> None:
+        self._session_versions.pop(token, None)
+        self._migrations.pop(token, None)
+
+    # --- Writes ---
+
+    async def _run_on_writer(self, function, *args):
+        """
+        Run a function on the writer connection in a worker thread.
+
+        The caller must hold the write lock. A thread cannot be interrupted, so if
+        the caller is cancelled the write still finishes before the lock is freed.
+        """
+        write = asyncio.ensure_future(asyncio.to_thread(function, self._writer, *args))
+        try:
+            return await asyncio.shield(write)
+        except asyncio.CancelledError:
+            await asyncio.wait({write})
+            raise
+
+    async def _write(self, function, *args):
+        """Run a write function on the writer connection, one at a time."""
+        async with self._write_lock:
+            return await self._run_on_writer(function, *args)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        app_delta, user_delta, session_state = split_state_delta(state)
+        self._migrate(session_state)
+        now = time.time()
+        try:
+            app_state, user_state = await self._write(
+                self._insert_session,
+                app_name,
+                user_id,
+                session_id,
+                now,
+                app_delta,
+                user_delta,
+                session_state,
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Session {session_id} already exists.") from None
+        self._remember_shadow(
+            (app_name, user_id, session_id),
+            _ShadowState(json.loads(json.dumps(session_state))),
+        )
+        session = Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=merge_state(app_state, user_state, session_state),
+            last_update_time=now,
+        )
+        self._track_version(session, 0)
+        return session
+
+    def _insert_session(
+        self,
+        connection: sqlite3.Connection,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        now: float,
+        app_delta: Dict[str, Any],
+        user_delta: Dict[str, Any],
+        session_state: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        with transaction(connection):
+            connection.execute(
+                "INSERT INTO session_store"
+                " (app_name, user_id, id, state, create_time, update_time)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, json.dumps(session_state), now, now),
+            )
+            app_state = self._update_app_state(connection, app_name, app_delta, now)
+            user_state = self._update_user_state(
+                connection, app_name, user_id, user_delta, now
+            )
+        return app_state, user_state
+
+    def _update_app_state(
+        self, connection: sqlite3.Connection, app_name: str, delta: Dict, now: float
+    ) -> Dict[str, Any]:
+        """Merge a delta into the stored app state and return the result."""
+        state = _load_state(
+            connection, "SELECT state FROM app_state WHERE app_name = ?", (app_name,)
+        )
+        if delta:
+            state.update(delta)
+            connection.execute(
+                "INSERT INTO app_state (app_name, state, update_time) VALUES (?, ?, ?)"
+                " ON CONFLICT (app_name) DO UPDATE"
+                " SET state = excluded.state, update_time = excluded.update_time",
+                (app_name, json.dumps(state), now),
+            )
+        return state
+
+    def _update_user_state(
+        self,
+        connection: sqlite3.Connection,
+        app_name: str,
+        user_id: str,
+        delta: Dict,
+        now: float,
+    ) -> Dict[str, Any]:
+        """Merge a delta into the stored user state and return the result."""
+        state = _load_state(
+            connection,
+            "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        )
+        if delta:
+            state.update(delta)
+            connection.execute(
+                "INSERT INTO user_state (app_name, user_id, state, update_time)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (app_name, user_id) DO UPDATE"
+                " SET state = excluded.state, update_time = excluded.update_time",
+                (app_name, user_id, json.dumps(state), now),
+            )
+        return state
+
+    def _remember_shadow(self, key: Tuple[str, str, str], shadow: _ShadowState):
+        """Cache a session's shadow state, evicting the least recently used."""
+        self._shadows[key] = shadow
+        self._shadows.move_to_end(key)
+        while len(self._shadows) > self.shadow_cache_size:
+            self._shadows.popitem(last=False)
+
+    async def _get_shadow(
+        self, key: Tuple[str, str, str], version: Optional[int] = None
+    ) -> _ShadowState:
+        """
+        Return a session's shadow state, loading it from the database if needed.
+
+        A cached shadow of another version than the caller's session (another
+        process wrote in between) is reloaded.
+        """
+        shadow = self._shadows.get(key)
+        if shadow is not None and (version is None or shadow.version == version):
+            self._shadows.move_to_end(key)
+            return shadow
+
+        def load(connection: sqlite3.Connection) -> _ShadowState:
+            row = connection.execute(
+                "SELECT state, version FROM session_store"
+                " WHERE app_name = ? AND user_id = ? AND id = ?",
+                key,
+            ).fetchone()
+            state, op_rows = replay_ops(connection, key, row[0] if row else "{}")
+            return _ShadowState(state, op_rows, row[1] if row else 0)
+
+        # Queued operations of an evicted session are written before reloading
+        shadow = await self._read(load)
+        self._remember_shadow(key, shadow)
+        return shadow
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        # An earlier event of this session was rejected in a background write
+        self._raise_conflict(key)
+
+        # Updates the in-memory session (and drops temp: keys from the delta)
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+        app_delta, user_delta, session_delta = split_state_delta(
+            event.actions.state_delta if event.actions else None
+        )
+        # Store the keys migrated when the session was read with this event
+        migration = self._migrations.pop(id(session), None)
+        if migration:
+            session_delta = {**migration, **session_delta}
+        # The version this session object was read at (None if unknown)
+        expected_version = self._session_versions.get(id(session))
+        if expected_version is not None:
+            self._session_versions[id(session)] = expected_version + 1
+
+        ops_json = None
+        compact = False
+        stored_event = event
+        shadow = self._shadows.get(key)
+        if session_delta:
+            shadow = await self._get_shadow(key, expected_version)
+            ops = diff_state(shadow.state, session_delta)
+            if ops:
+                # Serialize now: tools keep mutating the lists they put in state
+                ops_json = json.dumps(ops)
+                apply_ops(shadow.state, json.loads(ops_json))
+                shadow.op_rows += 1
+                if shadow.op_rows >= self.compact_every:
+                    compact = True
+                    shadow.op_rows = 0
+            # Values stored as fine-grained operations (or unchanged) are left
+            # out of the stored event, so its size does not grow with the state
+            event_delta = event.actions.state_delta if event.actions else {}
+            whole_values = {op[1] for op in ops if op[0] == "set"}
+            kept_delta = {
+                name: value
+                for name, value in event_delta.items()
+                if name not in session_delta or name in whole_values
+            }
+            if len(kept_delta) < len(event_delta):
+                stored_event = event.model_copy(
+                    update={
+                        "actions": event.actions.model_copy(
+                            update={"state_delta": kept_delta}
+                        )
+                    }
+                )
+        if shadow is not None:
+            shadow.version += 1
+
+        self._pending.append(
+            {
+                "key": key,
+                "expected_version": expected_version,
+                "id": event.id,
+                "invocation_id": event.invocation_id,
+                "timestamp": event.timestamp,
+                "event": stored_event.model_dump_json(exclude_none=True),
+                "ops": ops_json,
+                "compact": compact,
+                "app_delta": app_delta,
+                "user_delta": user_delta,
+            }
+        )
+        if len(self._pending) >= self.batch_size:
+            await self._write_pending()
+            self._raise_conflict(key)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+        return event
+
+    async def _flush_after_interval(self, delay: Optional[float] = None) -> None:
+        """
+        Write the events queued during the commit interval.
+
+        A failed write stays queued and is retried after a growing delay.
+        Conflicts are kept for the affected sessions' callers.
+        """
+        delay = self.commit_interval if delay is None else delay
+        try:
+            await asyncio.sleep(delay)
+            self._flush_task = None
+            await self._write_pending()
+        except asyncio.CancelledError:
+            pass
+        except sqlite3.Error:
+            logger.exception("Writing queued session events failed; will retry")
+            if self._flush_task is None:
+                retry_delay = min(max(delay, 0.01) * 2, FLUSH_RETRY_MAX_INTERVAL)
+                self._flush_task = asyncio.create_task(
+                    self._flush_after_interval(retry_delay)
+                )
+
+    async def flush(self) -> None:
+        """
+        Write all queued events and state changes in one transaction.
+
+        Raises:
+            SessionConflictError: Events of some sessions were not written
+                (now or in an earlier background write) because the session
+                was changed by another writer; the rest were written
+            sqlite3.Error: The write failed; the events stay queued
+        """
+        await self._write_pending()
+        self._raise_conflict()
+
+    async def _write_pending(self) -> None:
+        """Write the queued events, recording conflicts instead of raising them."""
+        if not self._pending:
+            return
+        async with self._write_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                conflicts = await self._run_on_writer(self._write_batch, batch)
+            except sqlite3.Error:
+                # Keep the batch queued so the next flush retries it
+                self._pending[:0] = batch
+                raise
+        for key in conflicts:
+            # The cached state includes the rejected changes
+            self._shadows.pop(key, None)
+            self._conflicts[key] = SessionConflictError(
+                f"Session {key[2]} was changed by another writer;"
+                " reload it and try again."
+            )
+
+    def _raise_conflict(self, key: Optional[Tuple[str, str, str]] = None) -> None:
+        """Raise the unreported conflict of one session (or of all sessions)."""
+        if key is not None:
+            error = self._conflicts.pop(key, None)
+            if error is not None:
+                raise error
+        elif self._conflicts:
+            session_ids = ", ".join(sorted(key[2] for key in self._conflicts))
+            self._conflicts.clear()
+            raise SessionConflictError(
+                f"Session {session_ids} was changed by another writer;"
+                " reload it and try again."
+            )
+
+    def _write_batch(
+        self, connection: sqlite3.Connection, batch: List[Dict[str, Any]]
+    ) -> Set[Tuple[str, str, str]]:
+        """
+        Write queued events and state operations, merging shared state deltas.
+
+        Returns:
+            Set of sessions whose events were skipped because the stored
+            version no longer matched
+        """
+        now = time.time()
+        with transaction(connection):
+            # Compare-and-swap: each queued event must expect the stored version
+            # plus the events of its session written before it in this batch.
+            # Once one is rejected, the later events of that session are too:
+            # their state operations were computed on top of the rejected one.
+            versions: Dict[Tuple[str, str, str], Optional[int]] = {}
+            conflicts = set()
+            accepted = []
+            for item in batch:
+                key = item["key"]
+                if key in conflicts:
+                    continue
+                if key not in versions:
+                    row = connection.execute(
+                        "SELECT version FROM session_store"
+                        " WHERE app_name = ? AND user_id = ? AND id = ?",
+                        key,
+                    ).fetchone()
+                    versions[key] = row[0] if row else None
+                version = item["expected_version"]
+                if version is not None and versions[key] != version:
+                    conflicts.add(key)
+                    continue
+                if versions[key] is not None:
+                    versions[key] += 1
+                accepted.append(item)
+            batch = accepted
+
+            update_times: Dict[Tuple[str, str, str], float] = {}
+            event_counts: Dict[Tuple[str, str, str], int] = {}
+            app_deltas: Dict[str, Dict[str, Any]] = {}
+            user_deltas: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for item in batch:
+                key = item["key"]
+                update_times[key] = max(update_times.get(key, 0.0), item["timestamp"])
+                event_counts[key] = event_counts.get(key, 0) + 1
+                if item["app_delta"]:
+                    app_deltas.setdefault(key[0], {}).update(item["app_delta"])
+                if item["user_delta"]:
+                    user_deltas.setdefault(key[:2], {}).update(item["user_delta"])
+
+            connection.executemany(
+                "INSERT INTO session_events (app_name, user_id, session_id, id,"
+                " invocation_id, timestamp, event) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (*item["key"], item["id"], item["invocation_id"],
+                     item["timestamp"], item["event"])
+                    for item in batch
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO session_state_ops (app_name, user_id, session_id, ops)"
+                " VALUES (?, ?, ?, ?)",
+                [(*item["key"], item["ops"]) for item in batch if item["ops"]],
+            )
+            connection.executemany(
+                "UPDATE session_store SET update_time = ?, version = version + ?"
+                " WHERE app_name = ? AND user_id = ? AND id = ?",
+                [
+                    (update_time, event_counts[key], *key)
+                    for key, update_time in update_times.items()
+                ],
+            )
+            for key in {item["key"] for item in batch if item["compact"]}:
+                self._compact(connection, key)
+            if self.hot_events is not None:
+                for key in update_times:
+                    self._archive_old_events(connection, key)
+            for app_name, delta in app_deltas.items():
+                self._update_app_state(connection, app_name, delta, now)
+            for (app_name, user_id), delta in user_deltas.items():
+                self._update_user_state(connection, app_name, user_id, delta, now)
+        return conflicts
+
+    def _compact(self, connection: sqlite3.Connection, key: Tuple[str, str, str]):
+        """Fold a session's operation log into its snapshot (inside a transaction)."""
+        row = connection.execute(
+            "SELECT state FROM session_store WHERE app_name = ? AND user_id = ? AND id = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return
+        state, _ = replay_ops(connection, key, row[0])
+        connection.execute(
+            "UPDATE session_store SET state = ?"
+            " WHERE app_name = ? AND user_id = ? AND id = ?",
+            (json.dumps(state), *key),
+        )
+        connection.execute(
+            "DELETE FROM session_state_ops"
+            " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            key,
+        )
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self._write_pending()
+        await self._write(self._delete_session, app_name, user_id, session_id)
+        self._shadows.pop((app_name, user_id, session_id), None)
+        self._conflicts.pop((app_name, user_id, session_id), None)
+
+    def _delete_session(
+        self, connection: sqlite3.Connection, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        with transaction(connection):
+            for table in (
+                "session_events",
+                "session_events_archive",
+                "session_state_ops",
+                "session_leases",
+            ):
+                connection.execute(
+                    f"DELETE FROM {table}"
+                    " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                    (app_name, user_id, session_id),
+                )
+            connection.execute(
+                "DELETE FROM session_store WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            )
+
+    # --- Reads (queued events are flushed first, so reads see every write) ---
+
+    async def _read(self, function, *args):
+        """Run a read function on a pooled reader connection."""
+        # Conflicts are left for the sessions' writers to handle
+        await self._write_pending()
+
+        def run():
+            with self._readers.connection() as connection:
+                return function(connection, *args)
+
+        return await asyncio.to_thread(run)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        return await self._read(
+            self._select_session, app_name, user_id, session_id, config
+        )
+
+    def _select_session(
+        self,
+        connection: sqlite3.Connection,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig],
+    ) -> Optional[Session]:
+        row = connection.execute(
+            "SELECT state, update_time, version FROM session_store"
+            " WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+
+        # Without a limit or start time only the hot events are read
+        limit = config.num_recent_events if config else None
+        after_timestamp = config.after_timestamp if config else None
+        rows = self._select_event_rows(
+            connection,
+            (app_name, user_id, session_id),
+            limit=limit,
+            after_timestamp=after_timestamp,
+            include_archive=limit is not None or bool(after_timestamp),
+        )
+        events = [
+            Event.model_validate_json(event_json) for _, event_json in reversed(rows)
+        ]
+
+        state, _ = replay_ops(connection, (app_name, user_id, session_id), row[0])
+        migration = self._migrate(state)
+        session = Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=merge_state(
+                *self._select_shared_state(connection, app_name, user_id), state
+            ),
+            events=events,
+            last_update_time=row[1],
+        )
+        self._track_version(session, row[2], migration)
+        return session
+
+    def _select_shared_state(
+        self, connection: sqlite3.Connection, app_name: str, user_id: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Read the app state and the user state."""
+        app_state = _load_state(
+            connection, "SELECT state FROM app_state WHERE app_name = ?", (app_name,)
+        )
+        user_state = _load_state(
+            connection,
+            "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        )
+        return app_state, user_state
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        """List sessions (with state but without events), oldest update first."""
+        return await self._read(self._select_sessions, app_name, user_id)
+
+    def _select_sessions(
+        self, connection: sqlite3.Connection, app_name: str, user_id: Optional[str]
+    ) -> ListSessionsResponse:
+        sql = (
+            "SELECT user_id, id, state, update_time, version FROM session_store"
+            " WHERE app_name = ?"
+        )
+        params: List[Any] = [app_name]
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params.append(user_id)
+        sql += " ORDER BY update_time"
+        rows = connection.execute(sql, params).fetchall()
+        return ListSessionsResponse(
+            sessions=self._sessions_from_rows(connection, app_name, rows)
+        )
+
+    async def get_latest_session(
+        self, *, app_name: str, user_id: str
+    ) -> Optional[Session]:
+        """
+        Return the user's most recently updated session, without its events.
+
+        Uses the (app_name, user_id, update_time) index, so the cost does not
+        depend on how many sessions the user has.
+        """
+        sessions, _ = await self.list_sessions_page(
+            app_name=app_name, user_id=user_id, limit=1
+        )
+        return sessions[0] if sessions else None
+
+    async def list_sessions_page(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Session], Optional[str]]:
+        """
+        List a user's sessions newest first, one page at a time, without events.
+
+        Args:
+            app_name: The application name
+            user_id: The user ID
+            limit: Maximum number of sessions to return
+            cursor: The cursor returned with the previous page (None for the
+                first page)
+
+        Returns:
+            Tuple of (sessions, cursor of the next page or None on the last page)
+        """
+        return await self._read(
+            self._select_sessions_page, app_name, user_id, max(1, limit), cursor
+        )
+
+    def _select_sessions_page(
+        self,
+        connection: sqlite3.Connection,
+        app_name: str,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[Session], Optional[str]]:
+        # Keyset pagination: continue after the (update_time, id) of the last row
+        sql = (
+            "SELECT user_id, id, state, update_time, version FROM session_store"
+            " WHERE app_name = ? AND user_id = ?"
+        )
+        params: List[Any] = [app_name, user_id]
+        if cursor:
+            update_time, session_id = cursor.split("|", 1)
+            sql += " AND (update_time, id) < (?, ?)"
+            params.extend([float(update_time), session_id])
+        sql += " ORDER BY update_time DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        rows = connection.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1][3]!r}|{rows[-1][1]}"
+        return self._sessions_from_rows(connection, app_name, rows), next_cursor
+
+    def _sessions_from_rows(
+        self, connection: sqlite3.Connection, app_name: str, rows: List[tuple]
+    ) -> List[Session]:
+        """Build sessions (without events) from session_store rows.
+
+        Rows are (user_id, id, state, update_time, version).
+        """
+        shared_states: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        sessions = []
+        for row_user_id, session_id, snapshot, update_time, version in rows:
+            state, _ = replay_ops(
+                connection, (app_name, row_user_id, session_id), snapshot
+            )
+            migration = self._migrate(state)
+            if row_user_id not in shared_states:
+                shared_states[row_user_id] = self._select_shared_state(
+                    connection, app_name, row_user_id
+                )
+            session = Session(
+                id=session_id,
+                app_name=app_name,
+                user_id=row_user_id,
+                state=merge_state(*shared_states[row_user_id], state),
+                last_update_time=update_time,
+            )
+            self._track_version(session, version, migration)
+            sessions.append(session)
+        return sessions
+
+    async def close(self) -> None:
+        """
+        Write queued events and close all connections.
+
+        Raises:
+            SessionConflictError: Events were not written because of conflicts
+                that no caller was told about yet
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        try:
+            await self.flush()
+        finally:
+            self._readers.close()
+            self._writer.close()
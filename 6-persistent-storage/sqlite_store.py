@@ -0,0 +1,229 @@
+"""
+SQLite Store
+
+The tables and connection helpers shared by TunedSqliteSessionService
+(sqlite_session_service.py) and its parts: event archiving (event_archive.py),
+bulk export and import (session_transfer.py), state migrations
+(session_migrations.py) and session leases (session_leases.py).
+
+Sessions are stored in `session_store` as a state snapshot, with the state
+operations written since the snapshot in `session_state_ops` (see
+state_ops.py). `replay_ops` rebuilds the current state from both. App and user
+state are stored in `app_state` and `user_state`, without their prefixes.
+"""
+
+import json
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from google.adk.errors import StaleSessionError
+from google.adk.sessions import State
+
+from state_ops import apply_ops
+
+# Applied to every connection. journal_mode=WAL is stored in the database file.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # fsync at checkpoints only (safe with WAL)
+    "PRAGMA cache_size=-16000",  # 16 MB page cache per connection
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # Read through a 256 MB memory map
+    "PRAGMA busy_timeout=5000",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_store (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE INDEX IF NOT EXISTS session_store_by_update
+    ON session_store (app_name, user_id, update_time, id);
+CREATE TABLE IF NOT EXISTS session_events (
+    seq INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    invocation_id TEXT,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_events_by_session
+    ON session_events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS session_events_archive (
+    seq INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    invocation_id TEXT,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_events_archive_by_session
+    ON session_events_archive (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS session_state_ops (
+    seq INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    ops TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_state_ops_by_session
+    ON session_state_ops (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_state (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT '{}',
+    update_time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+CREATE TABLE IF NOT EXISTS session_leases (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+CREATE TABLE IF NOT EXISTS service_imports (
+    name TEXT PRIMARY KEY,
+    imported_at REAL NOT NULL
+);
+"""
+
+
+class SessionConflictError(StaleSessionError):
+    """
+    A session was changed by another writer since it was read.
+
+    A subclass of ADK's `StaleSessionError` (a `ValueError`), so callers that
+    handle ADK's stale-session error also handle this one.
+    """
+
+
+def split_state_delta(
+    delta: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Split a state delta into app, user and session parts.
+
+    The "app:" and "user:" prefixes are removed and "temp:" keys are dropped,
+    because temporary state is never persisted.
+
+    Returns:
+        Tuple of (app_delta, user_delta, session_delta)
+    """
+    app_delta, user_delta, session_delta = {}, {}, {}
+    for key, value in (delta or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app_delta[key[len(State.APP_PREFIX) :]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_delta[key[len(State.USER_PREFIX) :]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_delta[key] = value
+    return app_delta, user_delta, session_delta
+
+
+def merge_state(
+    app_state: Dict[str, Any],
+    user_state: Dict[str, Any],
+    session_state: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Combine the three state scopes into the state a Session exposes."""
+    merged = dict(session_state)
+    for key, value in app_state.items():
+        merged[State.APP_PREFIX + key] = value
+    for key, value in user_state.items():
+        merged[State.USER_PREFIX + key] = value
+    return merged
+
+
+class ConnectionPool:
+    """A small pool of SQLite connections that are shared between threads."""
+
+    def __init__(self, db_path: str, size: int):
+        self.db_path = db_path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(size)
+
+    def open(self) -> sqlite3.Connection:
+        """Open a tuned connection in autocommit mode (transactions are explicit)."""
+        connection = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        for pragma in PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, opening a new one if none is idle."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self.open()
+        try:
+            yield connection
+        finally:
+            try:
+                self._idle.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+@contextmanager
+def transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a block in one write transaction, rolling back on errors."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def where_clause(filters: List[str]) -> str:
+    """Join filter expressions into a WHERE clause (empty without filters)."""
+    return " WHERE " + " AND ".join(filters) if filters else ""
+
+
+def replay_ops(
+    connection: sqlite3.Connection, key: Tuple[str, str, str], snapshot: str
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Rebuild a session's state from its snapshot and operation log.
+
+    Returns:
+        Tuple of (state, number of operation rows replayed)
+    """
+    state = json.loads(snapshot)
+    rows = connection.execute(
+        "SELECT ops FROM session_state_ops"
+        " WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq",
+        key,
+    ).fetchall()
+    for (ops,) in rows:
+        apply_ops(state, json.loads(ops))
+    return state, len(rows)
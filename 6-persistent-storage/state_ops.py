@@ -0,0 +1,138 @@
+"""
+State Operations
+
+Fine-grained operations that describe how session state changed.
+
+Tools such as `add_reminder` read a list out of the state, change it and assign
+the whole list back, so every state delta carries the full value. `diff_state`
+compares each new value with the previous one and describes the change with
+small operations instead:
+
+    ["set", key, value]                       Replace a whole value
+    ["append", key, [item, ...]]              Append items to a list
+    ["set_index", key, index, value]          Replace one list item
+    ["delete_index", key, index]              Remove one list item
+    ["set_key", key, field, value]            Set one field of a dict
+    ["delete_key", key, field]                Remove one field of a dict
+
+Operations are JSON lists, so they can be stored as they are. `apply_ops`
+replays them onto a state dictionary.
+"""
+
+import json
+from typing import Any, Dict, List
+
+Op = List[Any]
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def _diff_list(key: str, old: List[Any], new: List[Any]) -> List[Op]:
+    """Describe a list change as appends, single-item replacements or removals."""
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    old_middle = old[prefix : len(old) - suffix]
+    new_middle = new[prefix : len(new) - suffix]
+
+    if not old_middle and suffix == 0:
+        return [["append", key, new_middle]]
+    if not new_middle:
+        return [["delete_index", key, prefix] for _ in old_middle]
+    if len(old_middle) == len(new_middle):
+        return [
+            ["set_index", key, prefix + offset, value]
+            for offset, (old_value, value) in enumerate(zip(old_middle, new_middle))
+            if old_value != value
+        ]
+    if len(new) > len(old):
+        # Edits followed by appends (several tool calls in one event)
+        ops = [
+            ["set_index", key, index, value]
+            for index, (old_value, value) in enumerate(zip(old, new))
+            if old_value != value
+        ]
+        return ops + [["append", key, new[len(old) :]]]
+    # Other mixed changes are stored as a whole value
+    return [["set", key, new]]
+
+
+def _diff_dict(key: str, old: Dict[str, Any], new: Dict[str, Any]) -> List[Op]:
+    """Describe a dict change as field updates and removals."""
+    ops: List[Op] = [["delete_key", key, field] for field in old if field not in new]
+    ops.extend(
+        ["set_key", key, field, value]
+        for field, value in new.items()
+        if field not in old or old[field] != value
+    )
+    return ops
+
+
+def diff_state(state: Dict[str, Any], delta: Dict[str, Any]) -> List[Op]:
+    """
+    Describe a state delta as operations on the previous state.
+
+    Values that did not change produce no operation. When the fine-grained
+    operations for a value would be larger than the value itself, a single
+    "set" is used.
+
+    Args:
+        state: The state before the delta is applied (not modified)
+        delta: New values by key
+
+    Returns:
+        List[Op]: Operations that turn `state` into `state` updated with `delta`
+    """
+    ops: List[Op] = []
+    for key, new in delta.items():
+        if key not in state:
+            ops.append(["set", key, new])
+            continue
+        old = state[key]
+        if old == new:
+            continue
+        if isinstance(old, list) and isinstance(new, list):
+            key_ops = _diff_list(key, old, new)
+        elif isinstance(old, dict) and isinstance(new, dict):
+            key_ops = _diff_dict(key, old, new)
+        else:
+            key_ops = [["set", key, new]]
+        if key_ops[0][0] != "set" and _encoded_size(key_ops) >= _encoded_size(new):
+            key_ops = [["set", key, new]]
+        ops.extend(key_ops)
+    return ops
+
+
+def apply_ops(state: Dict[str, Any], ops: List[Op]) -> Dict[str, Any]:
+    """
+    Apply operations to a state dictionary in place.
+
+    Values taken from the operations are stored as they are, so pass
+    operations decoded from JSON (not the caller's live objects).
+
+    Returns:
+        Dict[str, Any]: The updated state (the same dictionary)
+    """
+    for op in ops:
+        kind, key = op[0], op[1]
+        if kind == "set":
+            state[key] = op[2]
+        elif kind == "append":
+            state[key].extend(op[2])
+        elif kind == "set_index":
+            state[key][op[2]] = op[3]
+        elif kind == "delete_index":
+            del state[key][op[2]]
+        elif kind == "set_key":
+            state[key][op[2]] = op[3]
+        elif kind == "delete_key":
+            state[key].pop(op[2], None)
+        else:
+            raise ValueError(f"Unknown state operation: {kind}")
+    return state
@@ -0,0 +1,99 @@
+"""
+State Schema
+
+Versioned migrations for session state.
+
+The shape of the state changes as the agent grows: keys are added, and values
+change format (reminders went from plain strings to {"id", "text"} entries).
+Instead of patching sessions when they are loaded, each change is registered
+as a numbered migration:
+
+    schema = StateSchema()
+
+    @schema.migration(1)
+    def add_defaults(state):
+        state.setdefault("reminders", [])
+
+The state records the version it is at under `schema_version`. `migrate`
+runs the migrations the state has not had yet, in order, and returns the keys
+they changed. TunedSqliteSessionService applies them in memory when it reads a
+session and stores the changed keys with the session's next event, so reading
+never writes. `migrate_sessions.py` upgrades a whole database at once.
+
+This module is not tied to an agent; the memory agent's migrations are in
+memory_agent/schema.py.
+"""
+
+import copy
+from typing import Any, Callable, Dict
+
+Migration = Callable[[Dict[str, Any]], None]
+
+# --- Constants ---
+VERSION_KEY = "schema_version"
+
+
+class StateSchema:
+    """
+    A registry of state migrations, numbered from 1.
+
+    Args:
+        version_key: The state key holding the version a state is at
+    """
+
+    def __init__(self, version_key: str = VERSION_KEY):
+        self.version_key = version_key
+        self._migrations: Dict[int, Migration] = {}
+
+    @property
+    def version(self) -> int:
+        """The current version (the number of the last migration)."""
+        return len(self._migrations)
+
+    def migration(self, version: int) -> Callable[[Migration], Migration]:
+        """
+        Register the function that upgrades a state to `version`.
+
+        The function changes the state dict in place. Versions must be
+        registered in order, starting with 1.
+
+        Raises:
+            ValueError: The version is not the next one
+        """
+
+        def register(function: Migration) -> Migration:
+            if version != self.version + 1:
+                raise ValueError(
+                    f"Migration {version} registered after version {self.version};"
+                    f" expected {self.version + 1}."
+                )
+            self._migrations[version] = function
+            return function
+
+        return register
+
+    def needs_migration(self, state: Dict[str, Any]) -> bool:
+        """Check whether a state is at an older version than the schema."""
+        return state.get(self.version_key, 0) < self.version
+
+    def migrate(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Upgrade a state to the current version, in place.
+
+        A state from a newer version than this schema is left unchanged.
+
+        Returns:
+            Dict[str, Any]: The keys the migrations changed and their new values
+                (empty if the state was already current)
+        """
+        if not self.needs_migration(state):
+            return {}
+        before = copy.deepcopy(state)
+        for version in range(state.get(self.version_key, 0) + 1, self.version + 1):
+            self._migrations[version](state)
+        state[self.version_key] = self.version
+        return {
+            key: value
+            for key, value in state.items()
+            if key not in before or before[key] != value
+        }
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for the tuned SQLite session service.
+
+Each test uses a fresh database in a temporary directory: write conflicts
+between two service instances, reading sessions whose events were archived,
+state compaction, lazy migrations and export/import round trips.
+
+Usage:
+    python test_sqlite_session_service.py
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from session_transfer import export_service_sessions, import_service_sessions
+from sqlite_session_service import SessionConflictError, TunedSqliteSessionService
+from state_schema import StateSchema
+
+APP_NAME = "Memory Agent"
+USER_ID = "aiwithazril"
+
+
+def make_event(index, delta=None, timestamp=None):
+    """An event with an optional state delta and a recognisable invocation id."""
+    event = Event(
+        author="user",
+        invocation_id=f"inv-{index}",
+        actions=EventActions(state_delta=delta or {}),
+    )
+    if timestamp is not None:
+        event.timestamp = timestamp
+    return event
+
+
+def run_in_temp_dir(test):
+    """Run an async test with the path of a new database file."""
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(test(os.path.join(directory, "sessions.db")))
+
+
+def expect_conflict(coroutine):
+    """Await a coroutine and check that it raises SessionConflictError."""
+
+    async def check():
+        try:
+            await coroutine
+        except SessionConflictError:
+            return
+        raise AssertionError("expected a SessionConflictError")
+
+    return check()
+
+
+def test_conflict_across_instances():
+    async def scenario(db_path):
+        first = TunedSqliteSessionService(db_path=db_path, shared=True)
+        second = TunedSqliteSessionService(db_path=db_path, shared=True)
+        try:
+            created = await first.create_session(
+                app_name=APP_NAME, user_id=USER_ID, state={"reminders": []}
+            )
+            key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=created.id)
+            mine = await first.get_session(**key)
+            theirs = await second.get_session(**key)
+
+            await first.append_event(mine, make_event(1, {"reminders": ["a"]}))
+            await expect_conflict(
+                second.append_event(theirs, make_event(2, {"reminders": ["b"]}))
+            )
+
+            # Re-reading picks up the other writer's change and can write again
+            theirs = await second.get_session(**key)
+            assert theirs.state["reminders"] == ["a"]
+            await second.append_event(theirs, make_event(3, {"reminders": ["a", "b"]}))
+            stored = await first.get_session(**key)
+            assert stored.state["reminders"] == ["a", "b"]
+            assert [e.invocation_id for e in stored.events] == ["inv-1", "inv-3"]
+        finally:
+            await first.close()
+            await second.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ A stale write from another service instance is rejected")
+
+
+def test_batched_conflict_is_reported():
+    async def scenario(db_path):
+        service = TunedSqliteSessionService(db_path=db_path)
+        created = await service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=created.id)
+        first = await service.get_session(**key)
+        second = await service.get_session(**key)
+
+        # Both are queued; the second one is stale once the first is written
+        await service.append_event(first, make_event(1, {"n": 1}))
+        await service.append_event(second, make_event(2, {"n": 2}))
+        await expect_conflict(service.flush())
+        await service.flush()  # Reported once
+
+        stored = await service.get_session(**key)
+        assert stored.state["n"] == 1
+        await service.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ A conflict in a group commit is raised by the next flush")
+
+
+def test_each_batched_event_is_checked():
+    async def scenario(db_path):
+        service = TunedSqliteSessionService(db_path=db_path)
+        created = await service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=created.id)
+        first = await service.get_session(**key)
+        second = await service.get_session(**key)
+
+        # Without state changes nothing is read in between, so all three events
+        # reach the same group commit; only the first session's are current
+        await service.append_event(first, make_event(1))
+        await service.append_event(first, make_event(2))
+        await service.append_event(second, make_event(3))
+        await expect_conflict(service.flush())
+
+        stored = await service.get_session(**key)
+        assert [e.invocation_id for e in stored.events] == ["inv-1", "inv-2"]
+        await service.append_event(stored, make_event(4))
+        await service.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Every event of a group commit is checked against the stored version")
+
+
+def test_archive_then_read():
+    async def scenario(db_path):
+        service = TunedSqliteSessionService(db_path=db_path, hot_events=20)
+        try:
+            session = await service.create_session(
+                app_name=APP_NAME, user_id=USER_ID, state={"seen": []}
+            )
+            key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=session.id)
+            for index in range(300):
+                delta = {}
+                if index % 10 == 0:
+                    delta = {"seen": session.state["seen"] + [index]}
+                await service.append_event(
+                    session, make_event(index, delta, timestamp=1000.0 + index)
+                )
+
+            archived = service._writer.execute(
+                "SELECT COUNT(*) FROM session_events_archive"
+            ).fetchone()[0]
+            assert archived >= 300 - 20 - 50, archived
+
+            hot = await service.get_session(**key)
+            assert 20 <= len(hot.events) < 20 + 50
+            assert hot.events[-1].invocation_id == "inv-299"
+            assert hot.state["seen"] == list(range(0, 300, 10))
+
+            recent = await service.get_session(
+                **key, config=GetSessionConfig(num_recent_events=150)
+            )
+            assert [e.invocation_id for e in recent.events] == [
+                f"inv-{index}" for index in range(150, 300)
+            ]
+            since = await service.get_session(
+                **key, config=GetSessionConfig(after_timestamp=1010.0)
+            )
+            assert len(since.events) == 290
+
+            history, cursor = [], None
+            while True:
+                page, cursor = await service.list_events_page(
+                    **key, limit=37, cursor=cursor
+                )
+                history = page + history
+                if not cursor:
+                    break
+            assert [e.invocation_id for e in history] == [
+                f"inv-{index}" for index in range(300)
+            ]
+
+            await service.delete_session(**key)
+            assert not service._writer.execute(
+                "SELECT COUNT(*) FROM session_events_archive"
+            ).fetchone()[0]
+        finally:
+            await service.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Archived events are read back in order")
+
+
+def test_compaction_round_trip():
+    async def scenario(db_path):
+        service = TunedSqliteSessionService(db_path=db_path, compact_every=5)
+        expected = {"reminders": [], "profile": {"name": "Azril"}}
+        session = await service.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state=expected
+        )
+        for index in range(23):
+            reminders = expected["reminders"] + [{"id": index, "text": f"r{index}"}]
+            if index % 4 == 3:
+                reminders = reminders[1:]
+            delta = {
+                "reminders": reminders,
+                "profile": {**expected["profile"], "turns": index},
+            }
+            expected = {**expected, **delta}
+            await service.append_event(session, make_event(index, delta))
+        await service.close()
+
+        op_rows = sqlite3.connect(db_path).execute(
+            "SELECT COUNT(*) FROM session_state_ops"
+        ).fetchone()[0]
+        assert op_rows < 5, op_rows
+
+        reopened = TunedSqliteSessionService(db_path=db_path)
+        try:
+            stored = await reopened.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+            )
+            assert stored.state == expected, stored.state
+            await reopened.append_event(stored, make_event(99, {"done": True}))
+            stored = await reopened.get_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+            )
+            assert stored.state == {**expected, "done": True}
+        finally:
+            await reopened.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Compacted state reads back the same as the applied deltas")
+
+
+def test_lazy_migration():
+    schema = StateSchema()
+
+    @schema.migration(1)
+    def add_reminders(state):
+        state.setdefault("reminders", [])
+
+    async def scenario(db_path):
+        old = TunedSqliteSessionService(db_path=db_path)
+        created = await old.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state={"user_name": "Azril"}
+        )
+        await old.close()
+
+        service = TunedSqliteSessionService(db_path=db_path, state_schema=schema)
+        try:
+            key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=created.id)
+            session = await service.get_session(**key)
+            assert session.state["reminders"] == []
+            assert session.state["schema_version"] == 1
+            counts = await service.migrate_stored_sessions(dry_run=True)
+            assert counts == {"checked": 1, "migrated": 1}, counts
+
+            # The migrated keys are stored with the session's next event
+            await service.append_event(session, make_event(1))
+            counts = await service.migrate_stored_sessions(dry_run=True)
+            assert counts["migrated"] == 0, counts
+        finally:
+            await service.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Sessions are migrated when read and stored with the next event")
+
+
+def test_export_import_equality():
+    async def scenario(db_path):
+        source = TunedSqliteSessionService(db_path=db_path, hot_events=10)
+        try:
+            ids = []
+            for number in range(3):
+                session = await source.create_session(
+                    app_name=APP_NAME,
+                    user_id=USER_ID,
+                    state={"user_name": f"user {number}", "app:greeting": "hi"},
+                )
+                ids.append(session.id)
+                for index in range(70):
+                    await source.append_event(
+                        session,
+                        make_event(index, {"turn": index, "user:theme": "dark"}),
+                    )
+            export_path = os.path.join(os.path.dirname(db_path), "sessions.jsonl.gz")
+            exported = await source.export_sessions(export_path, chunk_size=2)
+            assert exported["session"] == 3 and exported["event"] == 210, exported
+
+            target = TunedSqliteSessionService(
+                db_path=db_path + ".copy", hot_events=10
+            )
+            try:
+                imported = await target.import_sessions(export_path, chunk_size=7)
+                assert imported["session"] == 3 and imported["event"] == 210
+                again = await target.import_sessions(export_path)
+                assert again["skipped_sessions"] == 3, again
+
+                for session_id in ids:
+                    key = dict(
+                        app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+                    )
+                    config = GetSessionConfig(num_recent_events=1000)
+                    before = await source.get_session(**key, config=config)
+                    after = await target.get_session(**key, config=config)
+                    assert after.state == before.state
+                    assert [e.model_dump() for e in after.events] == [
+                        e.model_dump() for e in before.events
+                    ]
+                    assert after.last_update_time == before.last_update_time
+            finally:
+                await target.close()
+        finally:
+            await source.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Exported sessions import as equal sessions")
+
+
+def test_import_skips_repeated_sessions():
+    async def scenario(db_path):
+        export_path = os.path.join(os.path.dirname(db_path), "sessions.jsonl")
+        source = TunedSqliteSessionService(db_path=db_path)
+        try:
+            session = await source.create_session(app_name=APP_NAME, user_id=USER_ID)
+            for index in range(3):
+                await source.append_event(session, make_event(index))
+            await source.export_sessions(export_path)
+        finally:
+            await source.close()
+        with open(export_path) as file:
+            lines = file.readlines()
+        with open(export_path, "a") as file:
+            file.writelines(lines)  # The same session (and its events) again
+
+        for replace in (False, True):
+            target = TunedSqliteSessionService(db_path=f"{db_path}.{replace}.copy")
+            try:
+                counts = await target.import_sessions(
+                    export_path, replace=replace, chunk_size=100
+                )
+                assert counts["session"] == 1 and counts["event"] == 3, counts
+                assert counts["skipped_sessions"] == 1, counts
+                stored = await target.get_session(
+                    app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+                )
+                assert len(stored.events) == 3
+            finally:
+                await target.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ A session repeated in an import file is imported once")
+
+
+
+def test_export_through_the_service_api():
+    async def scenario(db_path):
+        directory = os.path.dirname(db_path)
+        export_path = os.path.join(directory, "adk.jsonl")
+        adk = DatabaseSessionService(db_url=f"sqlite+aiosqlite:///{db_path}.adk")
+        ids = []
+        for number in range(2):
+            session = await adk.create_session(
+                app_name=APP_NAME,
+                user_id=f"user-{number}",
+                state={"user_name": f"user {number}", "app:greeting": "hi"},
+            )
+            ids.append((session.user_id, session.id))
+            for index in range(5):
+                await adk.append_event(
+                    session, make_event(index, {"turn": index, "user:theme": "dark"})
+                )
+        exported = await export_service_sessions(adk, export_path, app_name=APP_NAME)
+        assert exported == {"app_state": 1, "user_state": 2, "session": 2, "event": 10}
+
+        restored = DatabaseSessionService(
+            db_url=f"sqlite+aiosqlite:///{db_path}.restored"
+        )
+        tuned = TunedSqliteSessionService(db_path=db_path)
+        try:
+            imported = await import_service_sessions(restored, export_path)
+            assert imported["session"] == 2 and imported["event"] == 10, imported
+            again = await import_service_sessions(restored, export_path)
+            assert again["skipped_sessions"] == 2, again
+            await tuned.import_sessions(export_path)
+
+            for user_id, session_id in ids:
+                key = dict(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+                before = await adk.get_session(**key)
+                for target in (restored, tuned):
+                    after = await target.get_session(**key)
+                    assert after.state == before.state, after.state
+                    assert [e.invocation_id for e in after.events] == [
+                        e.invocation_id for e in before.events
+                    ]
+        finally:
+            await tuned.close()
+            await adk.close()
+            await restored.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Sessions of any service are exported and restored through its API")
+
+
+def test_import_from_service_runs_once():
+    async def scenario(db_path):
+        # DatabaseSessionService's tables in the same file, as in main.py
+        db_url = f"sqlite+aiosqlite:///{db_path}"
+        adk = DatabaseSessionService(db_url=db_url)
+        old = await adk.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state={"reminders": ["a"]}
+        )
+        await adk.append_event(old, make_event(1, {"reminders": ["a", "b"]}))
+
+        service = TunedSqliteSessionService(db_path=db_path)
+        try:
+            counts = await service.import_from_service(
+                adk, app_name=APP_NAME, name=db_url
+            )
+            assert counts["session"] == 1 and counts["event"] == 1, counts
+            key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=old.id)
+            stored = await service.get_session(**key)
+            assert stored.state["reminders"] == ["a", "b"]
+
+            await service.delete_session(**key)
+            again = await service.import_from_service(
+                adk, app_name=APP_NAME, name=db_url
+            )
+            assert again is None
+            assert await service.get_session(**key) is None
+        finally:
+            await service.close()
+            await adk.close()
+
+    run_in_temp_dir(scenario)
+    print("✅ Sessions of another service are imported once")
+
+if __name__ == "__main__":
+    test_conflict_across_instances()
+    test_batched_conflict_is_reported()
+    test_each_batched_event_is_checked()
+    test_archive_then_read()
+    test_compaction_round_trip()
+    test_lazy_migration()
+    test_export_import_equality()
+    test_import_skips_repeated_sessions()
+    test_export_through_the_service_api()
+    test_import_from_service_runs_once()
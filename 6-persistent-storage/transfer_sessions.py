@@ -0,0 +1,121 @@
+"""
+Export sessions to a JSON Lines file, or import them from one.
+
+Sessions and their events are streamed in chunks, so a database with millions
+of sessions is exported or imported in constant memory. Files ending in .gz
+are gzip-compressed.
+
+Usage:
+    python transfer_sessions.py export sessions.jsonl.gz [--app "Memory Agent"]
+        [--user aiwithazril] [--since 2025-01-01] [--until 2025-02-01]
+    python transfer_sessions.py import sessions.jsonl.gz [--replace]
+
+Both commands take --db (default ./my_agent_data.db) and --chunk-size.
+
+With --adk, sessions are read from or written to the tables of ADK's
+DatabaseSessionService in --db instead, through the session service API
+(export needs --app). This moves sessions between the two services:
+
+    python transfer_sessions.py export adk.jsonl --adk --app "Memory Agent"
+    python transfer_sessions.py import adk.jsonl
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from google.adk.sessions import DatabaseSessionService
+from session_transfer import export_service_sessions, import_service_sessions
+from sqlite_session_service import TunedSqliteSessionService
+
+
+def parse_time(value):
+    """Parse an ISO date or date and time (local time) as a timestamp."""
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+async def transfer_with_adk_service(args):
+    """Export or import the sessions of DatabaseSessionService's tables."""
+    session_service = DatabaseSessionService(db_url=f"sqlite+aiosqlite:///{args.db}")
+    try:
+        if args.command == "export":
+            return await export_service_sessions(
+                session_service,
+                args.file,
+                app_name=args.app,
+                user_id=args.user,
+                updated_after=parse_time(args.since),
+                updated_before=parse_time(args.until),
+            )
+        return await import_service_sessions(
+            session_service, args.file, replace=args.replace
+        )
+    finally:
+        await session_service.close()
+
+
+async def transfer_with_tuned_service(args):
+    """Export or import the sessions of TunedSqliteSessionService's tables."""
+    session_service = TunedSqliteSessionService(db_path=args.db)
+    try:
+        if args.command == "export":
+            return await session_service.export_sessions(
+                args.file,
+                app_name=args.app,
+                user_id=args.user,
+                updated_after=parse_time(args.since),
+                updated_before=parse_time(args.until),
+                chunk_size=args.chunk_size,
+            )
+        return await session_service.import_sessions(
+            args.file, replace=args.replace, chunk_size=args.chunk_size
+        )
+    finally:
+        await session_service.close()
+
+
+async def main_async(args):
+    started = time.perf_counter()
+    if args.adk:
+        counts = await transfer_with_adk_service(args)
+    else:
+        counts = await transfer_with_tuned_service(args)
+
+    verb = "Exported" if args.command == "export" else "Imported"
+    print(
+        f"{verb} {counts['session']} sessions with {counts['event']} events"
+        f" in {time.perf_counter() - started:.1f}s"
+    )
+    print(f"App states: {counts['app_state']}, user states: {counts['user_state']}")
+    if counts.get("skipped_sessions"):
+        print(
+            f"Skipped {counts['skipped_sessions']} sessions that already exist"
+            " or are repeated in the file (use --replace to overwrite existing ones)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("file", help="JSON Lines file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--db", default="./my_agent_data.db", help="Database file")
+    parser.add_argument(
+        "--chunk-size", type=int, default=500, help="Rows per query or transaction"
+    )
+    parser.add_argument("--app", help="Export only this app")
+    parser.add_argument("--user", help="Export only this user")
+    parser.add_argument("--since", help="Export sessions updated at or after this time")
+    parser.add_argument("--until", help="Export sessions updated before this time")
+    parser.add_argument(
+        "--replace", action="store_true", help="Import over existing sessions"
+    )
+    parser.add_argument(
+        "--adk",
+        action="store_true",
+        help="Use the tables of ADK's DatabaseSessionService in --db",
+    )
+    args = parser.parse_args()
+    if args.adk and args.command == "export" and not args.app:
+        parser.error("export with --adk needs --app")
+    asyncio.run(main_async(args))
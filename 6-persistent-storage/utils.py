@@ -1,5 +1,15 @@
+import os
+
+from google.adk.sessions.base_session_service import GetSessionConfig
 from google.genai import types
 
+# Reads that only need the state skip the session's events
+STATE_ONLY = GetSessionConfig(num_recent_events=0)
+
+# Last known session-scoped state per (app_name, user_id, session_id), kept up
+# to date from event state deltas so diagnostics never re-read the session
+_known_states = {}
+
 
 # ANSI color codes for terminal output
 class Colors:
@@ -28,34 +38,33 @@ class Colors:
     BG_WHITE = "\033[47m"
 
 
-def display_state(
-    session_service, app_name, user_id, session_id, label="Current State"
-):
-    """Display the current session state in a formatted way."""
-    try:
-        session = session_service.get_session(
-            app_name=app_name, user_id=user_id, session_id=session_id
-        )
-
-        # Format the output with clear sections
-        print(f"\n{'-' * 10} {label} {'-' * 10}")
-
-        # Handle the user name
-        user_name = session.state.get("user_name", "Unknown")
-        print(f"👤 User: {user_name}")
-
-        # Handle reminders
-        reminders = session.state.get("reminders", [])
-        if reminders:
-            print("📝 Reminders:")
-            for idx, reminder in enumerate(reminders, 1):
-                print(f"  {idx}. {reminder}")
+def diagnostics_enabled():
+    """Check whether state diagnostics are on (set STATE_DIAGNOSTICS=1 to enable)."""
+    return os.getenv("STATE_DIAGNOSTICS", "").lower() in ("1", "true", "yes", "on")
+
+
+def display_state_changes(before, state_delta, label="State changes"):
+    """Display only the state keys that were added or changed.
+
+    Args:
+        before: The state before the query
+        state_delta: The merged state deltas of the query's events
+        label: Heading for the output
+    """
+    changes = {
+        key: value
+        for key, value in state_delta.items()
+        if key not in before or before[key] != value
+    }
+    print(f"\n{'-' * 10} {label} {'-' * 10}")
+    if not changes:
+        print("  (no changes)")
+    for key, value in changes.items():
+        if key in before:
+            print(f"  ~ {key}: {before[key]!r} -> {value!r}")
         else:
-            print("📝 Reminders: None")
-
-        print("-" * (22 + len(label)))
-    except Exception as e:
-        print(f"Error displaying state: {e}")
+            print(f"  + {key}: {value!r}")
+    print("-" * (22 + len(label)))
 
 
 async def process_agent_response(event):
@@ -121,19 +130,27 @@ async def call_agent_async(runner, user_id, session_id, query):
     )
     final_response_text = None
 
-    # Display state before processing
-    display_state(
-        runner.session_service,
-        runner.app_name,
-        user_id,
-        session_id,
-        "State BEFORE processing",
-    )
+    # Diagnostics are off by default; when on, only state changes are printed
+    diagnostics = diagnostics_enabled()
+    state_key = (runner.app_name, user_id, session_id)
+    state_delta = {}
+    if diagnostics and state_key not in _known_states:
+        # Read the session once; later queries reuse the tracked state
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=session_id,
+            config=STATE_ONLY,
+        )
+        _known_states[state_key] = dict(session.state) if session else {}
 
     try:
         async for event in runner.run_async(
             user_id=user_id, session_id=session_id, new_message=content
         ):
+            if diagnostics and event.actions and event.actions.state_delta:
+                state_delta.update(event.actions.state_delta)
+
             # Process each event and get the final response if available
             response = await process_agent_response(event)
             if response:
@@ -141,13 +158,9 @@ async def call_agent_async(runner, user_id, session_id, query):
     except Exception as e:
         print(f"Error during agent call: {e}")
 
-    # Display state after processing the message
-    display_state(
-        runner.session_service,
-        runner.app_name,
-        user_id,
-        session_id,
-        "State AFTER processing",
-    )
+    # Display what the query changed in state
+    if diagnostics:
+        display_state_changes(_known_states[state_key], state_delta)
+        _known_states[state_key].update(state_delta)
 
     return final_response_text
@@ -0,0 +1,338 @@
+"""
+Bounded In-Memory Session Service
+
+An in-memory session service for long-running workers.
+
+`InMemorySessionService` keeps every session and all of its events until the
+process exits, so a worker's memory grows with every conversation. This
+service keeps the same behaviour for active sessions but bounds memory:
+
+- Idle TTL: a session that has not been read or written for
+  `idle_ttl_seconds` expires
+- Memory cap: when the sessions use more than `max_bytes`, the least recently
+  used sessions are evicted until they fit
+- Accounting: the size of every session (its JSON-encoded state and events)
+  is tracked incrementally and reported by `metrics()`
+- Side data: data kept next to a session but outside its state (such as the
+  interaction log) is stored with the session via `session_extras()`, so it
+  counts towards the cap and leaves memory together with the session
+
+Sessions are kept in an OrderedDict in least-recently-used order, so expiry
+and eviction only look at the oldest entries.
+"""
+
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+SessionKey = Tuple[str, str, str]  # (app_name, user_id, session_id)
+
+
+def _json_size(value: Any) -> int:
+    """Size of a value encoded as JSON (non-JSON values use their str())."""
+    return len(json.dumps(value, default=str))
+
+
+def _extra_size(value: Any) -> int:
+    """Size of a side data value: its `nbytes` if it tracks one, else its JSON size."""
+    nbytes = getattr(value, "nbytes", None)
+    return nbytes if nbytes is not None else _json_size(value)
+
+
+class _StoredSession:
+    """A session with its side data, size and last access time."""
+
+    __slots__ = (
+        "session",
+        "state_bytes",
+        "events_bytes",
+        "extras",
+        "extras_bytes",
+        "last_access",
+    )
+
+    def __init__(self, session: Session, now: float):
+        self.session = session
+        # Size per state key, so a delta only re-measures the keys it changes
+        self.state_bytes = {key: _json_size(v) for key, v in session.state.items()}
+        self.events_bytes = 0
+        self.extras: Dict[str, Any] = {}
+        self.extras_bytes = 0
+        self.last_access = now
+
+    @property
+    def size(self) -> int:
+        return sum(self.state_bytes.values()) + self.events_bytes + self.extras_bytes
+
+
+class BoundedInMemorySessionService(BaseSessionService):
+    """
+    An in-memory session service with idle expiry and a memory cap.
+
+    Args:
+        idle_ttl_seconds: Expire sessions idle for longer than this (None to
+            keep idle sessions until they are evicted for memory)
+        max_bytes: Evict least recently used sessions when all sessions together
+            are larger than this
+        on_evict: Called with (app_name, user_id, session_id) when a session
+            expires or is evicted (its side data is dropped with it)
+        clock: Time source (seconds), replaceable in tests
+    """
+
+    def __init__(
+        self,
+        idle_ttl_seconds: Optional[float] = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        on_evict: Optional[Callable[[str, str, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._clock = clock
+        self._sessions: "OrderedDict[SessionKey, _StoredSession]" = OrderedDict()
+        self._total_bytes = 0
+        self._app_state: Dict[str, Dict[str, Any]] = {}
+        self._user_state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._counters = {
+            "expired": 0,
+            "evicted_for_memory": 0,
+            "events_for_missing_sessions": 0,
+        }
+
+    # --- Bookkeeping ---
+
+    def _remove(self, key: SessionKey, reason: Optional[str] = None) -> None:
+        """Remove a stored session, counting it if it expired or was evicted."""
+        stored = self._sessions.pop(key, None)
+        if stored is None:
+            return
+        self._total_bytes -= stored.size
+        if reason:
+            self._counters[reason] += 1
+            if self.on_evict:
+                self.on_evict(*key)
+
+    def _expire_idle(self) -> None:
+        """Remove sessions idle for longer than the TTL (oldest first)."""
+        if self.idle_ttl_seconds is None:
+            return
+        cutoff = self._clock() - self.idle_ttl_seconds
+        while self._sessions:
+            key, stored = next(iter(self._sessions.items()))
+            if stored.last_access > cutoff:
+                return
+            self._remove(key, "expired")
+
+    def _enforce_memory_cap(self) -> None:
+        """Evict least recently used sessions until the total fits (keeps one)."""
+        while self._total_bytes > self.max_bytes and len(self._sessions) > 1:
+            self._remove(next(iter(self._sessions)), "evicted_for_memory")
+
+    def _touch(self, key: SessionKey) -> Optional[_StoredSession]:
+        """Look up a session and mark it as used, expiring idle sessions first."""
+        self._expire_idle()
+        stored = self._sessions.get(key)
+        if stored is not None:
+            stored.last_access = self._clock()
+            self._sessions.move_to_end(key)
+        return stored
+
+    def _merged_state(self, session: Session) -> Dict[str, Any]:
+        """The session's own state plus the app and user state, with prefixes."""
+        state = dict(session.state)
+        for key, value in self._app_state.get(session.app_name, {}).items():
+            state[State.APP_PREFIX + key] = value
+        user_key = (session.app_name, session.user_id)
+        for key, value in self._user_state.get(user_key, {}).items():
+            state[State.USER_PREFIX + key] = value
+        return state
+
+    def _apply_shared_delta(
+        self, app_name: str, user_id: str, delta: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Store app: and user: keys, returning the session-scoped rest."""
+        session_delta = {}
+        for key, value in delta.items():
+            if key.startswith(State.APP_PREFIX):
+                self._app_state.setdefault(app_name, {})[
+                    key[len(State.APP_PREFIX) :]
+                ] = value
+            elif key.startswith(State.USER_PREFIX):
+                self._user_state.setdefault((app_name, user_id), {})[
+                    key[len(State.USER_PREFIX) :]
+                ] = value
+            elif not key.startswith(State.TEMP_PREFIX):
+                session_delta[key] = value
+        return session_delta
+
+    # --- Session service API ---
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        key = (app_name, user_id, session_id)
+        self._expire_idle()
+        if key in self._sessions:
+            raise ValueError(f"Session {session_id} already exists.")
+
+        session = Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=self._apply_shared_delta(app_name, user_id, state or {}),
+            last_update_time=time.time(),
+        )
+        stored = _StoredSession(session, self._clock())
+        self._sessions[key] = stored
+        self._total_bytes += stored.size
+        self._enforce_memory_cap()
+        return self._copy(session, self._merged_state(session))
+
+    def _copy(self, session: Session, state: Dict[str, Any], events=None) -> Session:
+        """A copy the caller can modify without changing the stored session."""
+        return Session(
+            id=session.id,
+            app_name=session.app_name,
+            user_id=session.user_id,
+            state=state,
+            events=list(session.events if events is None else events),
+            last_update_time=session.last_update_time,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        stored = self._touch((app_name, user_id, session_id))
+        if stored is None:
+            return None
+        events = stored.session.events
+        if config and config.after_timestamp:
+            events = [e for e in events if e.timestamp >= config.after_timestamp]
+        if config and config.num_recent_events is not None:
+            count = config.num_recent_events
+            events = events[-count:] if count else []
+        return self._copy(stored.session, self._merged_state(stored.session), events)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        """List live sessions (with state, without events)."""
+        self._expire_idle()
+        sessions = [
+            self._copy(stored.session, self._merged_state(stored.session), events=[])
+            for (app, user, _), stored in self._sessions.items()
+            if app == app_name and (user_id is None or user == user_id)
+        ]
+        sessions.sort(key=lambda session: session.last_update_time)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self._remove((app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        # Updates the caller's session object (and drops temp: keys)
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        stored = self._touch(key)
+        if stored is None:
+            # Expired or evicted while the caller still held it
+            self._counters["events_for_missing_sessions"] += 1
+            logger.warning("Session %s is no longer in memory; event not stored", key)
+            return event
+
+        old_size = stored.size
+        delta = event.actions.state_delta if event.actions else None
+        for name, value in self._apply_shared_delta(*key[:2], delta or {}).items():
+            stored.session.state[name] = value
+            stored.state_bytes[name] = _json_size(value)
+        stored.session.events.append(event)
+        stored.events_bytes += len(event.model_dump_json(exclude_none=True))
+        stored.session.last_update_time = event.timestamp
+        self._total_bytes += stored.size - old_size
+        self._enforce_memory_cap()
+        return event
+
+    # --- Side data ---
+
+    def session_extras(
+        self, app_name: str, user_id: str, session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the side data dict of a session (None if it is not in memory).
+
+        Values added to the dict are stored with the session and removed with
+        it. Call `extras_changed` after changing them so their size is counted.
+        """
+        stored = self._touch((app_name, user_id, session_id))
+        return stored.extras if stored else None
+
+    def extras_changed(self, app_name: str, user_id: str, session_id: str) -> None:
+        """Re-measure a session's side data and enforce the memory cap."""
+        stored = self._sessions.get((app_name, user_id, session_id))
+        if stored is None:
+            return
+        extras_bytes = sum(_extra_size(value) for value in stored.extras.values())
+        self._total_bytes += extras_bytes - stored.extras_bytes
+        stored.extras_bytes = extras_bytes
+        self._enforce_memory_cap()
+
+    # --- Metrics ---
+
+    def session_bytes(self, app_name: str, user_id: str, session_id: str) -> int:
+        """Bytes used by one session (0 if it is not in memory)."""
+        stored = self._sessions.get((app_name, user_id, session_id))
+        return stored.size if stored else 0
+
+    def metrics(self, top_n: int = 5) -> Dict[str, Any]:
+        """
+        Return memory and eviction metrics.
+
+        Returns:
+            Dict[str, Any]: Session count, total and average bytes per session,
+                the largest sessions, and expiry/eviction counters
+        """
+        count = len(self._sessions)
+        largest = sorted(
+            self._sessions.items(), key=lambda item: item[1].size, reverse=True
+        )[:top_n]
+        return {
+            "sessions": count,
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "average_session_bytes": self._total_bytes // count if count else 0,
+            "largest_sessions": [
+                {"session_id": key[2], "user_id": key[1], "bytes": stored.size}
+                for key, stored in largest
+            ],
+            **self._counters,
+        }
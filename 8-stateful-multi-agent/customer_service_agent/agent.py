@@ -1,5 +1,7 @@
 from google.adk.agents import Agent
 
+from .context_window import windowed_instruction
+
 from .sub_agents.course_support_agent.agent import course_support_agent
 from .sub_agents.order_agent.agent import order_agent
 from .sub_agents.policy_agent.agent import policy_agent
@@ -10,7 +12,8 @@ customer_service_agent = Agent(
     name="customer_service",
     model="gemini-2.0-flash",
     description="Customer service agent for AI Developer Accelerator community",
-    instruction="""
+    instruction=windowed_instruction(
+        """
     You are the primary customer service agent for the AI Developer Accelerator community.
     Your role is to help users with their questions and direct them to the appropriate specialized agent.
 
@@ -22,7 +25,7 @@ customer_service_agent = Agent(
        - Maintain conversation context using state
 
     2. State Management
-       - Track user interactions in state['interaction_history']
+       - Review past user interactions in the interaction history below
        - Monitor user's purchased courses in state['purchased_courses']
          - Course information is stored as objects with "id" and "purchase_date" properties
        - Use state to provide personalized responses
@@ -74,7 +77,8 @@ customer_service_agent = Agent(
 
     Always maintain a helpful and professional tone. If you're unsure which agent to delegate to,
     ask clarifying questions to better understand the user's needs.
-    """,
+    """
+    ),
     sub_agents=[policy_agent, sales_agent, course_support_agent, order_agent],
     tools=[],
 )
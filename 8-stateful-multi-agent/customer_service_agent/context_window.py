@@ -0,0 +1,237 @@
+"""
+Context Window
+
+Renders the interaction history and purchased courses into agent instructions
+within a token budget.
+
+Inlining the full history made every prompt grow with the conversation. The
+context window shows only the newest `HISTORY_RECENT_ENTRIES` interactions
+verbatim. Older ones are folded into a short rolling summary (counts per action,
+courses bought and refunded, the last few user topics). The summary is updated
+incrementally: each interaction is folded in once, when it leaves the window.
+
+Tokens are estimated as characters / 4. For every rendered instruction the
+tokens the verbatim history would have used are recorded next to the tokens
+actually used; `get_prompt_savings` returns the totals for one invocation.
+"""
+
+import copy
+import re
+import threading
+import weakref
+from collections import Counter, OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .interaction_log import InteractionLog, format_entry, format_history, log_for_context
+
+# --- Constants ---
+HISTORY_RECENT_ENTRIES = 10  # Interactions shown verbatim
+HISTORY_TOKEN_BUDGET = 800  # Maximum tokens for the history section
+MAX_ENTRY_CHARS = 300  # Longer interactions are truncated
+SUMMARY_TOPICS = 5  # Earlier user queries mentioned in the summary
+MAX_COURSES_SHOWN = 20  # Newest purchased courses listed individually
+SAVINGS_MAX_INVOCATIONS = 100  # Invocations whose savings are kept
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a text (about 4 characters each)."""
+    return (len(text) + 3) // 4
+
+
+class _Summary:
+    """Rolling summary of the interactions that left the window."""
+
+    def __init__(self):
+        self.summarized_through = 0  # Sequence number of the last folded entry
+        self.not_retained = 0  # Entries dropped from the log before folding
+        self.actions: Counter = Counter()
+        self.purchased: List[str] = []
+        self.refunded: List[str] = []
+        self.topics: Deque[str] = deque(maxlen=SUMMARY_TOPICS)
+
+    def fold(self, entries: List[Dict[str, Any]], first_retained_seq: int) -> None:
+        """Add entries (oldest first, all newer than summarized_through)."""
+        # Entries the log dropped before they were folded are only counted
+        missing = first_retained_seq - self.summarized_through - 1
+        if missing > 0:
+            self.not_retained += missing
+            self.summarized_through = first_retained_seq - 1
+        for entry in entries:
+            action = entry.get("action", "interaction")
+            self.actions[action] += 1
+            if action == "user_query":
+                self.topics.append(entry.get("query", "")[:60])
+            elif action == "purchase_course":
+                self.purchased.append(str(entry.get("course_id")))
+            elif action == "refund_course":
+                self.refunded.append(str(entry.get("course_id")))
+            self.summarized_through = entry["seq"]
+
+    def render(self) -> str:
+        total = sum(self.actions.values()) + self.not_retained
+        if total == 0:
+            return ""
+        counts = ", ".join(f"{count} {action}" for action, count in self.actions.items())
+        if self.not_retained:
+            counts += f"{', ' if counts else ''}{self.not_retained} not retained"
+        lines = [f"Summary of {total} earlier interactions: {counts}."]
+        if self.purchased:
+            lines.append(f"Courses purchased earlier: {', '.join(self.purchased)}.")
+        if self.refunded:
+            lines.append(f"Courses refunded earlier: {', '.join(self.refunded)}.")
+        if self.topics:
+            topics = "; ".join(f'"{topic}"' for topic in self.topics)
+            lines.append(f"Most recent earlier user queries: {topics}.")
+        return "\n".join(lines)
+
+
+_summaries: "weakref.WeakKeyDictionary[InteractionLog, _Summary]" = (
+    weakref.WeakKeyDictionary()
+)
+_savings: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def render_history(
+    log: InteractionLog,
+    recent_entries: int = HISTORY_RECENT_ENTRIES,
+    token_budget: int = HISTORY_TOKEN_BUDGET,
+) -> str:
+    """
+    Render the newest interactions verbatim and a summary of older ones.
+
+    If the rendered history is over the token budget, the oldest interactions
+    of the window are moved into the summary for this rendering.
+    """
+    recent = log.latest(recent_entries)
+    with _lock:
+        summary = _summaries.setdefault(log, _Summary())
+        if recent:
+            summary.fold(
+                log.read(start=summary.summarized_through + 1, end=recent[0]["seq"]),
+                log.first_seq,
+            )
+        summary = copy.deepcopy(summary)
+
+    lines = []
+    for entry in recent:
+        line = f"{entry['seq']}. {format_entry(entry)}"
+        if len(line) > MAX_ENTRY_CHARS:
+            line = line[: MAX_ENTRY_CHARS - 3] + "..."
+        lines.append(line)
+
+    text = format_history([])
+    while lines:
+        text = "\n".join(filter(None, [summary.render(), *lines]))
+        if estimate_tokens(text) <= token_budget or len(lines) == 1:
+            break
+        summary.fold([recent.pop(0)], log.first_seq)
+        lines.pop(0)
+    return text
+
+
+def render_courses(purchased_courses: Any) -> str:
+    """Render purchased courses as one short line each, newest last."""
+    if not purchased_courses:
+        return "None"
+    if not isinstance(purchased_courses, list):
+        return str(purchased_courses)
+    lines = []
+    for course in purchased_courses[-MAX_COURSES_SHOWN:]:
+        if isinstance(course, dict):
+            lines.append(
+                f"- {course.get('id', 'unknown')}"
+                f" (purchased {course.get('purchase_date', 'unknown date')})"
+            )
+        elif course:
+            lines.append(f"- {course}")
+    hidden = len(purchased_courses) - MAX_COURSES_SHOWN
+    if hidden > 0:
+        lines.insert(0, f"({hidden} older purchases not shown)")
+    return "\n".join(lines) or "None"
+
+
+def _record_savings(invocation_id: str, full_tokens: int, windowed_tokens: int):
+    """Add one rendered instruction to its invocation's savings."""
+    with _lock:
+        totals = _savings.setdefault(
+            invocation_id,
+            {"renders": 0, "full_tokens": 0, "windowed_tokens": 0, "saved_tokens": 0},
+        )
+        totals["renders"] += 1
+        totals["full_tokens"] += full_tokens
+        totals["windowed_tokens"] += windowed_tokens
+        totals["saved_tokens"] += full_tokens - windowed_tokens
+        _savings.move_to_end(invocation_id)
+        while len(_savings) > SAVINGS_MAX_INVOCATIONS:
+            _savings.popitem(last=False)
+
+
+def get_prompt_savings(invocation_id: str) -> Optional[Dict[str, int]]:
+    """
+    Return the prompt token savings of one invocation (one user turn).
+
+    Returns:
+        Dict with renders, full_tokens (verbatim history and courses),
+        windowed_tokens (what was sent) and saved_tokens, or None
+    """
+    with _lock:
+        totals = _savings.get(invocation_id)
+        return dict(totals) if totals else None
+
+
+# Matches "{key}" and "{key|default}" placeholders in instruction templates
+_PLACEHOLDER = re.compile(r"\{(\w+)(?:\|([^{}]*))?\}")
+
+
+def windowed_instruction(
+    template: str,
+    recent_entries: int = HISTORY_RECENT_ENTRIES,
+    token_budget: int = HISTORY_TOKEN_BUDGET,
+) -> Callable[[Any], str]:
+    """
+    Build an instruction provider that fills a template when the agent runs.
+
+    `{interaction_history}` is replaced with the windowed history and
+    `{purchased_courses}` with a compact course list. Other `{key}` /
+    `{key|default}` placeholders are filled from session state, using the
+    default when the key is missing.
+
+    Args:
+        template: The instruction text with placeholders
+        recent_entries: Interactions shown verbatim
+        token_budget: Maximum tokens for the history section
+
+    Returns:
+        Callable[[ReadonlyContext], str]: The instruction provider
+    """
+
+    def provider(context) -> str:
+        usage: List[Tuple[str, str]] = []  # (verbatim, windowed) per placeholder
+
+        def fill(match: "re.Match[str]") -> str:
+            key, default = match.group(1), match.group(2)
+            if key == "interaction_history":
+                log = log_for_context(context)
+                text = render_history(log, recent_entries, token_budget)
+                usage.append((format_history(log.read()), text))
+                return text
+            if key == "purchased_courses":
+                courses = context.state.get(key, [])
+                text = render_courses(courses)
+                usage.append((str(courses), text))
+                return text
+            if key in context.state:
+                return str(context.state[key])
+            return default if default is not None else match.group(0)
+
+        instruction = _PLACEHOLDER.sub(fill, template)
+        if usage:
+            _record_savings(
+                context.invocation_id,
+                sum(estimate_tokens(full) for full, _ in usage),
+                sum(estimate_tokens(windowed) for _, windowed in usage),
+            )
+        return instruction
+
+    return provider
@@ -0,0 +1,244 @@
+"""
+Interaction Log
+
+An append-only log of the interactions in each session (user queries, agent
+responses, purchases and refunds).
+
+Keeping the history as a list in session state meant that every new entry
+copied the whole state and wrote the whole list back, so a conversation of n
+turns cost O(n^2). The log lives next to the session instead: appending is
+O(1), old entries are dropped once `INTERACTION_LOG_MAX_ENTRIES` are retained,
+and entries can be read by sequence number range.
+
+The log is stored with the session as side data when the session service
+supports it (`session_extras`, see bounded_session_service.py), so it is
+counted in the session's size, spilled and reloaded with it, and deleted with
+it. Other session services get a log from a small in-process cache of the
+`LOG_CACHE_SIZE` most recently used logs.
+
+Tools and instructions only see the session through their context, so the
+application registers its session service once with `use_session_service`.
+
+Agent instructions render the log through the context window
+(context_window.py).
+"""
+
+import json
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# --- Constants ---
+INTERACTION_LOG_MAX_ENTRIES = 200  # Oldest entries are dropped beyond this
+EXTRAS_KEY = "interaction_log"  # Key of the log in the session's side data
+LOG_CACHE_SIZE = 256  # Logs kept for session services without side data
+NO_HISTORY_TEXT = "No previous interactions"
+
+
+def _entry_size(entry: Dict[str, Any]) -> int:
+    return len(json.dumps(entry, default=str))
+
+
+class InteractionLog:
+    """
+    The interaction history of one session.
+
+    Every entry gets a sequence number (starting at 1) that stays the same
+    when older entries are dropped, so callers can read "everything after the
+    last entry I saw" with `read(start=last_seq + 1)`.
+    """
+
+    def __init__(self, max_entries: int = INTERACTION_LOG_MAX_ENTRIES):
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self.nbytes = 0  # JSON size of the retained entries
+        self.on_change: Optional[Callable[[], None]] = None  # Called after append
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot the log as JSON-serializable data."""
+        with self._lock:
+            return {
+                "max_entries": self._entries.maxlen,
+                "next_seq": self._next_seq,
+                "entries": list(self._entries),
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InteractionLog":
+        """Rebuild a log from `to_dict()` data."""
+        log = cls(data.get("max_entries") or INTERACTION_LOG_MAX_ENTRIES)
+        log._entries.extend(data.get("entries", []))
+        log._next_seq = data.get("next_seq", log.first_seq + len(log._entries))
+        log.nbytes = sum(_entry_size(entry) for entry in log._entries)
+        return log
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained entry."""
+        return self._next_seq - len(self._entries)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest entry (0 if nothing was appended)."""
+        return self._next_seq - 1
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """
+        Append an entry, adding a timestamp if it has none.
+
+        Args:
+            entry: Interaction data with an 'action' key (e.g. 'user_query')
+
+        Returns:
+            int: The entry's sequence number
+        """
+        entry = dict(entry)
+        entry.setdefault("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        with self._lock:
+            entry["seq"] = seq = self._next_seq
+            if len(self._entries) == self._entries.maxlen:
+                self.nbytes -= _entry_size(self._entries[0])
+            self._entries.append(entry)
+            self.nbytes += _entry_size(entry)
+            self._next_seq += 1
+        if self.on_change:
+            self.on_change()
+        return seq
+
+    def read(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Read the retained entries with start <= seq < end.
+
+        Args:
+            start: First sequence number to return (default: oldest retained)
+            end: Sequence number to stop before (default: after the newest)
+
+        Returns:
+            List[Dict[str, Any]]: Entries, oldest first
+        """
+        with self._lock:
+            first = self._next_seq - len(self._entries)
+            low = max(first, start if start is not None else first)
+            high = min(self._next_seq, end if end is not None else self._next_seq)
+            if low >= high:
+                return []
+            return list(islice(self._entries, low - first, high - first))
+
+    def latest(self, count: int) -> List[Dict[str, Any]]:
+        """Read the newest `count` entries, oldest first."""
+        return self.read(start=self._next_seq - count) if count > 0 else []
+
+
+# The session service logs are stored with (see use_session_service)
+_session_service = None
+
+# Fallback for session services that cannot store side data, least recently
+# used first
+_logs: "OrderedDict[Tuple[str, str, str], InteractionLog]" = OrderedDict()
+_logs_lock = threading.Lock()
+
+
+def use_session_service(session_service) -> None:
+    """Store the logs with the sessions of this service (call once at startup)."""
+    global _session_service
+    _session_service = session_service
+
+
+def _stored_log(
+    session_service, app_name: str, user_id: str, session_id: str
+) -> Optional[InteractionLog]:
+    """The log kept in the session's side data (None if that is unsupported)."""
+    session_extras = getattr(session_service, "session_extras", None)
+    extras = session_extras(app_name, user_id, session_id) if session_extras else None
+    if extras is None:
+        return None
+    log = extras.get(EXTRAS_KEY)
+    if not isinstance(log, InteractionLog):
+        # New, or reloaded from disk as to_dict() data
+        log = InteractionLog.from_dict(log) if log else InteractionLog()
+        extras[EXTRAS_KEY] = log
+        session_service.extras_changed(app_name, user_id, session_id)
+    if log.on_change is None:
+        log.on_change = lambda: session_service.extras_changed(
+            app_name, user_id, session_id
+        )
+    return log
+
+
+def get_interaction_log(
+    app_name: str, user_id: str, session_id: str, session_service=None
+) -> InteractionLog:
+    """
+    Return the interaction log of a session, creating it on first use.
+
+    Args:
+        app_name: The application name
+        user_id: The user ID
+        session_id: The session ID
+        session_service: The session service holding the session (default:
+            the one passed to use_session_service); the log is stored with the
+            session if the service supports side data
+
+    Returns:
+        InteractionLog: The session's log
+    """
+    session_service = session_service or _session_service
+    if session_service is not None:
+        log = _stored_log(session_service, app_name, user_id, session_id)
+        if log is not None:
+            return log
+    key = (app_name, user_id, session_id)
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = InteractionLog()
+            while len(_logs) > LOG_CACHE_SIZE:
+                _logs.popitem(last=False)
+        else:
+            _logs.move_to_end(key)
+        return log
+
+
+def delete_interaction_log(app_name: str, user_id: str, session_id: str) -> None:
+    """Drop a log from the fallback cache (stored logs go with their session)."""
+    with _logs_lock:
+        _logs.pop((app_name, user_id, session_id), None)
+
+
+def log_for_context(context) -> InteractionLog:
+    """Return the interaction log of the session a tool or instruction runs in."""
+    session = context.session
+    return get_interaction_log(session.app_name, session.user_id, session.id)
+
+
+def format_entry(entry: Dict[str, Any]) -> str:
+    """Render one interaction as a single line."""
+    action = entry.get("action", "interaction")
+    timestamp = entry.get("timestamp", "unknown time")
+    if action == "user_query":
+        return f'User query at {timestamp}: "{entry.get("query", "")}"'
+    if action == "agent_response":
+        return (
+            f'{entry.get("agent", "unknown")} response at {timestamp}:'
+            f' "{entry.get("response", "")}"'
+        )
+    details = ", ".join(
+        f"{k}: {v}" for k, v in entry.items() if k not in ("action", "timestamp", "seq")
+    )
+    return f"{action} at {timestamp}" + (f" ({details})" if details else "")
+
+
+def format_history(entries: List[Dict[str, Any]]) -> str:
+    """Render interactions as numbered lines for a prompt."""
+    if not entries:
+        return NO_HISTORY_TEXT
+    return "\n".join(f"{entry['seq']}. {format_entry(entry)}" for entry in entries)
+
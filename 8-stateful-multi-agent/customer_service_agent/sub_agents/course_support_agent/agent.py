@@ -1,11 +1,14 @@
 from google.adk.agents import Agent
 
+from ...context_window import windowed_instruction
+
 # Create the course support agent
 course_support_agent = Agent(
     name="course_support",
     model="gemini-2.0-flash",
     description="Course support agent for the AI Marketing Platform course",
-    instruction="""
+    instruction=windowed_instruction(
+        """
     You are the course support agent for the Fullstack AI Marketing Platform course.
     Your role is to help users with questions about course content and sections.
 
@@ -138,6 +141,7 @@ course_support_agent = Agent(
     2. Explain concepts clearly
     3. Provide context for how sections connect
     4. Encourage hands-on practice
-    """,
+    """
+    ),
     tools=[],
 )
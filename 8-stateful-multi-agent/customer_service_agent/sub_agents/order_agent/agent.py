@@ -3,6 +3,9 @@ from datetime import datetime
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from ...context_window import windowed_instruction
+from ...interaction_log import log_for_context
+
 
 def get_current_time() -> dict:
     """Get the current time in the format YYYY-MM-DD HH:MM:SS"""
@@ -47,18 +50,11 @@ def refund_course(tool_context: ToolContext) -> dict:
     # Update purchased courses in state via assignment
     tool_context.state["purchased_courses"] = new_purchased_courses
 
-    # Get current interaction history
-    current_interaction_history = tool_context.state.get("interaction_history", [])
-
-    # Create new interaction history with refund added
-    new_interaction_history = current_interaction_history.copy()
-    new_interaction_history.append(
+    # Record the refund in the session's interaction log
+    log_for_context(tool_context).append(
         {"action": "refund_course", "course_id": course_id, "timestamp": current_time}
     )
 
-    # Update interaction history in state via assignment
-    tool_context.state["interaction_history"] = new_interaction_history
-
     return {
         "status": "success",
         "message": """Successfully refunded the AI Marketing Platform course! 
@@ -73,7 +69,8 @@ order_agent = Agent(
     name="order_agent",
     model="gemini-2.0-flash",
     description="Order agent for viewing purchase history and processing refunds",
-    instruction="""
+    instruction=windowed_instruction(
+        """
     You are the order agent for the AI Developer Accelerator community.
     Your role is to help users view their purchase history, course access, and process refunds.
 
@@ -129,6 +126,7 @@ order_agent = Agent(
     - Mention our 30-day money-back guarantee if relevant
     - Direct course questions to course support
     - Direct purchase inquiries to sales
-    """,
+    """
+    ),
     tools=[refund_course, get_current_time],
 )
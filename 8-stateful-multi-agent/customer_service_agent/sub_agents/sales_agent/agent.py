@@ -3,6 +3,9 @@ from datetime import datetime
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
+from ...context_window import windowed_instruction
+from ...interaction_log import log_for_context
+
 
 def purchase_course(tool_context: ToolContext) -> dict:
     """
@@ -35,18 +38,11 @@ def purchase_course(tool_context: ToolContext) -> dict:
     # Update purchased courses in state via assignment
     tool_context.state["purchased_courses"] = new_purchased_courses
 
-    # Get current interaction history
-    current_interaction_history = tool_context.state.get("interaction_history", [])
-
-    # Create new interaction history with purchase added
-    new_interaction_history = current_interaction_history.copy()
-    new_interaction_history.append(
+    # Record the purchase in the session's interaction log
+    log_for_context(tool_context).append(
         {"action": "purchase_course", "course_id": course_id, "timestamp": current_time}
     )
 
-    # Update interaction history in state via assignment
-    tool_context.state["interaction_history"] = new_interaction_history
-
     return {
         "status": "success",
         "message": "Successfully purchased the AI Marketing Platform course!",
@@ -60,7 +56,8 @@ sales_agent = Agent(
     name="sales_agent",
     model="gemini-2.0-flash",
     description="Sales agent for the AI Marketing Platform course",
-    instruction="""
+    instruction=windowed_instruction(
+        """
     You are a sales agent for the AI Developer Accelerator community, specifically handling sales
     for the Fullstack AI Marketing Platform course.
 
@@ -107,6 +104,7 @@ sales_agent = Agent(
     - Be helpful but not pushy
     - Focus on the value and practical skills they'll gain
     - Emphasize the hands-on nature of building a real AI application
-    """,
+    """
+    ),
     tools=[purchase_course],
 )
@@ -2,24 +2,35 @@ import asyncio
 
 # Import the main customer service agent
 from customer_service_agent.agent import customer_service_agent
+from customer_service_agent.interaction_log import (
+    get_interaction_log,
+    use_session_service,
+)
 from dotenv import load_dotenv
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from tiered_session_service import TieredSessionService
 from utils import add_user_query_to_history, call_agent_async
 
 load_dotenv()
 
-# ===== PART 1: Initialize In-Memory Session Service =====
-# Using in-memory storage for this example (non-persistent)
-session_service = InMemorySessionService()
+# ===== PART 1: Initialize Tiered Session Service =====
+# Active sessions are kept in memory. Sessions idle for an hour, or the least
+# recently used ones once all sessions use more than 64 MB, are spilled to
+# compressed files in ./session_spill and reloaded when they are used again.
+session_service = TieredSessionService(
+    spill_dir="./session_spill",
+    idle_ttl_seconds=60 * 60,
+    max_bytes=64 * 1024 * 1024,
+)
+# Keep each session's interaction log with the session
+use_session_service(session_service)
 
 
 # ===== PART 2: Define Initial State =====
-# This will be used when creating a new session
+# This will only be used when creating a new session
 initial_state = {
     "user_name": "Brandon Hancock",
     "purchased_courses": [],
-    "interaction_history": [],
 }
 
 
@@ -28,15 +39,23 @@ async def main_async():
     APP_NAME = "Customer Support"
     USER_ID = "aiwithbrandon"
 
-    # ===== PART 3: Session Creation =====
-    # Create a new session with initial state
-    new_session = session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        state=initial_state,
-    )
-    SESSION_ID = new_session.id
-    print(f"Created new session: {SESSION_ID}")
+    # ===== PART 3: Session Management - Find or Create =====
+    # Continue this user's most recent session, so a warm restart has it in
+    # memory already and the spill directory does not gain a file per run
+    existing = await session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+    if existing.sessions:
+        # Sessions are listed oldest first
+        SESSION_ID = existing.sessions[-1].id
+        print(f"Continuing existing session: {SESSION_ID}")
+    else:
+        # Create a new session with initial state
+        new_session = await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            state=initial_state,
+        )
+        SESSION_ID = new_session.id
+        print(f"Created new session: {SESSION_ID}")
 
     # ===== PART 4: Agent Runner Setup =====
     # Create a runner with the main customer service agent
@@ -69,12 +88,28 @@ async def main_async():
 
     # ===== PART 6: State Examination =====
     # Show final session state
-    final_session = session_service.get_session(
+    final_session = await session_service.get_session(
         app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
     )
     print("\nFinal Session State:")
     for key, value in final_session.state.items():
         print(f"{key}: {value}")
+    interaction_log = get_interaction_log(
+        APP_NAME, USER_ID, SESSION_ID, session_service
+    )
+    print(f"interaction_history: {len(interaction_log)} entries")
+
+    # Show how much memory the sessions use
+    metrics = session_service.metrics()
+    print(
+        f"\nSession memory: {metrics['sessions']} sessions, "
+        f"{metrics['total_bytes']} bytes "
+        f"(spilled: {metrics['spilled']}, reloaded: {metrics['reloaded']})"
+    )
+
+    # Write changed sessions (with their interaction logs) and remember the hot
+    # sessions for a warm restart
+    await session_service.close()
 
 
 def main():
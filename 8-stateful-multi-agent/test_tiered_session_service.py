@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the tiered session service.
+
+Sessions are moved between memory and disk with a fake clock, and each test
+uses a fresh spill directory.
+
+Usage:
+    python test_tiered_session_service.py
+"""
+
+import asyncio
+import tempfile
+
+from customer_service_agent.interaction_log import get_interaction_log
+from google.adk.events import Event, EventActions
+from tiered_session_service import TieredSessionService
+
+APP_NAME = "Customer Support"
+USER_ID = "aiwithbrandon"
+IDLE_TTL_SECONDS = 10
+
+
+class FakeClock:
+    """A clock that only moves when the test advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_service(spill_dir, clock):
+    return TieredSessionService(
+        spill_dir=spill_dir,
+        flush_interval=0.01,
+        idle_ttl_seconds=IDLE_TTL_SECONDS,
+        clock=clock,
+    )
+
+
+def test_idle_session_is_kept_when_accessed():
+    async def scenario(spill_dir):
+        clock = FakeClock()
+        service = make_service(spill_dir, clock)
+        session = await service.create_session(
+            app_name=APP_NAME, user_id=USER_ID, state={"x": 1}
+        )
+        key = dict(app_name=APP_NAME, user_id=USER_ID, session_id=session.id)
+
+        # Idle for longer than the TTL, then used again
+        clock.now += 2 * IDLE_TTL_SECONDS
+        assert await service.get_session(**key) is not None
+
+        clock.now += 2 * IDLE_TTL_SECONDS
+        event = Event(
+            author="user", invocation_id="1", actions=EventActions(state_delta={"x": 2})
+        )
+        await service.append_event(session, event)
+
+        clock.now += 2 * IDLE_TTL_SECONDS
+        get_interaction_log(APP_NAME, USER_ID, session.id, service).append(
+            {"action": "user_query", "query": "hello"}
+        )
+
+        stored = await service.get_session(**key)
+        assert stored.state["x"] == 2
+        assert len(stored.events) == 1
+        log = get_interaction_log(APP_NAME, USER_ID, session.id, service)
+        assert [entry["query"] for entry in log.read()] == ["hello"]
+        assert service.metrics()["events_for_missing_sessions"] == 0
+        await service.close()
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        asyncio.run(scenario(spill_dir))
+    print("✅ An idle session is not lost by the call that uses it")
+
+
+def test_spilled_session_is_reloaded_with_its_log():
+    async def scenario(spill_dir):
+        clock = FakeClock()
+        service = make_service(spill_dir, clock)
+        active = await service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        idle = await service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        get_interaction_log(APP_NAME, USER_ID, idle.id, service).append(
+            {"action": "user_query", "query": "before the spill"}
+        )
+
+        # Using another session expires the idle one to disk
+        clock.now += 2 * IDLE_TTL_SECONDS
+        await service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=active.id
+        )
+        assert service.metrics()["spilled"] == 1
+
+        log = get_interaction_log(APP_NAME, USER_ID, idle.id, service)
+        assert [entry["query"] for entry in log.read()] == ["before the spill"]
+        assert service.metrics()["reloaded"] == 1
+        await service.close()
+
+        # A warm restart loads both sessions, with the log
+        restarted = make_service(spill_dir, clock)
+        assert restarted.metrics()["sessions"] == 2
+        log = get_interaction_log(APP_NAME, USER_ID, idle.id, restarted)
+        assert log.last_seq == 1
+        await restarted.close()
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        asyncio.run(scenario(spill_dir))
+    print("✅ A spilled session comes back with its interaction log")
+
+
+if __name__ == "__main__":
+    test_idle_session_is_kept_when_accessed()
+    test_spilled_session_is_reloaded_with_its_log()
@@ -0,0 +1,439 @@
+"""
+Tiered Session Service
+
+Sessions in memory while they are active, on disk while they are idle.
+
+`InMemorySessionService` is fast but unbounded and loses everything on exit;
+`DatabaseSessionService` is durable but goes to the database on every access.
+This service sits in between:
+
+- Hot tier: active sessions are kept in memory, exactly like
+  `BoundedInMemorySessionService`
+- Cold tier: sessions that go idle (or are evicted for memory) are spilled to
+  one zlib-compressed file each and reloaded transparently on the next access
+- Dirty sessions are written in the background every `flush_interval` seconds,
+  off the request path, so spilling a session usually just drops it from
+  memory
+- `close()` writes the remaining changes and a list of the sessions in memory;
+  the next start loads those sessions again (a warm restart)
+- Side data stored with a session (`session_extras`, e.g. the interaction
+  log) is written and reloaded with it; values with a `to_dict()` method are
+  saved as its result and come back as that plain data
+
+Every change gets a version number from one counter, and a file is only
+replaced by a newer version, so a background write that finishes late can
+never overwrite a newer spill.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import threading
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from bounded_session_service import (
+    BoundedInMemorySessionService,
+    SessionKey,
+    _extra_size,
+    _StoredSession,
+)
+from google.adk.events import Event
+from google.adk.sessions import Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+# --- Constants ---
+SESSION_FILE_SUFFIX = ".session.zz"
+SHARED_STATE_FILE = "shared_state.zz"  # app: and user: state
+WARM_SESSIONS_FILE = "warm_sessions.json"  # Sessions in memory at shutdown
+COMPRESSION_LEVEL = 6
+
+
+def _encode_key(key: SessionKey) -> str:
+    """File name for a session (reversible, safe for any ids)."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=") + SESSION_FILE_SUFFIX
+
+
+def _decode_key(file_name: str) -> SessionKey:
+    encoded = file_name[: -len(SESSION_FILE_SUFFIX)]
+    raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    return tuple(json.loads(raw))
+
+
+def _write_compressed(path: str, payload: Dict[str, Any]) -> None:
+    """Write a payload atomically (temporary file, then rename)."""
+    data = zlib.compress(json.dumps(payload).encode(), COMPRESSION_LEVEL)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def _read_compressed(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+    return json.loads(zlib.decompress(data))
+
+
+class TieredSessionService(BoundedInMemorySessionService):
+    """
+    A session service with an in-memory hot tier and an on-disk cold tier.
+
+    Args:
+        spill_dir: Directory for the session files (created if missing)
+        flush_interval: Seconds between background writes of changed sessions
+        warm_start: Load the sessions that were in memory at the last close()
+        **kwargs: idle_ttl_seconds, max_bytes, on_evict and clock, as for
+            BoundedInMemorySessionService. Idle or evicted sessions are
+            spilled, not dropped, so on_evict is only called for sessions
+            that leave both tiers (never, unless deleted).
+    """
+
+    def __init__(
+        self,
+        spill_dir: str = "./session_spill",
+        flush_interval: float = 1.0,
+        warm_start: bool = True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.spill_dir = spill_dir
+        self.flush_interval = flush_interval
+        os.makedirs(spill_dir, exist_ok=True)
+
+        self._version = 0  # Increases with every change
+        self._versions: Dict[SessionKey, int] = {}  # Version in memory
+        self._disk_versions: Dict[SessionKey, int] = {}  # Version on disk
+        self._disk_lock = threading.Lock()
+        self._dirty: set = set()
+        self._shared_dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._writes: set = set()  # Background writes still running
+        self._counters.update({"spilled": 0, "reloaded": 0, "flushed": 0})
+
+        self._load_shared_state()
+        if warm_start:
+            self._load_warm_sessions()
+
+    # --- Disk tier ---
+
+    def _path(self, key: SessionKey) -> str:
+        return os.path.join(self.spill_dir, _encode_key(key))
+
+    def _payload(self, key: SessionKey, stored: _StoredSession) -> Dict[str, Any]:
+        """Snapshot a session for writing (events are encoded by the writer)."""
+        session = stored.session
+        return {
+            "app_name": session.app_name,
+            "user_id": session.user_id,
+            "id": session.id,
+            "last_update_time": session.last_update_time,
+            "version": self._versions.get(key, 0),
+            "state": json.loads(json.dumps(session.state, default=str)),
+            "events": list(session.events),
+            "extras": {
+                name: value.to_dict() if hasattr(value, "to_dict") else value
+                for name, value in stored.extras.items()
+            },
+        }
+
+    def _write_session(self, key: SessionKey, payload: Dict[str, Any]) -> bool:
+        """Write a session file unless the file already has a newer version."""
+        payload = dict(payload)
+        payload["events"] = [
+            event.model_dump_json(exclude_none=True) for event in payload["events"]
+        ]
+        with self._disk_lock:
+            if self._disk_versions.get(key, -1) >= payload["version"]:
+                return False
+            _write_compressed(self._path(key), payload)
+            self._disk_versions[key] = payload["version"]
+            return True
+
+    def _read_session(self, key: SessionKey) -> Optional[Tuple[_StoredSession, int]]:
+        """Load a spilled session and its version (None if there is no file)."""
+        payload = _read_compressed(self._path(key))
+        if payload is None:
+            return None
+        session = Session(
+            id=payload["id"],
+            app_name=payload["app_name"],
+            user_id=payload["user_id"],
+            state=payload["state"],
+            events=[Event.model_validate_json(event) for event in payload["events"]],
+            last_update_time=payload["last_update_time"],
+        )
+        stored = _StoredSession(session, self._clock())
+        stored.events_bytes = sum(len(event) for event in payload["events"])
+        stored.extras = payload.get("extras") or {}
+        stored.extras_bytes = sum(map(_extra_size, stored.extras.values()))
+        with self._disk_lock:
+            self._disk_versions.setdefault(key, payload["version"])
+        return stored, payload["version"]
+
+    def _insert(self, key: SessionKey, loaded: Tuple[_StoredSession, int]) -> None:
+        """Put a loaded session into the memory tier as most recently used."""
+        stored, version = loaded
+        self._versions[key] = version
+        self._version = max(self._version, version)
+        self._sessions[key] = stored
+        self._total_bytes += stored.size
+        self._counters["reloaded"] += 1
+        self._enforce_memory_cap()
+
+    async def _ensure_loaded(self, key: SessionKey) -> None:
+        """Reload a spilled session into memory before it is used."""
+        if key in self._sessions:
+            return
+        loaded = await asyncio.to_thread(self._read_session, key)
+        # Another task may have loaded it while this one was reading
+        if loaded is not None and key not in self._sessions:
+            self._insert(key, loaded)
+
+    def _load_shared_state(self) -> None:
+        payload = _read_compressed(os.path.join(self.spill_dir, SHARED_STATE_FILE))
+        if payload:
+            self._app_state = payload["app_state"]
+            self._user_state = {
+                tuple(json.loads(key)): state
+                for key, state in payload["user_state"].items()
+            }
+
+    def _write_shared_state(self) -> None:
+        payload = {
+            "app_state": self._app_state,
+            "user_state": {
+                json.dumps(list(key)): state for key, state in self._user_state.items()
+            },
+        }
+        with self._disk_lock:
+            _write_compressed(os.path.join(self.spill_dir, SHARED_STATE_FILE), payload)
+
+    def _load_warm_sessions(self) -> None:
+        """Reload the sessions that were in memory at the last shutdown."""
+        try:
+            with open(os.path.join(self.spill_dir, WARM_SESSIONS_FILE)) as file:
+                file_names = json.load(file)
+        except FileNotFoundError:
+            return
+        for file_name in file_names:  # Least recently used first
+            key = _decode_key(file_name)
+            loaded = self._read_session(key)
+            if loaded is not None:
+                self._insert(key, loaded)
+
+    # --- Change tracking and flushing ---
+
+    def _mark_dirty(self, key: SessionKey, delta: Optional[Dict[str, Any]]) -> None:
+        """Record a change and make sure a background flush is scheduled."""
+        self._version += 1
+        self._versions[key] = self._version
+        self._dirty.add(key)
+        if delta and any(
+            name.startswith((State.APP_PREFIX, State.USER_PREFIX)) for name in delta
+        ):
+            self._shared_dirty = True
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_after_interval()
+            )
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except OSError:
+            logger.exception("Writing changed sessions failed")
+
+    async def flush(self) -> None:
+        """Write all changed sessions (and shared state) to disk."""
+        dirty, self._dirty = self._dirty, set()
+        payloads = {
+            key: self._payload(key, self._sessions[key])
+            for key in dirty
+            if key in self._sessions
+        }
+        shared_dirty, self._shared_dirty = self._shared_dirty, False
+        write = asyncio.ensure_future(
+            asyncio.to_thread(self._write_all, payloads, shared_dirty)
+        )
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+        try:
+            # A cancelled flush still finishes its write (close() waits for it)
+            written = await asyncio.shield(write)
+        except OSError:
+            # Keep the changes so the next flush tries again
+            self._dirty |= dirty
+            self._shared_dirty = self._shared_dirty or shared_dirty
+            raise
+        self._counters["flushed"] += written
+
+    def _write_all(
+        self, payloads: Dict[SessionKey, Dict[str, Any]], shared: bool
+    ) -> int:
+        written = sum(self._write_session(key, p) for key, p in payloads.items())
+        if shared:
+            self._write_shared_state()
+        return written
+
+    async def close(self) -> None:
+        """Write all changes and remember the memory tier for a warm restart."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        file_names = [_encode_key(key) for key in self._sessions]
+        with open(os.path.join(self.spill_dir, WARM_SESSIONS_FILE), "w") as file:
+            json.dump(file_names, file)
+
+    # --- Tier transitions ---
+
+    def _remove(self, key: SessionKey, reason: Optional[str] = None) -> None:
+        """Spill expired or evicted sessions; delete sessions for good otherwise."""
+        if reason is None:
+            super()._remove(key)
+            self._dirty.discard(key)
+            self._versions.pop(key, None)
+            with self._disk_lock:
+                # Late background writes of this session must not recreate it
+                self._disk_versions[key] = self._version
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            return
+
+        stored = self._sessions.pop(key, None)
+        if stored is None:
+            return
+        # Write it now unless the newest version is already on disk
+        if self._disk_versions.get(key, -1) < self._versions.get(key, 0):
+            self._write_session(key, self._payload(key, stored))
+        self._dirty.discard(key)
+        self._total_bytes -= stored.size
+        self._counters[reason] += 1
+        self._counters["spilled"] += 1
+
+    def _touch(self, key: SessionKey) -> Optional[_StoredSession]:
+        """Mark a session as used before idle sessions are expired.
+
+        Otherwise a session idle for longer than the TTL would be spilled by
+        the very call that uses it, and that call would find it missing.
+        """
+        stored = self._sessions.get(key)
+        if stored is not None:
+            # Keep the sessions in least-recently-used order for _expire_idle
+            stored.last_access = self._clock()
+            self._sessions.move_to_end(key)
+        return super()._touch(key)
+
+    # --- Session service API ---
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        key = (app_name, user_id, session_id)
+        if key not in self._sessions and os.path.exists(self._path(key)):
+            raise ValueError(f"Session {session_id} already exists.")
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._mark_dirty(key, state)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self._ensure_loaded((app_name, user_id, session_id))
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        """List sessions in both tiers (with state, without events)."""
+        response = await super().list_sessions(app_name=app_name, user_id=user_id)
+        spilled = [
+            key
+            for key in map(_decode_key, self._session_files())
+            if key[0] == app_name
+            and (user_id is None or key[1] == user_id)
+            and key not in self._sessions
+        ]
+        for loaded in await asyncio.to_thread(
+            lambda: [self._read_session(key) for key in spilled]
+        ):
+            if loaded is not None:
+                session = loaded[0].session
+                response.sessions.append(
+                    self._copy(session, self._merged_state(session), events=[])
+                )
+        response.sessions.sort(key=lambda session: session.last_update_time)
+        return response
+
+    def _session_files(self) -> List[str]:
+        return [
+            name
+            for name in os.listdir(self.spill_dir)
+            if name.endswith(SESSION_FILE_SUFFIX)
+        ]
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        await self._ensure_loaded(key)
+        event = await super().append_event(session=session, event=event)
+        if not event.partial and key in self._sessions:
+            self._mark_dirty(key, event.actions.state_delta if event.actions else None)
+        return event
+
+    def session_extras(
+        self, app_name: str, user_id: str, session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Side data of a session, reloading the session if it was spilled."""
+        key = (app_name, user_id, session_id)
+        if key not in self._sessions:
+            loaded = self._read_session(key)
+            if loaded is not None:
+                self._insert(key, loaded)
+        return super().session_extras(app_name, user_id, session_id)
+
+    def extras_changed(self, app_name: str, user_id: str, session_id: str) -> None:
+        """Re-measure a session's side data and schedule it to be written."""
+        super().extras_changed(app_name, user_id, session_id)
+        key = (app_name, user_id, session_id)
+        if key in self._sessions:
+            self._mark_dirty(key, None)
+
+    def metrics(self, top_n: int = 5) -> Dict[str, Any]:
+        """Memory tier metrics plus spill, reload and flush counters."""
+        metrics = super().metrics(top_n)
+        metrics["dirty_sessions"] = len(self._dirty)
+        return metrics
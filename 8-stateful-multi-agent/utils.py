@@ -1,5 +1,7 @@
-from datetime import datetime
+import os
 
+from customer_service_agent.context_window import get_prompt_savings
+from customer_service_agent.interaction_log import format_entry, get_interaction_log
 from google.genai import types
 
 
@@ -30,11 +32,27 @@ class Colors:
     BG_WHITE = "\033[47m"
 
 
+# Last known state and last printed interaction per (app_name, user_id,
+# session_id), kept up to date from event state deltas so diagnostics never
+# re-read the session
+_known_states = {}
+_last_printed_seq = {}
+
+
+def diagnostics_enabled():
+    """Check whether state diagnostics are on (set STATE_DIAGNOSTICS=1 to enable)."""
+    return os.getenv("STATE_DIAGNOSTICS", "").lower() in ("1", "true", "yes", "on")
+
+
 def update_interaction_history(session_service, app_name, user_id, session_id, entry):
-    """Add an entry to the interaction history in state.
+    """Append an entry to the session's interaction log.
+
+    The log is append-only and kept outside session state, so adding an entry
+    does not re-read or rewrite the session. It is stored with the session in
+    the session service.
 
     Args:
-        session_service: The session service instance
+        session_service: The session service instance holding the session
         app_name: The application name
         user_id: The user ID
         session_id: The session ID
@@ -43,31 +61,8 @@ def update_interaction_history(session_service, app_name, user_id, session_id, e
             - other keys are flexible depending on the action type
     """
     try:
-        # Get current session
-        session = session_service.get_session(
-            app_name=app_name, user_id=user_id, session_id=session_id
-        )
-
-        # Get current interaction history
-        interaction_history = session.state.get("interaction_history", [])
-
-        # Add timestamp if not already present
-        if "timestamp" not in entry:
-            entry["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Add the entry to interaction history
-        interaction_history.append(entry)
-
-        # Create updated state
-        updated_state = session.state.copy()
-        updated_state["interaction_history"] = interaction_history
-
-        # Create a new session with updated state
-        session_service.create_session(
-            app_name=app_name,
-            user_id=user_id,
-            session_id=session_id,
-            state=updated_state,
+        get_interaction_log(app_name, user_id, session_id, session_service).append(
+            entry
         )
     except Exception as e:
         print(f"Error updating interaction history: {e}")
@@ -104,85 +99,50 @@ def add_agent_response_to_history(
     )
 
 
-def display_state(
-    session_service, app_name, user_id, session_id, label="Current State"
+def display_state_changes(
+    session_service,
+    app_name,
+    user_id,
+    session_id,
+    before,
+    state_delta,
+    label="State changes",
 ):
-    """Display the current session state in a formatted way."""
-    try:
-        session = session_service.get_session(
-            app_name=app_name, user_id=user_id, session_id=session_id
-        )
+    """Display only new or changed state keys and new interactions.
 
-        # Format the output with clear sections
-        print(f"\n{'-' * 10} {label} {'-' * 10}")
-
-        # Handle the user name
-        user_name = session.state.get("user_name", "Unknown")
-        print(f"👤 User: {user_name}")
-
-        # Handle purchased courses
-        purchased_courses = session.state.get("purchased_courses", [])
-        if purchased_courses and any(purchased_courses):
-            print("📚 Courses:")
-            for course in purchased_courses:
-                if isinstance(course, dict):
-                    course_id = course.get("id", "Unknown")
-                    purchase_date = course.get("purchase_date", "Unknown date")
-                    print(f"  - {course_id} (purchased on {purchase_date})")
-                elif course:  # Handle string format for backward compatibility
-                    print(f"  - {course}")
-        else:
-            print("📚 Courses: None")
-
-        # Handle interaction history in a more readable way
-        interaction_history = session.state.get("interaction_history", [])
-        if interaction_history:
-            print("📝 Interaction History:")
-            for idx, interaction in enumerate(interaction_history, 1):
-                # Pretty format dict entries, or just show strings
-                if isinstance(interaction, dict):
-                    action = interaction.get("action", "interaction")
-                    timestamp = interaction.get("timestamp", "unknown time")
-
-                    if action == "user_query":
-                        query = interaction.get("query", "")
-                        print(f'  {idx}. User query at {timestamp}: "{query}"')
-                    elif action == "agent_response":
-                        agent = interaction.get("agent", "unknown")
-                        response = interaction.get("response", "")
-                        # Truncate very long responses for display
-                        if len(response) > 100:
-                            response = response[:97] + "..."
-                        print(f'  {idx}. {agent} response at {timestamp}: "{response}"')
-                    else:
-                        details = ", ".join(
-                            f"{k}: {v}"
-                            for k, v in interaction.items()
-                            if k not in ["action", "timestamp"]
-                        )
-                        print(
-                            f"  {idx}. {action} at {timestamp}"
-                            + (f" ({details})" if details else "")
-                        )
-                else:
-                    print(f"  {idx}. {interaction}")
+    Args:
+        session_service: The session service instance holding the session
+        app_name: The application name
+        user_id: The user ID
+        session_id: The session ID
+        before: The state before the query
+        state_delta: The merged state deltas of the query's events
+        label: Heading for the output
+    """
+    changes = {
+        key: value
+        for key, value in state_delta.items()
+        if key not in before or before[key] != value
+    }
+    key = (app_name, user_id, session_id)
+    new_interactions = get_interaction_log(
+        app_name, user_id, session_id, session_service
+    ).read(start=_last_printed_seq.get(key, 0) + 1)
+
+    print(f"\n{'-' * 10} {label} {'-' * 10}")
+    if not changes and not new_interactions:
+        print("  (no changes)")
+    for name, value in changes.items():
+        if name in before:
+            print(f"  ~ {name}: {before[name]!r} -> {value!r}")
         else:
-            print("📝 Interaction History: None")
-
-        # Show any additional state keys that might exist
-        other_keys = [
-            k
-            for k in session.state.keys()
-            if k not in ["user_name", "purchased_courses", "interaction_history"]
-        ]
-        if other_keys:
-            print("🔑 Additional State:")
-            for key in other_keys:
-                print(f"  {key}: {session.state[key]}")
-
-        print("-" * (22 + len(label)))
-    except Exception as e:
-        print(f"Error displaying state: {e}")
+            print(f"  + {name}: {value!r}")
+    if new_interactions:
+        print("📝 New Interactions:")
+        for interaction in new_interactions:
+            print(f"  {interaction['seq']}. {format_entry(interaction)}")
+        _last_printed_seq[key] = new_interactions[-1]["seq"]
+    print("-" * (22 + len(label)))
 
 
 async def process_agent_response(event):
@@ -230,23 +190,30 @@ async def call_agent_async(runner, user_id, session_id, query):
     )
     final_response_text = None
     agent_name = None
-
-    # Display state before processing the message
-    display_state(
-        runner.session_service,
-        runner.app_name,
-        user_id,
-        session_id,
-        "State BEFORE processing",
-    )
+    invocation_id = None
+
+    # Diagnostics are off by default; when on, only changes are printed
+    diagnostics = diagnostics_enabled()
+    state_key = (runner.app_name, user_id, session_id)
+    state_delta = {}
+    if diagnostics and state_key not in _known_states:
+        # Read the session once; later queries reuse the tracked state
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+        _known_states[state_key] = dict(session.state) if session else {}
 
     try:
         async for event in runner.run_async(
             user_id=user_id, session_id=session_id, new_message=content
         ):
+            if diagnostics and event.actions and event.actions.state_delta:
+                state_delta.update(event.actions.state_delta)
+
             # Capture the agent name from the event if available
             if event.author:
                 agent_name = event.author
+            invocation_id = event.invocation_id
 
             response = await process_agent_response(event)
             if response:
@@ -265,14 +232,26 @@ async def call_agent_async(runner, user_id, session_id, query):
             final_response_text,
         )
 
-    # Display state after processing the message
-    display_state(
-        runner.session_service,
-        runner.app_name,
-        user_id,
-        session_id,
-        "State AFTER processing",
-    )
+    # Display what the query changed
+    if diagnostics:
+        display_state_changes(
+            runner.session_service,
+            runner.app_name,
+            user_id,
+            session_id,
+            _known_states[state_key],
+            state_delta,
+        )
+        _known_states[state_key].update(state_delta)
+
+    # Show how many prompt tokens the context window saved this turn
+    savings = get_prompt_savings(invocation_id) if invocation_id else None
+    if savings:
+        print(
+            f"{Colors.YELLOW}Prompt tokens saved this turn: {savings['saved_tokens']}"
+            f" ({savings['full_tokens']} -> {savings['windowed_tokens']}"
+            f" over {savings['renders']} instructions){Colors.RESET}"
+        )
 
     print(f"{Colors.YELLOW}{'-' * 30}{Colors.RESET}")
     return final_response_text